@@ -1,24 +1,46 @@
 # Assuming you have not changed the general structure of the template no modification is needed in this file.
+import os
+
 from . import commands
 from .lib import fusionAddInUtils as futil
 
+# File the latencies of the event handlers are written to when the add-in stops
+EVENT_LATENCIES_FILENAME = "event_latencies.txt"
+
 
 def run(context):
     try:
         # This will run the start function in each of your commands as defined in commands/__init__.py
         commands.start()
 
+        # Drop the cached values of the commands when the design changes
+        futil.start_design_watch()
+
     except:
         futil.handle_error("run")
 
 
 def stop(context):
     try:
+        # Stop watching the design before its event handlers are removed
+        futil.stop_design_watch()
+
+        # Drop the features not created yet by the queued jobs
+        futil.stop_job_queue()
+
         # Remove all of the event handlers your app has created
         futil.clear_handlers()
 
         # This will run the start function in each of your commands as defined in commands/__init__.py
         commands.stop()
 
+        # Keep the latencies of the event handlers measured during the session
+        futil.dump_event_latencies(
+            file_path=os.path.join(os.path.dirname(__file__), EVENT_LATENCIES_FILENAME)
+        )
+
+        # Write the messages still buffered to the log file
+        futil.flush_log()
+
     except:
         futil.handle_error("stop")
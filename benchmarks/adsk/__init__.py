@@ -0,0 +1,4 @@
+# Stand-in for the Fusion API, used to run the commands without Fusion.
+# Only the objects and members used by the commands are implemented, every
+# access to a member of an API object is counted in `stats`.
+from . import stats, core, fusion
@@ -0,0 +1,694 @@
+import math
+import threading
+
+from . import stats
+
+
+class _PlaceholderType(type):
+    # Members of enumerations resolve to their qualified name
+    def __getattr__(cls, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return f"{cls.__name__}.{name}"
+
+
+class ApiObject(metaclass=_PlaceholderType):
+    """
+    Base class of the API objects, counts the accesses to their public members.
+    """
+
+    def __getattribute__(self, name: str):
+        if not name.startswith("_"):
+            stats.record(f"{type(self).__name__}.{name}")
+        return object.__getattribute__(self, name)
+
+    @classmethod
+    def cast(cls, value):
+        stats.record(f"{cls.__name__}.cast")
+        return value if isinstance(value, cls) else None
+
+
+# Base class of all the API objects, as in Fusion
+Base = ApiObject
+
+_placeholders: dict = {}
+
+
+def get_placeholder(module_name: str, name: str) -> type:
+    """
+    Get a type standing for an API type that is not implemented.
+
+    Such types are only used in annotations or as enumerations.
+    """
+
+    key = (module_name, name)
+    if key not in _placeholders:
+        _placeholders[key] = _PlaceholderType(
+            name, (ApiObject,), {"__module__": module_name}
+        )
+    return _placeholders[key]
+
+
+def __getattr__(name: str):
+    if name.startswith("_"):
+        raise AttributeError(name)
+    return get_placeholder(__name__, name)
+
+
+# Enumerations used by the implemented objects
+Curve3DTypes = get_placeholder(__name__, "Curve3DTypes")
+CommandTerminationReason = get_placeholder(__name__, "CommandTerminationReason")
+DialogResults = get_placeholder(__name__, "DialogResults")
+SurfaceTypes = get_placeholder(__name__, "SurfaceTypes")
+
+
+class Collection(ApiObject):
+    """
+    Base class of the API collections.
+    """
+
+    def __init__(self, items: list = None):
+        self._items = list(items or [])
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        if 0 <= index < len(self._items):
+            return self._items[index]
+        return None
+
+    def __iter__(self):
+        # Iterating calls item() for each item, like the Fusion collections
+        for index in range(len(self._items)):
+            yield self.item(index)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError(index)
+        return self.item(index)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ObjectCollection(Collection):
+    @classmethod
+    def create(cls) -> "ObjectCollection":
+        stats.record("ObjectCollection.create")
+        return cls()
+
+    def add(self, item) -> bool:
+        self._items.append(item)
+        return True
+
+
+class Point3D(ApiObject):
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0):
+        self._xyz = (float(x), float(y), float(z))
+
+    @classmethod
+    def create(cls, x: float = 0, y: float = 0, z: float = 0) -> "Point3D":
+        stats.record("Point3D.create")
+        return cls(x, y, z)
+
+    @property
+    def x(self) -> float:
+        return self._xyz[0]
+
+    @property
+    def y(self) -> float:
+        return self._xyz[1]
+
+    @property
+    def z(self) -> float:
+        return self._xyz[2]
+
+    def asArray(self) -> tuple[float, float, float]:
+        return self._xyz
+
+    def copy(self) -> "Point3D":
+        return Point3D(*self._xyz)
+
+    def distanceTo(self, point: "Point3D") -> float:
+        return math.dist(self._xyz, point._xyz)
+
+    def vectorTo(self, point: "Point3D") -> "Vector3D":
+        return Vector3D(*(b - a for a, b in zip(self._xyz, point._xyz)))
+
+    def asVector(self) -> "Vector3D":
+        return Vector3D(*self._xyz)
+
+    def translateBy(self, vector: "Vector3D") -> bool:
+        self._xyz = tuple(a + b for a, b in zip(self._xyz, vector._xyz))
+        return True
+
+
+class Vector3D(ApiObject):
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0):
+        self._xyz = (float(x), float(y), float(z))
+
+    @classmethod
+    def create(cls, x: float = 0, y: float = 0, z: float = 0) -> "Vector3D":
+        stats.record("Vector3D.create")
+        return cls(x, y, z)
+
+    @property
+    def x(self) -> float:
+        return self._xyz[0]
+
+    @property
+    def y(self) -> float:
+        return self._xyz[1]
+
+    @property
+    def z(self) -> float:
+        return self._xyz[2]
+
+    @property
+    def length(self) -> float:
+        return math.hypot(*self._xyz)
+
+    def asArray(self) -> tuple[float, float, float]:
+        return self._xyz
+
+    def copy(self) -> "Vector3D":
+        return Vector3D(*self._xyz)
+
+    def crossProduct(self, vector: "Vector3D") -> "Vector3D":
+        a, b = self._xyz, vector._xyz
+        return Vector3D(
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0],
+        )
+
+    def dotProduct(self, vector: "Vector3D") -> float:
+        return sum(a * b for a, b in zip(self._xyz, vector._xyz))
+
+
+class Matrix3D(ApiObject):
+    def __init__(self):
+        self.translation = Vector3D()
+
+    @classmethod
+    def create(cls) -> "Matrix3D":
+        stats.record("Matrix3D.create")
+        return cls()
+
+    def setWithArray(self, cells: list) -> bool:
+        self.translation = Vector3D(cells[3], cells[7], cells[11])
+        return True
+
+
+class Line3D(ApiObject):
+    def __init__(self, start_point: Point3D, end_point: Point3D):
+        self._start_point = start_point
+        self._end_point = end_point
+
+    @property
+    def startPoint(self) -> Point3D:
+        return self._start_point.copy()
+
+    @property
+    def endPoint(self) -> Point3D:
+        return self._end_point.copy()
+
+    @property
+    def curveType(self) -> str:
+        return Curve3DTypes.Line3DCurveType
+
+
+class Circle3D(ApiObject):
+    def __init__(self, center: Point3D, normal: Vector3D, radius: float):
+        self._center = center
+        self._normal = normal
+        self._radius = radius
+
+    @property
+    def center(self) -> Point3D:
+        return self._center.copy()
+
+    @property
+    def normal(self) -> Vector3D:
+        return self._normal.copy()
+
+    @property
+    def radius(self) -> float:
+        return self._radius
+
+    @property
+    def curveType(self) -> str:
+        return Curve3DTypes.Circle3DCurveType
+
+
+class Plane(ApiObject):
+    def __init__(self, origin: Point3D, normal: Vector3D):
+        self._origin = origin
+        self._normal = normal
+
+    @classmethod
+    def create(cls, origin: Point3D, normal: Vector3D) -> "Plane":
+        stats.record("Plane.create")
+        return cls(origin.copy(), normal.copy())
+
+    def isCoPlanarTo(self, plane: "Plane") -> bool:
+        normal = _normalize(self._normal._xyz)
+        offset = [b - a for a, b in zip(self._origin._xyz, plane._origin._xyz)]
+        return (
+            math.hypot(*_cross(normal, _normalize(plane._normal._xyz))) < 1e-9
+            and abs(_dot(normal, offset)) < 1e-9
+        )
+
+    @property
+    def origin(self) -> Point3D:
+        return self._origin.copy()
+
+    @property
+    def normal(self) -> Vector3D:
+        return self._normal.copy()
+
+    @property
+    def surfaceType(self) -> str:
+        return SurfaceTypes.PlaneSurfaceType
+
+
+class Cylinder(ApiObject):
+    def __init__(self, origin: Point3D, axis: Vector3D, radius: float):
+        self._origin = origin
+        self._axis = axis
+        self._radius = radius
+
+    @property
+    def radius(self) -> float:
+        return self._radius
+
+    @property
+    def surfaceType(self) -> str:
+        return SurfaceTypes.CylinderSurfaceType
+
+
+class OrientedBoundingBox3D(ApiObject):
+    def __init__(self, length: float, width: float, height: float):
+        self._size = (length, width, height)
+
+    @property
+    def length(self) -> float:
+        return self._size[0]
+
+    @property
+    def width(self) -> float:
+        return self._size[1]
+
+    @property
+    def height(self) -> float:
+        return self._size[2]
+
+
+class ValueInput(ApiObject):
+    def __init__(self, value):
+        self._value = value
+
+    @classmethod
+    def createByReal(cls, value: float) -> "ValueInput":
+        stats.record("ValueInput.createByReal")
+        return cls(value)
+
+    @classmethod
+    def createByString(cls, expression: str) -> "ValueInput":
+        stats.record("ValueInput.createByString")
+        return cls(expression)
+
+
+class Event(ApiObject):
+    def __init__(self):
+        self._handlers = []
+
+    def remove(self, handler) -> bool:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        return True
+
+
+class CustomEvent(Event):
+    def add(self, handler: "CustomEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class CustomEventHandler:
+    def __init__(self):
+        pass
+
+    def notify(self, args: "CustomEventArgs"):
+        pass
+
+
+class CustomEventArgs(ApiObject):
+    def __init__(self, firing_event: CustomEvent, additional_info: str):
+        self._firing_event = firing_event
+        self._additional_info = additional_info
+
+    @property
+    def firingEvent(self) -> CustomEvent:
+        return self._firing_event
+
+    @property
+    def additionalInfo(self) -> str:
+        return self._additional_info
+
+
+class ProgressDialog(ApiObject):
+    def __init__(self):
+        self.title = ""
+        self.message = ""
+        self.progressValue = 0
+        self.isCancelButtonShown = False
+        self._is_showing = False
+
+    @property
+    def isShowing(self) -> bool:
+        return self._is_showing
+
+    @property
+    def wasCancelled(self) -> bool:
+        return False
+
+    def show(
+        self,
+        title: str,
+        message: str,
+        minimumValue: int,
+        maximumValue: int,
+        delay: int = 0,
+    ) -> bool:
+        self._is_showing = True
+        return True
+
+    def hide(self) -> bool:
+        self._is_showing = False
+        return True
+
+
+class CommandCreatedEvent(Event):
+    def add(self, handler: "CommandCreatedEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class CommandCreatedEventHandler:
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class DocumentEvent(Event):
+    def add(self, handler: "DocumentEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class DocumentEventHandler:
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class ApplicationCommandEvent(Event):
+    def add(self, handler: "ApplicationCommandEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class ApplicationCommandEventHandler:
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class ApplicationCommandEventArgs(ApiObject):
+    def __init__(self, command_id: str, termination_reason: str):
+        self._command_id = command_id
+        self._termination_reason = termination_reason
+
+    @property
+    def commandId(self) -> str:
+        return self._command_id
+
+    @property
+    def terminationReason(self) -> str:
+        return self._termination_reason
+
+
+class DocumentEventArgs(ApiObject):
+    pass
+
+
+class CommandDefinition(ApiObject):
+    def __init__(self, definitions: "CommandDefinitions", id: str, name: str):
+        self._definitions = definitions
+        self._id = id
+        self._name = name
+        self._command_created = CommandCreatedEvent()
+        self.toolClipFilename = ""
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def commandCreated(self) -> CommandCreatedEvent:
+        return self._command_created
+
+    def deleteMe(self) -> bool:
+        self._definitions._items.remove(self)
+        return True
+
+
+class CommandDefinitions(Collection):
+    def addButtonDefinition(
+        self, id: str, name: str, tooltip: str, resourceFolder: str = ""
+    ) -> CommandDefinition:
+        definition = CommandDefinition(self, id, name)
+        self._items.append(definition)
+        return definition
+
+    def itemById(self, id: str) -> CommandDefinition:
+        return next((item for item in self._items if item._id == id), None)
+
+
+class CommandControl(ApiObject):
+    def __init__(self, controls: "ToolbarControls", definition: CommandDefinition):
+        self._controls = controls
+        self._definition = definition
+        self.isPromoted = False
+
+    @property
+    def id(self) -> str:
+        return self._definition._id
+
+    def deleteMe(self) -> bool:
+        self._controls._items.remove(self)
+        return True
+
+
+class ToolbarControls(Collection):
+    def addCommand(
+        self, commandDefinition: CommandDefinition, positionID: str = "", isBefore=True
+    ) -> CommandControl:
+        control = CommandControl(self, commandDefinition)
+        self._items.append(control)
+        return control
+
+    def itemById(self, id: str) -> CommandControl:
+        return next((item for item in self._items if item._definition._id == id), None)
+
+
+class ToolbarPanel(ApiObject):
+    def __init__(self, id: str):
+        self._id = id
+        self._controls = ToolbarControls()
+
+    @property
+    def controls(self) -> ToolbarControls:
+        return self._controls
+
+
+class ToolbarPanels(Collection):
+    def itemById(self, id: str) -> ToolbarPanel:
+        # Panels are created on their first use
+        panel = next((item for item in self._items if item._id == id), None)
+        if not panel:
+            panel = ToolbarPanel(id)
+            self._items.append(panel)
+        return panel
+
+
+class Workspace(ApiObject):
+    def __init__(self, id: str):
+        self._id = id
+        self._toolbar_panels = ToolbarPanels()
+
+    @property
+    def toolbarPanels(self) -> ToolbarPanels:
+        return self._toolbar_panels
+
+
+class Workspaces(Collection):
+    def itemById(self, id: str) -> Workspace:
+        # Workspaces are created on their first use
+        workspace = next((item for item in self._items if item._id == id), None)
+        if not workspace:
+            workspace = Workspace(id)
+            self._items.append(workspace)
+        return workspace
+
+
+class UserInterface(ApiObject):
+    def __init__(self):
+        self._messages: list[str] = []
+        self._command_definitions = CommandDefinitions()
+        self._workspaces = Workspaces()
+        self._command_terminated = ApplicationCommandEvent()
+
+    @property
+    def commandDefinitions(self) -> CommandDefinitions:
+        return self._command_definitions
+
+    @property
+    def workspaces(self) -> Workspaces:
+        return self._workspaces
+
+    @property
+    def commandTerminated(self) -> ApplicationCommandEvent:
+        return self._command_terminated
+
+    def messageBox(self, text: str, title: str = "", buttons=None, icon=None) -> str:
+        # Message boxes are answered with Cancel, so no folder is ever opened
+        self._messages.append(text)
+        return DialogResults.DialogCancel
+
+    def createProgressDialog(self) -> ProgressDialog:
+        return ProgressDialog()
+
+    def _terminate_command(self, command_id: str):
+        # Notify the end of a completed command, as Fusion does when it closes
+        args = ApplicationCommandEventArgs(
+            command_id, CommandTerminationReason.CompletedTerminationReason
+        )
+        for handler in list(self._command_terminated._handlers):
+            handler.notify(args)
+
+
+class MeasureManager(ApiObject):
+    def getOrientedBoundingBox(
+        self, geometry, lengthDirection: Vector3D, widthDirection: Vector3D
+    ) -> OrientedBoundingBox3D:
+        length_direction = _normalize(lengthDirection._xyz)
+        width_direction = _normalize(widthDirection._xyz)
+        height_direction = _cross(length_direction, width_direction)
+
+        points = geometry._get_points()
+        size = []
+        for direction in (length_direction, width_direction, height_direction):
+            projections = [_dot(point, direction) for point in points]
+            size.append(max(projections) - min(projections))
+        return OrientedBoundingBox3D(*size)
+
+
+class Application(ApiObject):
+    _instance: "Application" = None
+
+    def __init__(self):
+        self._user_interface = UserInterface()
+        self._measure_manager = MeasureManager()
+        self._active_product = None
+        self._document_activated = DocumentEvent()
+        self._custom_events: dict = {}
+        self._fired_events: list = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get() -> "Application":
+        stats.record("Application.get")
+        if not Application._instance:
+            Application._instance = Application()
+        return Application._instance
+
+    @property
+    def activeProduct(self):
+        return self._active_product
+
+    @property
+    def documentActivated(self) -> DocumentEvent:
+        return self._document_activated
+
+    @property
+    def userInterface(self) -> UserInterface:
+        return self._user_interface
+
+    @property
+    def measureManager(self) -> MeasureManager:
+        return self._measure_manager
+
+    def log(self, message: str, level=None, type=None):
+        pass
+
+    def registerCustomEvent(self, eventId: str) -> CustomEvent:
+        event = CustomEvent()
+        self._custom_events[eventId] = event
+        return event
+
+    def unregisterCustomEvent(self, eventId: str) -> bool:
+        return self._custom_events.pop(eventId, None) is not None
+
+    def fireCustomEvent(self, eventId: str, additionalInfo: str = "") -> bool:
+        # Events are handled later on the main thread, like in Fusion
+        with self._lock:
+            self._fired_events.append((eventId, additionalInfo))
+        return True
+
+    def _open(self, product):
+        # Make a design the active product, and notify it as Fusion does
+        self._active_product = product
+        for handler in list(self._document_activated._handlers):
+            handler.notify(DocumentEventArgs())
+
+    def _process_events(self):
+        # Handle the fired custom events until none is left, as Fusion does when idle
+        while True:
+            with self._lock:
+                if not self._fired_events:
+                    return
+                event_id, additional_info = self._fired_events.pop(0)
+
+            event = self._custom_events.get(event_id)
+            if event:
+                for handler in list(event._handlers):
+                    handler.notify(CustomEventArgs(event, additional_info))
+
+
+def _normalize(vector: tuple) -> tuple:
+    length = math.hypot(*vector)
+    return tuple(value / length for value in vector)
+
+
+def _dot(a: tuple, b: tuple) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _cross(a: tuple, b: tuple) -> tuple:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
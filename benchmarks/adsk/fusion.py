@@ -0,0 +1,1040 @@
+import itertools
+import math
+import re
+
+from . import core, stats
+from .core import ApiObject, Collection
+
+# Conversion of the length units to centimeters, the internal units of Fusion
+UNITS_TO_CENTIMETERS = {"": 1, "mm": 0.1, "cm": 1, "m": 100, "in": 2.54}
+
+_temp_ids = itertools.count(1)
+_component_ids = itertools.count(1)
+_parameter_ids = itertools.count(1)
+
+
+def __getattr__(name: str):
+    if name.startswith("_"):
+        raise AttributeError(name)
+    return core.get_placeholder(__name__, name)
+
+
+# Enumerations used by the implemented objects
+DesignTypes = core.get_placeholder(__name__, "DesignTypes")
+FeatureOperations = core.get_placeholder(__name__, "FeatureOperations")
+
+
+class Design(ApiObject):
+    def __init__(self):
+        self._timeline = Timeline()
+        self._units_manager = UnitsManager()
+        self._selection_sets = SelectionSets()
+        self._root_component = Component(self, "Root")
+
+    @property
+    def rootComponent(self) -> "Component":
+        return self._root_component
+
+    @property
+    def timeline(self) -> "Timeline":
+        return self._timeline
+
+    @property
+    def unitsManager(self) -> "UnitsManager":
+        return self._units_manager
+
+    @property
+    def selectionSets(self) -> "SelectionSets":
+        return self._selection_sets
+
+    @property
+    def designType(self) -> str:
+        return DesignTypes.ParametricDesignType
+
+
+class UnitsManager(ApiObject):
+    @property
+    def defaultLengthUnits(self) -> str:
+        return "cm"
+
+    @property
+    def internalUnits(self) -> str:
+        return "cm"
+
+    def evaluateExpression(self, expression: str, units: str = "cm") -> float:
+        # Only plain values with an optional unit are supported
+        match = re.fullmatch(r"\s*([-+]?[\d.]+)\s*([a-z]*)\s*", expression)
+        if not match:
+            raise ValueError(f"Unsupported expression: {expression}")
+        value, value_units = float(match.group(1)), match.group(2)
+        return value * UNITS_TO_CENTIMETERS[value_units] / UNITS_TO_CENTIMETERS[units]
+
+
+class Timeline(ApiObject):
+    def __init__(self):
+        self._marker_position = 0
+        self._timeline_groups = TimelineGroups()
+
+    @property
+    def markerPosition(self) -> int:
+        return self._marker_position
+
+    @property
+    def count(self) -> int:
+        return self._marker_position
+
+    @property
+    def timelineGroups(self) -> "TimelineGroups":
+        return self._timeline_groups
+
+    def _add_item(self):
+        self._marker_position += 1
+
+
+class TimelineGroup(ApiObject):
+    def __init__(self, start_index: int, end_index: int):
+        self.name = ""
+        self._range = (start_index, end_index)
+
+
+class TimelineGroups(Collection):
+    def add(self, startIndex: int, endIndex: int) -> TimelineGroup:
+        group = TimelineGroup(startIndex, endIndex)
+        self._items.append(group)
+        return group
+
+
+class SelectionSet(ApiObject):
+    def __init__(self, selection_sets: "SelectionSets", entities: list, name: str):
+        self._selection_sets = selection_sets
+        self._entities = list(entities)
+        self.name = name
+
+    def deleteMe(self) -> bool:
+        self._selection_sets._items.remove(self)
+        return True
+
+
+class SelectionSets(Collection):
+    def add(self, entities: list, name: str = "") -> SelectionSet:
+        selection_set = SelectionSet(self, entities, name)
+        self._items.append(selection_set)
+        return selection_set
+
+    def itemByName(self, name: str) -> SelectionSet:
+        for selection_set in self._items:
+            if selection_set.__dict__["name"] == name:
+                return selection_set
+        return None
+
+
+class Material(ApiObject):
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+class Component(ApiObject):
+    def __init__(self, design: Design, name: str):
+        self._design = design
+        self._name = name
+        self._id = f"component-{next(_component_ids)}"
+        self._bodies = BRepBodies()
+        self._occurrences = Occurrences(self)
+        self._sketches = Sketches(self)
+        self._features = Features(self)
+        self._construction_planes = ConstructionPlanes(self)
+        self._as_built_joints = AsBuiltJoints(self)
+        self._custom_graphics_groups = CustomGraphicsGroups()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def bRepBodies(self) -> "BRepBodies":
+        return self._bodies
+
+    @property
+    def occurrences(self) -> "Occurrences":
+        return self._occurrences
+
+    @property
+    def allOccurrences(self) -> "OccurrenceList":
+        return OccurrenceList(self._get_all_occurrences())
+
+    @property
+    def sketches(self) -> "Sketches":
+        return self._sketches
+
+    @property
+    def features(self) -> "Features":
+        return self._features
+
+    @property
+    def constructionPlanes(self) -> "ConstructionPlanes":
+        return self._construction_planes
+
+    @property
+    def asBuiltJoints(self) -> "AsBuiltJoints":
+        return self._as_built_joints
+
+    @property
+    def customGraphicsGroups(self) -> "CustomGraphicsGroups":
+        return self._custom_graphics_groups
+
+    def allOccurrencesByComponent(self, component: "Component") -> "OccurrenceList":
+        return OccurrenceList(
+            occurrence
+            for occurrence in self._get_all_occurrences()
+            if occurrence._component is component
+        )
+
+    def _get_all_occurrences(self) -> list["Occurrence"]:
+        # Occurrences of the whole tree below the component, in tree order
+        occurrences = []
+        for occurrence in self._occurrences._items:
+            occurrences.append(occurrence)
+            occurrences.extend(occurrence._component._get_all_occurrences())
+        return occurrences
+
+
+class Occurrence(ApiObject):
+    def __init__(self, component: Component, number: int, parent: "Occurrence"):
+        self._component = component
+        self._number = number
+        self._parent = parent
+        self.isLightBulbOn = True
+
+    @property
+    def component(self) -> Component:
+        return self._component
+
+    @property
+    def name(self) -> str:
+        return self._get_name()
+
+    @property
+    def fullPathName(self) -> str:
+        names = []
+        occurrence = self
+        while occurrence:
+            names.insert(0, occurrence._get_name())
+            occurrence = occurrence._parent
+        return "+".join(names)
+
+    @property
+    def bRepBodies(self) -> "BRepBodies":
+        return self._component._bodies
+
+    def _get_name(self) -> str:
+        return f"{self._component._name}:{self._number}"
+
+
+class Occurrences(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def addNewComponent(self, transform: core.Matrix3D) -> Occurrence:
+        design = self._component._design
+        component = Component(design, f"Component{next(_component_ids)}")
+
+        # Nested occurrences are placed in the first occurrence of their parent
+        parents = design._root_component.allOccurrencesByComponent(self._component)
+        parent = parents._items[0] if parents._items else None
+
+        occurrence = Occurrence(component, 1, parent)
+        self._items.append(occurrence)
+        return occurrence
+
+
+class OccurrenceList(Collection):
+    pass
+
+
+class BRepVertex(ApiObject):
+    def __init__(self, point: core.Point3D):
+        self._point = point
+
+    @property
+    def geometry(self) -> core.Point3D:
+        return self._point.copy()
+
+
+class CurveEvaluator3D(ApiObject):
+    def __init__(self, edge: "BRepEdge"):
+        self._edge = edge
+
+    def getParameterExtents(self) -> tuple[bool, float, float]:
+        return (True, 0.0, 1.0)
+
+    def getPointAtParameter(self, parameter: float) -> tuple[bool, core.Point3D]:
+        return (True, core.Point3D(*self._edge._get_point_at(parameter)))
+
+    def getStrokes(
+        self, fromParameter: float, toParameter: float, tolerance: float
+    ) -> tuple[bool, list[core.Point3D]]:
+        count = 32
+        return (
+            True,
+            [
+                core.Point3D(
+                    *self._edge._get_point_at(
+                        fromParameter + (toParameter - fromParameter) * i / count
+                    )
+                )
+                for i in range(count + 1)
+            ],
+        )
+
+
+class BRepEdge(ApiObject):
+    def __init__(self, geometry, start_vertex: BRepVertex, end_vertex: BRepVertex):
+        self._geometry = geometry
+        self._start_vertex = start_vertex
+        self._end_vertex = end_vertex
+        self._faces: list["BRepFace"] = []
+        self._temp_id = next(_temp_ids)
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def startVertex(self) -> BRepVertex:
+        return self._start_vertex
+
+    @property
+    def endVertex(self) -> BRepVertex:
+        return self._end_vertex
+
+    @property
+    def faces(self) -> "BRepFaces":
+        return BRepFaces(self._faces)
+
+    @property
+    def length(self) -> float:
+        if isinstance(self._geometry, core.Circle3D):
+            return 2 * math.pi * self._geometry._radius
+        return math.dist(self._start_vertex._point._xyz, self._end_vertex._point._xyz)
+
+    @property
+    def evaluator(self) -> CurveEvaluator3D:
+        return CurveEvaluator3D(self)
+
+    @property
+    def tempId(self) -> int:
+        return self._temp_id
+
+    def _get_point_at(self, parameter: float) -> tuple[float, float, float]:
+        if isinstance(self._geometry, core.Circle3D):
+            center = self._geometry._center._xyz
+            normal = self._geometry._normal._xyz
+            radius = self._geometry._radius
+
+            # Any two directions perpendicular to the normal
+            x_axis = core._normalize(
+                core._cross(normal, (1, 0, 0) if abs(normal[0]) < 0.9 else (0, 1, 0))
+            )
+            y_axis = core._cross(normal, x_axis)
+            angle = 2 * math.pi * parameter
+            return tuple(
+                c + radius * (math.cos(angle) * x + math.sin(angle) * y)
+                for c, x, y in zip(center, x_axis, y_axis)
+            )
+
+        start = self._start_vertex._point._xyz
+        end = self._end_vertex._point._xyz
+        return tuple(a + (b - a) * parameter for a, b in zip(start, end))
+
+
+class BRepCoEdge(ApiObject):
+    def __init__(self, edge: BRepEdge, is_opposed_to_edge: bool):
+        self._edge = edge
+        self._is_opposed_to_edge = is_opposed_to_edge
+
+    @property
+    def edge(self) -> BRepEdge:
+        return self._edge
+
+    @property
+    def isOpposedToEdge(self) -> bool:
+        return self._is_opposed_to_edge
+
+
+class BRepCoEdges(Collection):
+    pass
+
+
+class BRepLoop(ApiObject):
+    def __init__(self, co_edges: list[BRepCoEdge], is_outer: bool):
+        self._co_edges = co_edges
+        self._is_outer = is_outer
+
+    @property
+    def coEdges(self) -> BRepCoEdges:
+        return BRepCoEdges(self._co_edges)
+
+    @property
+    def edges(self) -> "BRepEdges":
+        return BRepEdges(co_edge._edge for co_edge in self._co_edges)
+
+    @property
+    def isOuter(self) -> bool:
+        return self._is_outer
+
+
+class BRepLoops(Collection):
+    pass
+
+
+class SurfaceEvaluator(ApiObject):
+    def __init__(self, face: "BRepFace"):
+        self._face = face
+
+    @property
+    def area(self) -> float:
+        return self._face._area
+
+    def getNormalAtPoint(self, point: core.Point3D) -> tuple[bool, core.Vector3D]:
+        return (True, self._face._normal.copy())
+
+
+class BRepFace(ApiObject):
+    def __init__(
+        self,
+        body: "BRepBody",
+        geometry,
+        loops: list[BRepLoop],
+        normal: core.Vector3D,
+        point_on_face: core.Point3D,
+        area: float,
+    ):
+        self._body = body
+        self._geometry = geometry
+        self._loops = loops
+        self._normal = normal
+        self._point_on_face = point_on_face
+        self._area = area
+        self._temp_id = next(_temp_ids)
+
+    @property
+    def body(self) -> "BRepBody":
+        return self._body
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def loops(self) -> BRepLoops:
+        return BRepLoops(self._loops)
+
+    @property
+    def edges(self) -> "BRepEdges":
+        return BRepEdges(
+            co_edge._edge for loop in self._loops for co_edge in loop._co_edges
+        )
+
+    @property
+    def evaluator(self) -> SurfaceEvaluator:
+        return SurfaceEvaluator(self)
+
+    @property
+    def pointOnFace(self) -> core.Point3D:
+        return self._point_on_face.copy()
+
+    @property
+    def area(self) -> float:
+        return self._area
+
+    @property
+    def tempId(self) -> int:
+        return self._temp_id
+
+    @property
+    def entityToken(self) -> str:
+        return f"face-{id(self)}"
+
+    @property
+    def assemblyContext(self) -> Occurrence:
+        return None
+
+
+class BRepFaces(Collection):
+    pass
+
+
+class BRepEdges(Collection):
+    pass
+
+
+class BRepBody(ApiObject):
+    def __init__(self, component: Component, name: str, material: str = ""):
+        self._component = component
+        self._faces: list[BRepFace] = []
+        self._vertices: list[BRepVertex] = []
+        self._material = Material(material) if material else None
+        self.name = name
+        self.isVisible = True
+        self.isLightBulbOn = True
+
+    @property
+    def entityToken(self) -> str:
+        return f"body-{id(self)}"
+
+    @property
+    def parentComponent(self) -> Component:
+        return self._component
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(self._faces)
+
+    @property
+    def isSolid(self) -> bool:
+        return True
+
+    @property
+    def material(self) -> Material:
+        return self._material
+
+    @property
+    def assemblyContext(self) -> Occurrence:
+        return None
+
+    def findByTempId(self, tempId: int) -> list[BRepFace]:
+        return [face for face in self._faces if face._temp_id == tempId]
+
+    def _get_points(self) -> list[tuple[float, float, float]]:
+        return [vertex._point._xyz for vertex in self._vertices]
+
+
+class BRepBodies(Collection):
+    pass
+
+
+class ModelParameter(ApiObject):
+    def __init__(self, expression: str):
+        self.name = f"d{next(_parameter_ids)}"
+        self.expression = expression
+
+
+class SketchPoint(ApiObject):
+    def __init__(self, point: core.Point3D):
+        self._point = point
+
+    @property
+    def geometry(self) -> core.Point3D:
+        return self._point.copy()
+
+
+class SketchPoints(Collection):
+    def add(self, point: core.Point3D) -> SketchPoint:
+        sketch_point = SketchPoint(point.copy())
+        self._items.append(sketch_point)
+        return sketch_point
+
+
+class SketchLine(ApiObject):
+    def __init__(self, start: SketchPoint, end: SketchPoint):
+        self._start = start
+        self._end = end
+        self.isConstruction = False
+
+    @property
+    def startSketchPoint(self) -> SketchPoint:
+        return self._start
+
+    @property
+    def endSketchPoint(self) -> SketchPoint:
+        return self._end
+
+    @property
+    def length(self) -> float:
+        return math.dist(self._start._point._xyz, self._end._point._xyz)
+
+
+class SketchCircle(ApiObject):
+    def __init__(self, center: SketchPoint, radius: float):
+        self._center = center
+        self._radius = radius
+        self.isConstruction = False
+
+
+class SketchLineList(Collection):
+    pass
+
+
+class SketchLines(Collection):
+    def addByTwoPoints(self, startPoint, endPoint) -> SketchLine:
+        line = SketchLine(_get_sketch_point(startPoint), _get_sketch_point(endPoint))
+        self._items.append(line)
+        return line
+
+    def addTwoPointRectangle(
+        self, pointOne: core.Point3D, pointTwo: core.Point3D
+    ) -> SketchLineList:
+        (x1, y1, z), (x2, y2, _) = pointOne._xyz, pointTwo._xyz
+        corners = [
+            SketchPoint(core.Point3D(x, y, z))
+            for x, y in [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+        ]
+        lines = [SketchLine(corners[i], corners[(i + 1) % 4]) for i in range(4)]
+        self._items.extend(lines)
+        return SketchLineList(lines)
+
+
+class SketchCurves(ApiObject):
+    def __init__(self):
+        self._sketch_lines = SketchLines()
+
+    @property
+    def sketchLines(self) -> SketchLines:
+        return self._sketch_lines
+
+
+class SketchDimension(ApiObject):
+    def __init__(self, expression: str):
+        self._parameter = ModelParameter(expression)
+
+    @property
+    def parameter(self) -> ModelParameter:
+        return self._parameter
+
+
+class SketchDimensions(Collection):
+    def addDistanceDimension(
+        self,
+        pointOne: SketchPoint,
+        pointTwo: SketchPoint,
+        orientation,
+        textPoint: core.Point3D,
+        isDriving: bool = True,
+    ) -> SketchDimension:
+        distance = math.dist(pointOne._point._xyz, pointTwo._point._xyz)
+        dimension = SketchDimension(f"{distance} cm")
+        self._items.append(dimension)
+        return dimension
+
+
+class GeometricConstraint(ApiObject):
+    pass
+
+
+class GeometricConstraints(Collection):
+    def addPerpendicular(self, lineOne, lineTwo) -> GeometricConstraint:
+        return self._add()
+
+    def addMidPoint(self, point, midPointCurve) -> GeometricConstraint:
+        return self._add()
+
+    def _add(self) -> GeometricConstraint:
+        constraint = GeometricConstraint()
+        self._items.append(constraint)
+        return constraint
+
+
+class Profile(ApiObject):
+    pass
+
+
+class Profiles(Collection):
+    pass
+
+
+class Sketch(ApiObject):
+    def __init__(self, component: Component, planar_entity):
+        self._component = component
+        self._planar_entity = planar_entity
+        self._sketch_points = SketchPoints()
+        self._sketch_curves = SketchCurves()
+        self._sketch_dimensions = SketchDimensions()
+        self._geometric_constraints = GeometricConstraints()
+        self.isVisible = True
+
+    @property
+    def sketchPoints(self) -> SketchPoints:
+        return self._sketch_points
+
+    @property
+    def sketchCurves(self) -> SketchCurves:
+        return self._sketch_curves
+
+    @property
+    def sketchDimensions(self) -> SketchDimensions:
+        return self._sketch_dimensions
+
+    @property
+    def geometricConstraints(self) -> GeometricConstraints:
+        return self._geometric_constraints
+
+    @property
+    def profiles(self) -> Profiles:
+        # The profiles are not computed, a closed sketch has an outer and an inner one
+        return Profiles([Profile(), Profile()])
+
+    @property
+    def isFullyConstrained(self) -> bool:
+        return True
+
+    def modelToSketchSpace(self, modelCoordinate: core.Point3D) -> core.Point3D:
+        return modelCoordinate.copy()
+
+    def project(self, entity) -> core.ObjectCollection:
+        projected = core.ObjectCollection()
+        geometry = entity._geometry
+        if isinstance(geometry, core.Line3D):
+            projected._items.append(
+                SketchLine(
+                    SketchPoint(geometry._start_point.copy()),
+                    SketchPoint(geometry._end_point.copy()),
+                )
+            )
+        elif isinstance(geometry, core.Circle3D):
+            projected._items.append(
+                SketchCircle(SketchPoint(geometry._center.copy()), geometry._radius)
+            )
+        return projected
+
+
+class Sketches(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def add(self, planarEntity) -> Sketch:
+        sketch = Sketch(self._component, planarEntity)
+        self._items.append(sketch)
+        self._component._design._timeline._add_item()
+        return sketch
+
+
+class Feature(ApiObject):
+    def __init__(self, component: Component, creates_body: bool = False):
+        self._component = component
+        self._bodies = BRepBodies()
+        self.name = ""
+
+        if creates_body:
+            body = BRepBody(component, f"Body{len(component._bodies._items) + 1}")
+            component._bodies._items.append(body)
+            self._bodies._items.append(body)
+
+        component._design._timeline._add_item()
+
+    @property
+    def bodies(self) -> BRepBodies:
+        return self._bodies
+
+    @property
+    def parentComponent(self) -> Component:
+        return self._component
+
+
+class FeatureInput(ApiObject):
+    def __init__(self, operation=None):
+        self.operation = operation
+
+
+class ExtrudeFeatureInput(FeatureInput):
+    def __init__(self, profile, operation):
+        super().__init__(operation)
+        self._profile = profile
+        self.participantBodies = []
+
+    def setOneSideExtent(self, extent, direction) -> bool:
+        return True
+
+
+class ExtrudeFeature(Feature):
+    pass
+
+
+class ExtrudeFeatures(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, profile, operation) -> ExtrudeFeatureInput:
+        return ExtrudeFeatureInput(profile, operation)
+
+    def add(self, input: ExtrudeFeatureInput) -> ExtrudeFeature:
+        return self._add(input.__dict__["operation"])
+
+    def addSimple(
+        self, profile, distance: core.ValueInput, operation
+    ) -> ExtrudeFeature:
+        return self._add(operation)
+
+    def _add(self, operation) -> ExtrudeFeature:
+        feature = ExtrudeFeature(
+            self._component, operation == FeatureOperations.NewBodyFeatureOperation
+        )
+        self._items.append(feature)
+        return feature
+
+
+class RectangularPatternFeatureInput(FeatureInput):
+    def __init__(self, entities, direction):
+        super().__init__()
+        self._entities = entities
+        self.isSymmetricInDirectionOne = False
+
+
+class RectangularPatternFeature(Feature):
+    pass
+
+
+class RectangularPatternFeatures(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(
+        self,
+        inputEntities,
+        directionOneEntity,
+        quantityOne,
+        distanceOne,
+        patternDistanceType,
+    ) -> RectangularPatternFeatureInput:
+        return RectangularPatternFeatureInput(inputEntities, directionOneEntity)
+
+    def add(self, input: RectangularPatternFeatureInput) -> RectangularPatternFeature:
+        feature = RectangularPatternFeature(self._component)
+        self._items.append(feature)
+        return feature
+
+
+class CombineFeatureInput(FeatureInput):
+    def __init__(self, target_body: BRepBody, tool_bodies):
+        super().__init__(FeatureOperations.JoinFeatureOperation)
+        self._target_body = target_body
+        self._tool_bodies = tool_bodies
+        self.isKeepToolBodies = False
+
+
+class CombineFeature(Feature):
+    pass
+
+
+class CombineFeatures(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, targetBody: BRepBody, toolBodies) -> CombineFeatureInput:
+        return CombineFeatureInput(targetBody, toolBodies)
+
+    def add(self, input: CombineFeatureInput) -> CombineFeature:
+        feature = CombineFeature(self._component)
+        self._items.append(feature)
+        return feature
+
+
+class RemoveFeature(Feature):
+    pass
+
+
+class RemoveFeatures(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def add(self, itemToRemove) -> RemoveFeature:
+        if isinstance(itemToRemove, BRepBody):
+            itemToRemove.__dict__["isVisible"] = False
+        feature = RemoveFeature(self._component)
+        self._items.append(feature)
+        return feature
+
+
+class LoftSections(Collection):
+    def add(self, entity) -> bool:
+        self._items.append(entity)
+        return True
+
+
+class LoftFeatureInput(FeatureInput):
+    def __init__(self, operation):
+        super().__init__(operation)
+        self._loft_sections = LoftSections()
+        self.isSolid = False
+
+    @property
+    def loftSections(self) -> LoftSections:
+        return self._loft_sections
+
+
+class LoftFeature(Feature):
+    pass
+
+
+class LoftFeatures(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, operation) -> LoftFeatureInput:
+        return LoftFeatureInput(operation)
+
+    def add(self, input: LoftFeatureInput) -> LoftFeature:
+        feature = LoftFeature(
+            self._component,
+            input.__dict__["operation"] == FeatureOperations.NewBodyFeatureOperation,
+        )
+        self._items.append(feature)
+        return feature
+
+
+class Features(ApiObject):
+    def __init__(self, component: Component):
+        self._extrude_features = ExtrudeFeatures(component)
+        self._rectangular_pattern_features = RectangularPatternFeatures(component)
+        self._combine_features = CombineFeatures(component)
+        self._remove_features = RemoveFeatures(component)
+        self._loft_features = LoftFeatures(component)
+
+    @property
+    def extrudeFeatures(self) -> ExtrudeFeatures:
+        return self._extrude_features
+
+    @property
+    def rectangularPatternFeatures(self) -> RectangularPatternFeatures:
+        return self._rectangular_pattern_features
+
+    @property
+    def combineFeatures(self) -> CombineFeatures:
+        return self._combine_features
+
+    @property
+    def removeFeatures(self) -> RemoveFeatures:
+        return self._remove_features
+
+    @property
+    def loftFeatures(self) -> LoftFeatures:
+        return self._loft_features
+
+
+class ThroughAllExtentDefinition(ApiObject):
+    @classmethod
+    def create(cls) -> "ThroughAllExtentDefinition":
+        stats.record("ThroughAllExtentDefinition.create")
+        return cls()
+
+
+class ConstructionPlaneInput(ApiObject):
+    def setByOffset(self, planarEntity, offset: core.ValueInput) -> bool:
+        return True
+
+
+class ConstructionPlane(ApiObject):
+    def __init__(self):
+        self.isLightBulbOn = True
+
+
+class ConstructionPlanes(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(self) -> ConstructionPlaneInput:
+        return ConstructionPlaneInput()
+
+    def add(self, input: ConstructionPlaneInput) -> ConstructionPlane:
+        plane = ConstructionPlane()
+        self._items.append(plane)
+        self._component._design._timeline._add_item()
+        return plane
+
+
+class AsBuiltJointInput(ApiObject):
+    def __init__(self, occurrence_one: Occurrence, occurrence_two: Occurrence):
+        self._occurrences = (occurrence_one, occurrence_two)
+
+    def setAsRigidJointMotion(self) -> bool:
+        return True
+
+
+class AsBuiltJoint(ApiObject):
+    pass
+
+
+class AsBuiltJoints(Collection):
+    def __init__(self, component: Component):
+        super().__init__()
+        self._component = component
+
+    def createInput(
+        self, occurrenceOne: Occurrence, occurrenceTwo: Occurrence, geometry
+    ) -> AsBuiltJointInput:
+        return AsBuiltJointInput(occurrenceOne, occurrenceTwo)
+
+    def add(self, input: AsBuiltJointInput) -> AsBuiltJoint:
+        joint = AsBuiltJoint()
+        self._items.append(joint)
+        self._component._design._timeline._add_item()
+        return joint
+
+
+class CustomGraphicsViewScale(ApiObject):
+    def __init__(self, pixel_scale: float, anchor_point: core.Point3D):
+        self._pixel_scale = pixel_scale
+        self._anchor_point = anchor_point
+
+    @classmethod
+    def create(
+        cls, pixelScale: float, anchorPoint: core.Point3D
+    ) -> "CustomGraphicsViewScale":
+        stats.record("CustomGraphicsViewScale.create")
+        return cls(pixelScale, anchorPoint)
+
+
+class CustomGraphicsText(ApiObject):
+    def __init__(self, formatted_text: str, transform: core.Matrix3D):
+        self._formatted_text = formatted_text
+        self._transform = transform
+        self.viewScale = None
+
+
+class CustomGraphicsGroup(ApiObject):
+    def __init__(self, groups: "CustomGraphicsGroups"):
+        self._groups = groups
+        self._entities = []
+
+    def addText(
+        self, formattedText: str, font: str, size: float, transform: core.Matrix3D
+    ) -> CustomGraphicsText:
+        text = CustomGraphicsText(formattedText, transform)
+        self._entities.append(text)
+        return text
+
+    def deleteMe(self) -> bool:
+        self._groups._items.remove(self)
+        return True
+
+
+class CustomGraphicsGroups(Collection):
+    def add(self) -> CustomGraphicsGroup:
+        group = CustomGraphicsGroup(self)
+        self._items.append(group)
+        return group
+
+
+def _get_sketch_point(point) -> SketchPoint:
+    if isinstance(point, SketchPoint):
+        return point
+    return SketchPoint(point.copy())
@@ -0,0 +1,46 @@
+import collections
+import time
+
+# Simulated duration of each API call in seconds, Fusion API calls cross
+# from Python to the C++ kernel and are much slower than Python calls.
+call_cost = 0.0
+
+# Number of calls per API member, named as "Type.member".
+calls = collections.Counter()
+
+
+def record(name: str):
+    """
+    Count a call to an API member and spend its simulated duration.
+    """
+
+    calls[name] += 1
+
+    if call_cost:
+        end_time = time.perf_counter() + call_cost
+        while time.perf_counter() < end_time:
+            pass
+
+
+def reset():
+    """
+    Forget the calls counted so far.
+    """
+
+    calls.clear()
+
+
+def get_total_calls() -> int:
+    """
+    Get the number of calls counted since the last reset.
+    """
+
+    return sum(calls.values())
+
+
+def get_most_called(limit: int = 5) -> list[tuple[str, int]]:
+    """
+    Get the most called API members with their number of calls.
+    """
+
+    return calls.most_common(limit)
@@ -0,0 +1,285 @@
+"""
+Synthetic designs used by the benchmarks.
+
+The bodies are prisms with a complete topology (faces, loops, co-edges, shared
+edges and vertices), so that the commands can walk them like real bodies.
+"""
+
+import math
+import random
+
+import adsk.core
+import adsk.fusion
+
+# Sizes of the panels in centimeters, few sizes so that some panels are identical
+PANEL_LENGTHS = [20, 30, 45]
+PANEL_WIDTHS = [10, 15, 25]
+
+# Stocks the panels are made of, as material name and thickness in centimeters
+PANEL_STOCKS = [("Plywood", 1.8), ("Plywood", 0.6), ("MDF", 1.8)]
+
+# Number of panels in each cabinet component
+PANELS_PER_CABINET = 8
+
+# Share of the panels with a round hole
+HOLE_RATIO = 0.25
+
+
+def create_panels_design(panel_count: int, seed: int = 0) -> adsk.fusion.Design:
+    """
+    Create a design with panels spread in cabinet components.
+    """
+
+    rng = random.Random(seed)
+    design = adsk.fusion.Design()
+    root_component = design._root_component
+
+    cabinet_component = None
+    for i in range(panel_count):
+        if i % PANELS_PER_CABINET == 0:
+            occurrence = root_component.occurrences.addNewComponent(
+                adsk.core.Matrix3D()
+            )
+            cabinet_component = occurrence._component
+            cabinet_component._name = f"Cabinet {i // PANELS_PER_CABINET + 1}"
+
+        length = rng.choice(PANEL_LENGTHS)
+        width = rng.choice(PANEL_WIDTHS)
+        material, thickness = rng.choice(PANEL_STOCKS)
+
+        # Panels are laid side by side, far enough apart not to touch
+        x, y = (i % 10) * 50, (i // 10) * 30
+        polygon = [
+            (x, y, 0),
+            (x + length, y, 0),
+            (x + length, y + width, 0),
+            (x, y + width, 0),
+        ]
+        holes = []
+        if rng.random() < HOLE_RATIO:
+            holes.append(((x + length / 2, y + width / 2, 0), min(length, width) / 6))
+
+        create_prism_body(
+            cabinet_component,
+            f"Panel{i + 1}",
+            polygon,
+            (0, 0, thickness),
+            material,
+            holes,
+        )
+
+    return design
+
+
+def create_prism_design(
+    side_count: int, radius: float, height: float
+) -> adsk.fusion.Design:
+    """
+    Create a design with a single regular prism body in the root component, to dress up.
+    """
+
+    design = adsk.fusion.Design()
+    polygon = [
+        (
+            radius * math.cos(2 * math.pi * i / side_count),
+            radius * math.sin(2 * math.pi * i / side_count),
+            0,
+        )
+        for i in range(side_count)
+    ]
+    create_prism_body(design._root_component, "Prism", polygon, (0, 0, height))
+    return design
+
+
+def create_prism_body(
+    component: adsk.fusion.Component,
+    name: str,
+    polygon: list[tuple[float, float, float]],
+    height: tuple[float, float, float],
+    material: str = "",
+    holes: list[tuple[tuple[float, float, float], float]] = None,
+) -> adsk.fusion.BRepBody:
+    """
+    Create a body by extruding a polygon, with optional round through holes.
+
+    The polygon is counter-clockwise around the height vector, the holes are
+    given by their center on the polygon plane and their radius.
+    """
+
+    body = adsk.fusion.BRepBody(component, name, material)
+    component._bodies._items.append(body)
+
+    count = len(polygon)
+    bottom = [adsk.fusion.BRepVertex(adsk.core.Point3D(*point)) for point in polygon]
+    top = [
+        adsk.fusion.BRepVertex(adsk.core.Point3D(*_add(point, height)))
+        for point in polygon
+    ]
+    body._vertices = bottom + top
+
+    # Edges are shared by two faces, they are created on their first use
+    edges = {}
+
+    def get_co_edge(start: adsk.fusion.BRepVertex, end: adsk.fusion.BRepVertex):
+        edge = edges.get((id(end), id(start)))
+        if edge:
+            return adsk.fusion.BRepCoEdge(edge, True)
+        edge = adsk.fusion.BRepEdge(
+            adsk.core.Line3D(start._point.copy(), end._point.copy()), start, end
+        )
+        edges[(id(start), id(end))] = edge
+        return adsk.fusion.BRepCoEdge(edge, False)
+
+    def add_face(geometry, loops, normal, point, area):
+        face = adsk.fusion.BRepFace(
+            body,
+            geometry,
+            loops,
+            adsk.core.Vector3D(*normal),
+            adsk.core.Point3D(*point),
+            area,
+        )
+        for loop in loops:
+            for co_edge in loop._co_edges:
+                co_edge._edge._faces.append(face)
+        body._faces.append(face)
+        return face
+
+    axis = _normalize(height)
+    polygon_area = _get_polygon_area(polygon, axis)
+    holes = holes or []
+    hole_area = sum(math.pi * radius**2 for _, radius in holes)
+    hole_edges = [
+        [
+            _get_circle_edge(center, axis, radius, offset)
+            for offset in ((0, 0, 0), height)
+        ]
+        for center, radius in holes
+    ]
+
+    # Bottom face, looking against the height vector
+    bottom_loops = [
+        adsk.fusion.BRepLoop(
+            [
+                get_co_edge(bottom[(i + 1) % count], bottom[i])
+                for i in reversed(range(count))
+            ],
+            True,
+        )
+    ]
+    bottom_loops.extend(
+        adsk.fusion.BRepLoop([adsk.fusion.BRepCoEdge(bottom_edge, False)], False)
+        for bottom_edge, _ in hole_edges
+    )
+    bottom_normal = tuple(-value for value in axis)
+    add_face(
+        adsk.core.Plane(
+            adsk.core.Point3D(*polygon[0]), adsk.core.Vector3D(*bottom_normal)
+        ),
+        bottom_loops,
+        bottom_normal,
+        polygon[0],
+        polygon_area - hole_area,
+    )
+
+    # Top face, looking along the height vector
+    top_loops = [
+        adsk.fusion.BRepLoop(
+            [get_co_edge(top[i], top[(i + 1) % count]) for i in range(count)], True
+        )
+    ]
+    top_loops.extend(
+        adsk.fusion.BRepLoop([adsk.fusion.BRepCoEdge(top_edge, True)], False)
+        for _, top_edge in hole_edges
+    )
+    top_point = _add(polygon[0], height)
+    add_face(
+        adsk.core.Plane(adsk.core.Point3D(*top_point), adsk.core.Vector3D(*axis)),
+        top_loops,
+        axis,
+        top_point,
+        polygon_area - hole_area,
+    )
+
+    # Side faces, looking out of the polygon
+    thickness = math.hypot(*height)
+    for i in range(count):
+        j = (i + 1) % count
+        loop = adsk.fusion.BRepLoop(
+            [
+                get_co_edge(bottom[i], bottom[j]),
+                get_co_edge(bottom[j], top[j]),
+                get_co_edge(top[j], top[i]),
+                get_co_edge(top[i], bottom[i]),
+            ],
+            True,
+        )
+        direction = [b - a for a, b in zip(polygon[i], polygon[j])]
+        normal = _normalize(_cross(direction, axis))
+        add_face(
+            adsk.core.Plane(
+                adsk.core.Point3D(*polygon[i]), adsk.core.Vector3D(*normal)
+            ),
+            [loop],
+            normal,
+            polygon[i],
+            math.hypot(*direction) * thickness,
+        )
+
+    # Cylindrical faces of the holes
+    for (center, radius), (bottom_edge, top_edge) in zip(holes, hole_edges):
+        loops = [
+            adsk.fusion.BRepLoop([adsk.fusion.BRepCoEdge(bottom_edge, True)], True),
+            adsk.fusion.BRepLoop([adsk.fusion.BRepCoEdge(top_edge, False)], True),
+        ]
+        normal = bottom_edge._get_point_at(0)
+        add_face(
+            adsk.core.Cylinder(
+                adsk.core.Point3D(*center), adsk.core.Vector3D(*axis), radius
+            ),
+            loops,
+            _normalize([a - b for a, b in zip(normal, center)]),
+            normal,
+            2 * math.pi * radius * thickness,
+        )
+
+    return body
+
+
+def _get_circle_edge(
+    center: tuple, axis: tuple, radius: float, offset: tuple
+) -> adsk.fusion.BRepEdge:
+    # A closed edge starting and ending on the same vertex
+    circle = adsk.core.Circle3D(
+        adsk.core.Point3D(*_add(center, offset)), adsk.core.Vector3D(*axis), radius
+    )
+    edge = adsk.fusion.BRepEdge(circle, None, None)
+    vertex = adsk.fusion.BRepVertex(adsk.core.Point3D(*edge._get_point_at(0)))
+    edge._start_vertex = edge._end_vertex = vertex
+    return edge
+
+
+def _get_polygon_area(polygon: list[tuple], axis: tuple) -> float:
+    # Newell's formula, projected on the axis
+    normal = [0.0, 0.0, 0.0]
+    for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+        for k, value in enumerate(_cross(a, b)):
+            normal[k] += value
+    return abs(sum(n * a for n, a in zip(normal, axis))) / 2
+
+
+def _add(a: tuple, b: tuple) -> tuple:
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def _cross(a, b) -> tuple:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _normalize(vector) -> tuple:
+    length = math.hypot(*vector)
+    return tuple(value / length for value in vector)
@@ -0,0 +1,211 @@
+"""
+Run the commands on synthetic designs without Fusion and report their cost.
+
+The Fusion API is replaced by the stand-in `adsk` package of this folder, which
+counts the API calls and can simulate their duration with `--call-cost`.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+BENCHMARKS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+ADDIN_FOLDER = os.path.dirname(BENCHMARKS_FOLDER)
+
+# The stand-in must be found before any real adsk package, and the add-in is
+# imported as a package so that its relative imports work
+sys.path.insert(0, BENCHMARKS_FOLDER)
+sys.path.insert(1, os.path.dirname(ADDIN_FOLDER))
+
+import adsk.core
+import adsk.fusion
+
+import designs
+
+ADDIN_PACKAGE = os.path.basename(ADDIN_FOLDER)
+boxJoint = importlib.import_module(f"{ADDIN_PACKAGE}.commands.boxJoint.entry")
+dressUp = importlib.import_module(f"{ADDIN_PACKAGE}.commands.dressUp.entry")
+exportDXF = importlib.import_module(f"{ADDIN_PACKAGE}.commands.exportDXF.entry")
+corners = importlib.import_module(f"{ADDIN_PACKAGE}.lib.easyBoxCore.corners")
+futil = importlib.import_module(f"{ADDIN_PACKAGE}.lib.fusionAddInUtils")
+logging_utils = importlib.import_module(
+    f"{ADDIN_PACKAGE}.lib.fusionAddInUtils.logging_utils"
+)
+
+# Number of panels of the benchmarked designs
+DEFAULT_PANEL_COUNTS = [6, 24, 60]
+
+# Number of most called API members in the report
+DEFAULT_TOP = 5
+
+# Settings of the export, as width, height, spacing, rotation and optimization
+EXPORT_SHEET_SETTINGS = (60, 40, 0.1, True, False)
+
+# Thickness of the dress up panels
+DRESS_UP_THICKNESS = "0.3 cm"
+
+app = adsk.core.Application.get()
+
+
+def benchmark_box_joint(panel_count: int):
+    """
+    Join each panel with the next one.
+    """
+
+    design = designs.create_panels_design(panel_count)
+    app._open(design)
+    boxJoint.status_input = adsk.core.TextBoxCommandInput()
+
+    bodies = [
+        body
+        for occurrence in design._root_component._get_all_occurrences()
+        for body in occurrence._component._bodies._items
+    ]
+
+    def run():
+        for body, other_body in zip(bodies, bodies[1:]):
+            boxJoint.create_mortises_and_tenons(body, other_body._faces[0], 3)
+
+    return run
+
+
+def benchmark_dress_up(panel_count: int, corner_policy: str):
+    """
+    Dress up a prism with a panel on each face.
+    """
+
+    # The prism has two faces more than sides
+    side_count = max(3, panel_count - 2)
+
+    def run():
+        design = designs.create_prism_design(side_count, 5 * side_count, 40)
+        app._open(design)
+        body = design._root_component._bodies._items[0]
+        panel_configs = {
+            face._temp_id: dressUp.PanelConfig(
+                face._temp_id, f"Panel{i + 1}", DRESS_UP_THICKNESS
+            )
+            for i, face in enumerate(body._faces)
+        }
+        dressUp.dress_up(body, panel_configs, corner_policy=corner_policy)
+
+    return run
+
+
+def benchmark_export(panel_count: int, folder: str):
+    """
+    Read the largest face of each panel and export them to the folder.
+    """
+
+    design = designs.create_panels_design(panel_count)
+    app._open(design)
+
+    def run():
+        # The export command closes before its faces are read, as in Fusion
+        app.userInterface._terminate_command(exportDXF.CMD_ID)
+
+        root_component = design.rootComponent
+        faces = exportDXF.get_panel_faces(
+            root_component, exportDXF.DEFAULT_MIN_THICKNESS
+        )
+        component_names = exportDXF.component_names_cache.get(
+            root_component.id,
+            lambda: exportDXF.get_component_names(root_component),
+        )
+
+        # Faces read by a previous export of the same design are cached
+        face_indices = {}
+        parts = [
+            exportDXF.face_parts_cache.get(
+                face.entityToken,
+                lambda: exportDXF.read_face_part(face, component_names, face_indices),
+            )[2]
+            for face in faces
+        ]
+        exportDXF.export_parts(
+            parts,
+            folder,
+            exportDXF.DEFAULT_KERF,
+            exportDXF.DEFAULT_CUT_LIST_FORMAT,
+            EXPORT_SHEET_SETTINGS,
+        )
+
+    return run
+
+
+def measure(name: str, run, top: int):
+    """
+    Run a benchmark once and print its duration and API calls.
+    """
+
+    adsk.stats.reset()
+    start_time = time.perf_counter()
+    run()
+    duration = time.perf_counter() - start_time
+
+    most_called = ", ".join(
+        f"{member} {count}" for member, count in adsk.stats.get_most_called(top)
+    )
+    print(
+        f"{name:<32} {duration * 1000:>9.1f} ms {adsk.stats.get_total_calls():>9} calls"
+        f"   {most_called}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--panels",
+        type=int,
+        nargs="+",
+        default=DEFAULT_PANEL_COUNTS,
+        help="numbers of panels of the designs",
+    )
+    parser.add_argument(
+        "--call-cost",
+        type=float,
+        default=0,
+        help="simulated duration of each API call, in microseconds",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        help="number of most called API members to show",
+    )
+    args = parser.parse_args()
+
+    adsk.stats.call_cost = args.call_cost / 1e6
+
+    # Keep the report free of the debug messages of the add-in
+    logging_utils.DEBUG = False
+
+    # Drop the cached values on the events Fusion would fire
+    futil.start_design_watch()
+    exportDXF.start()
+
+    for panel_count in args.panels:
+        print(f"--- {panel_count} panels")
+        measure("box joint", benchmark_box_joint(panel_count), args.top)
+        measure(
+            "dress up (overlap)",
+            benchmark_dress_up(panel_count, corners.CornerPolicy.Overlap),
+            args.top,
+        )
+        measure(
+            "dress up (miter)",
+            benchmark_dress_up(panel_count, corners.CornerPolicy.Miter),
+            args.top,
+        )
+
+        with tempfile.TemporaryDirectory() as folder:
+            export = benchmark_export(panel_count, folder)
+            measure("export dxf (cold)", export, args.top)
+            measure("export dxf (warm)", export, args.top)
+
+
+if __name__ == "__main__":
+    main()
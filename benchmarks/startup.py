@@ -0,0 +1,49 @@
+"""
+Measure the time to start and stop the add-in without Fusion.
+
+Run it in its own process, so that no module of the add-in is imported yet.
+"""
+
+import importlib
+import os
+import sys
+import time
+
+BENCHMARKS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+ADDIN_FOLDER = os.path.dirname(BENCHMARKS_FOLDER)
+
+# The stand-in must be found before any real adsk package, and the add-in is
+# imported as a package so that its relative imports work
+sys.path.insert(0, BENCHMARKS_FOLDER)
+sys.path.insert(1, os.path.dirname(ADDIN_FOLDER))
+
+import adsk.core
+
+ADDIN_PACKAGE = os.path.basename(ADDIN_FOLDER)
+
+
+def main():
+    start_time = time.perf_counter()
+    addin = importlib.import_module(f"{ADDIN_PACKAGE}.EasyBox")
+    import_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    addin.run(None)
+    run_time = time.perf_counter() - start_time
+
+    ui = adsk.core.Application.get().userInterface
+    loaded_commands = [
+        name for name in sys.modules if name.startswith(f"{ADDIN_PACKAGE}.commands.")
+    ]
+    print(f"import {import_time * 1000:>9.1f} ms")
+    print(f"run    {run_time * 1000:>9.1f} ms")
+    print(f"buttons          {ui.commandDefinitions.count}")
+    print(f"command modules  {', '.join(sorted(loaded_commands))}")
+
+    start_time = time.perf_counter()
+    addin.stop(None)
+    print(f"stop   {(time.perf_counter() - start_time) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,18 @@
 # Here you define the commands that will be added to your add-in.
 
-# TODO Import the modules corresponding to the commands you created.
+# TODO Import the packages corresponding to the commands you created.
 # If you want to add an additional command, duplicate one of the existing directories and import it here.
-# You need to use aliases (import "entry" as "my_module") assuming you have the default module named "entry".
-from .boxJoint import entry as boxJoint
-from .dressUp import entry as dressUp
-from .exportDXF import entry as exportDXF
+# Only the package with the metadata of the button is imported here, the "entry"
+# module of the command is imported when the command is first run.
+from ..lib import fusionAddInUtils as futil
+from . import boxJoint, dressUp, exportDXF
 
-# TODO add your imported modules to this list.
+# TODO add your imported packages to this list.
 # Fusion will automatically call the start() and stop() functions.
 commands = [
-    boxJoint,
-    dressUp,
-    exportDXF,
+    futil.LazyCommand(boxJoint),
+    futil.LazyCommand(dressUp),
+    futil.LazyCommand(exportDXF),
 ]
 
 
@@ -0,0 +1,26 @@
+# Metadata of the command, read when the add-in starts to create its button.
+# The command itself is in the entry module, imported when it is first run.
+import os
+
+from ... import config
+
+CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_boxJoint"
+CMD_NAME = "Box Joint"
+CMD_Description = "Create box joints between bodies. Specify the number of tenons, their width, and if an as built joint should be added."
+
+# Specify that the command will be promoted to the panel.
+IS_PROMOTED = True
+
+# This is done by specifying the workspace, the tab, and the panel, and the
+# command it will be inserted beside. Not providing the command to position it
+# will insert it at the end.
+WORKSPACE_ID = "FusionSolidEnvironment"
+PANEL_ID = "SolidModifyPanel"
+COMMAND_BESIDE_ID = ""
+IS_BEFORE = True
+
+# Resource location for command icons, here we assume a sub folder in this directory named "resources".
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+
+# Tool clip shown when hovering the button, in the icon folder.
+TOOLCLIP_FILENAME = "Toolclip.png"
@@ -1,37 +1,23 @@
 import adsk.core
 import adsk.fusion
-import os
+import functools
 
 from ...lib import fusionAddInUtils as futil
-from ... import config
+from ...lib.easyBoxCore import geometry
+from . import CMD_ID, CMD_NAME, ICON_FOLDER
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-
-CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_boxJoint"
-CMD_NAME = "Box Joint"
-CMD_Description = "Create box joints between bodies. Specify the number of tenons, their width, and if an as built joint should be added."
-
-# Specify that the command will be promoted to the panel.
-IS_PROMOTED = True
-
-# This is done by specifying the workspace, the tab, and the panel, and the
-# command it will be inserted beside. Not providing the command to position it
-# will insert it at the end.
-WORKSPACE_ID = "FusionSolidEnvironment"
-PANEL_ID = "SolidModifyPanel"
-COMMAND_BESIDE_ID = ""
-IS_BEFORE = True
-
 # Default values for the command inputs
 DEFAULT_TENON_COUNT = 3
 DEFAULT_AUTO_WIDTH = True
 DEFAULT_TENON_WIDTH = 0.5
 DEFAULT_ADD_JOINT = False
 
-# Resource location for command icons, here we assume a sub folder in this directory named "resources".
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+# Number of faces previewed, the joints of larger batches are only created
+# once the command is executed, face by face between the events of the UI
+PREVIEW_MAX_FACES = 4
 
 # Input ids
 SELECT_BODY_INPUT_ID = f"{CMD_ID}_select_body"
@@ -55,6 +41,9 @@ status_input: adsk.core.TextBoxCommandInput = None
 # they are not released and garbage collected.
 local_handlers = []
 
+# Planes of the faces of the bodies by entity token, until the design changes
+body_planes_cache = futil.get_cache(f"{CMD_ID}_body_planes")
+
 last_tenon_count = DEFAULT_TENON_COUNT
 last_auto_width = DEFAULT_AUTO_WIDTH
 last_tenon_width = DEFAULT_TENON_WIDTH
@@ -74,54 +63,6 @@ class StatusLevel:
     Error = 2
 
 
-def start():
-    """
-    Executed when the add-in is run.
-    """
-
-    # Create a command Definition.
-    cmd_def = ui.commandDefinitions.addButtonDefinition(
-        CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER
-    )
-    cmd_def.toolClipFilename = ICON_FOLDER + "Toolclip.png"
-
-    # Define an event handler for the command created event. It will be called when the button is clicked.
-    futil.add_handler(cmd_def.commandCreated, command_created)
-
-    # ******** Add a button into the UI so the user can run the command. ********
-    # Get the target workspace the button will be created in.
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-
-    # Get the panel the button will be created in.
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-
-    # Create the button command control in the UI after the specified existing command.
-    control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, IS_BEFORE)
-
-    # Specify if the command is promoted to the main toolbar.
-    control.isPromoted = IS_PROMOTED
-
-
-def stop():
-    """
-    Executed when add-in is stopped.
-    """
-
-    # Get the various UI elements for this command
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-    command_control = panel.controls.itemById(CMD_ID)
-    command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-    # Delete the button command control
-    if command_control:
-        command_control.deleteMe()
-
-    # Delete the command definition
-    if command_definition:
-        command_definition.deleteMe()
-
-
 def command_created(args: adsk.core.CommandCreatedEventArgs):
     """
     Function that is called when a user clicks
@@ -131,7 +72,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Created Event")
+    futil.log("%s Command Created Event", CMD_NAME, level=futil.LogLevel.Debug)
 
     # Create the inputs for the command dialog.
     create_inputs(args.command.commandInputs)
@@ -148,7 +89,7 @@ def command_execute(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Execute Event")
+    futil.log("%s Command Execute Event", CMD_NAME, level=futil.LogLevel.Debug)
     inputs = args.command.commandInputs
 
     select_body_input: adsk.core.SelectionCommandInput = inputs.itemById(
@@ -170,14 +111,30 @@ def command_execute(args: adsk.core.CommandEventArgs):
         ADD_JOINT_INPUT_ID
     )
 
-    for face_index in range(select_face_input.selectionCount):
-        create_mortises_and_tenons(
-            select_body_input.selection(0).entity,
-            select_face_input.selection(face_index).entity,
-            tenon_count_input.value,
-            tenon_width_input.expression if not auto_width_input.value else None,
-            add_joint_input.value,
+    body = select_body_input.selection(0).entity
+    tenon_width_expression = (
+        tenon_width_input.expression if not auto_width_input.value else None
+    )
+
+    # Create the joints face by face between the events of the user interface
+    futil.queue_job(
+        futil.Job(
+            f"{CMD_NAME} ({body.name})",
+            [
+                functools.partial(
+                    create_mortises_and_tenons,
+                    body,
+                    select_face_input.selection(face_index).entity,
+                    tenon_count_input.value,
+                    tenon_width_expression,
+                    add_joint_input.value,
+                )
+                for face_index in range(select_face_input.selectionCount)
+            ],
+            "Creating joints %v/%m",
+            on_done=report_failed_joints,
         )
+    )
 
 
 def command_preview(args: adsk.core.CommandEventArgs):
@@ -187,7 +144,12 @@ def command_preview(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Preview Event")
+    futil.log(
+        "%s Command Preview Event",
+        CMD_NAME,
+        level=futil.LogLevel.Debug,
+        rate_limited=True,
+    )
     inputs = args.command.commandInputs
 
     select_body_input: adsk.core.SelectionCommandInput = inputs.itemById(
@@ -212,8 +174,11 @@ def command_preview(args: adsk.core.CommandEventArgs):
     # Reduce the body opacity to help visualize the joint
     select_body_input.selection(0).entity.opacity = 0.4
 
+    # Only preview the first faces of a large batch
+    face_count = min(select_face_input.selectionCount, PREVIEW_MAX_FACES)
+
     results = {}
-    for face_index in range(select_face_input.selectionCount):
+    for face_index in range(face_count):
         results[face_index] = create_mortises_and_tenons(
             select_body_input.selection(0).entity,
             select_face_input.selection(face_index).entity,
@@ -222,7 +187,10 @@ def command_preview(args: adsk.core.CommandEventArgs):
             add_joint_input.value,
         )
 
-    args.isValidResult = min(results.values())
+    # The preview of a whole batch is kept as the result, otherwise the command is executed
+    args.isValidResult = (
+        min(results.values()) and face_count == select_face_input.selectionCount
+    )
 
 
 def command_input_changed(args: adsk.core.InputChangedEventArgs):
@@ -237,7 +205,10 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
 
     # General logging for debug.
     futil.log(
-        f"{CMD_NAME} Input Changed Event fired from a change to {changed_input.id}"
+        "%s Input Changed Event fired from a change to %s",
+        CMD_NAME,
+        changed_input.id,
+        level=futil.LogLevel.Debug,
     )
 
     global last_tenon_count, last_tenon_width, last_auto_width, last_add_joint
@@ -282,7 +253,7 @@ def command_validate_input(args: adsk.core.ValidateInputsEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Validate Input Event")
+    futil.log("%s Validate Input Event", CMD_NAME, level=futil.LogLevel.Debug)
 
     inputs = args.inputs
 
@@ -316,7 +287,13 @@ def command_destroy(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Destroy Event")
+    futil.log("%s Command Destroy Event", CMD_NAME, level=futil.LogLevel.Debug)
+
+    # Report the API calls made while the command was open
+    futil.dump_api_profile(CMD_NAME)
+
+    # Report the latencies of the command event handlers
+    futil.dump_event_latencies(__name__)
 
     global local_handlers, status_input
     local_handlers = []
@@ -337,7 +314,12 @@ def command_pre_select(args: adsk.core.SelectionEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Pre-Select Event")
+    futil.log(
+        "%s Command Pre-Select Event",
+        CMD_NAME,
+        level=futil.LogLevel.Debug,
+        rate_limited=True,
+    )
 
     inputs = args.activeInput.commandInputs
 
@@ -357,12 +339,7 @@ def command_pre_select(args: adsk.core.SelectionEventArgs):
             return
 
         # Prevent selecting a face that is not coplanar with the selected body faces
-        selectable = False
-        for body_face in selected_body.faces:
-            if are_faces_coplanar([selected_entity, body_face]):
-                selectable = True
-                break
-        args.isSelectable = selectable
+        args.isSelectable = is_coplanar_to_body_face(selected_entity, selected_body)
 
 
 def create_inputs(inputs: adsk.core.CommandInputs):
@@ -465,26 +442,21 @@ def connect_to_events(command: adsk.core.Command):
     )
 
 
-def get_plane_from_face(face: adsk.fusion.BRepFace) -> adsk.core.Plane:
-    """
-    Get a plane from a face.
+def is_coplanar_to_body_face(
+    face: adsk.fusion.BRepFace, body: adsk.fusion.BRepBody
+) -> bool:
     """
+    Check if a face is coplanar to at least one face of a body.
 
-    point = face.pointOnFace
-    _, normal = face.evaluator.getNormalAtPoint(point)
-    return adsk.core.Plane.create(point, normal)
-
-
-def are_faces_coplanar(faces: list[adsk.fusion.BRepFace]) -> bool:
-    """
-    Check if a list of faces are coplanar.
+    The planes of the body faces are read once until the design changes, and
+    compared all together.
     """
 
-    plane = get_plane_from_face(faces[0])
-    for face in faces[1:]:
-        if not plane.isCoPlanarTo(get_plane_from_face(face)):
-            return False
-    return True
+    plane = futil.get_face_plane(face)
+    body_planes = body_planes_cache.get(
+        body.entityToken, lambda: futil.get_face_planes(body.faces)
+    )
+    return any(geometry.get_coplanar_mask(plane, body_planes))
 
 
 def update_status_message(
@@ -497,6 +469,10 @@ def update_status_message(
 
     global status_input
 
+    # The joints of an executed command are created once its dialog is closed
+    if not status_input:
+        return
+
     prefix = STATUS_HTML_PREFIX
     if info_level == StatusLevel.Success:
         prefix += STATUS_HTML_SUCCESS_START
@@ -512,6 +488,18 @@ def update_status_message(
     status_input.formattedText = f"{prefix}{message}{suffix}"
 
 
+def report_failed_joints(job: futil.Job):
+    """
+    Show the number of joints that could not be created by a job.
+    """
+
+    if job.failed_count:
+        futil.msg_box(
+            f"Failed to create {job.failed_count} of {len(job.units)} joints",
+            icon=adsk.core.MessageBoxIconTypes.WarningIconType,
+        )
+
+
 def get_common_parent_component(
     design: adsk.fusion.Design, *components: adsk.fusion.Component
 ) -> adsk.fusion.Component:
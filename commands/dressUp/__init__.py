@@ -0,0 +1,26 @@
+# Metadata of the command, read when the add-in starts to create its button.
+# The command itself is in the entry module, imported when it is first run.
+import os
+
+from ... import config
+
+CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_dressUp"
+CMD_NAME = "Dress Up"
+CMD_Description = "Offsets the walls of a solid body to create one panel per face. Select a body to dress up, remove unwanted faces, then specify the thickness of the panels."
+
+# Specify that the command will be promoted to the panel.
+IS_PROMOTED = True
+
+# This is done by specifying the workspace, the tab, and the panel, and the
+# command it will be inserted beside. Not providing the command to position it
+# will insert it at the end.
+WORKSPACE_ID = "FusionSolidEnvironment"
+PANEL_ID = "SolidCreatePanel"
+COMMAND_BESIDE_ID = ""
+IS_BEFORE = True
+
+# Resource location for command icons, here we assume a sub folder in this directory named "resources".
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+
+# Tool clip shown when hovering the button, in the icon folder.
+TOOLCLIP_FILENAME = "Toolclip.png"
@@ -1,34 +1,24 @@
 import adsk.core
 import adsk.fusion
-import os
+import functools
+from typing import Callable
 
 from ...lib import fusionAddInUtils as futil
-from ... import config
+from ...lib.easyBoxCore import corners, geometry
+from . import CMD_ID, CMD_NAME, ICON_FOLDER
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_dressUp"
-CMD_NAME = "Dress Up"
-CMD_Description = "Offsets the walls of a solid body to create one panel per face. Select a body to dress up, remove unwanted faces, then specify the thickness of the panels."
-
-# Specify that the command will be promoted to the panel.
-IS_PROMOTED = True
-
-# This is done by specifying the workspace, the tab, and the panel, and the
-# command it will be inserted beside. Not providing the command to position it
-# will insert it at the end.
-WORKSPACE_ID = "FusionSolidEnvironment"
-PANEL_ID = "SolidCreatePanel"
-COMMAND_BESIDE_ID = ""
-IS_BEFORE = True
-
-# Resource location for command icons, here we assume a sub folder in this directory named "resources".
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
-
 # Default thickness value
 DEFAULT_THICKNESS = 0.3
 
+# Default corner policy
+DEFAULT_CORNER_POLICY = corners.CornerPolicy.Overlap
+
+# Distance between a face and its label, along the face normal
+LABEL_OFFSET = 1
+
 # Input ids
 SELECT_FACES_INPUT_ID = f"{CMD_ID}_select_faces_input"
 SELECT_ALL_FACES_INPUT_ID = f"{CMD_ID}_select_all_faces_input"
@@ -40,6 +30,7 @@ TABLE_PANEL_NAME_INPUT_ID = f"{CMD_ID}_config_panel_name_input"
 TABLE_PANEL_THICKNESS_INPUT_ID = f"{CMD_ID}_config_panel_thickness_input"
 CONFIG_GROUP_INPUT_ID = f"{CMD_ID}_config_group"
 CREATE_COMPONENT_INPUT_ID = f"{CMD_ID}_create_component_input"
+CORNER_POLICY_INPUT_ID = f"{CMD_ID}_corner_policy_input"
 
 # Table parameters
 TABLE_COLUMNS_COUNT = 3
@@ -48,10 +39,20 @@ TABLE_PANEL_FACE_ID_COLUMN = 0
 TABLE_PANEL_NAME_INPUT_COLUMN = 1
 TABLE_PANEL_THICKNESS_INPUT_COLUMN = 2
 
+# Corner policies names displayed in the dropdown
+CORNER_POLICY_NAMES = {
+    corners.CornerPolicy.Overlap: "Overlap",
+    corners.CornerPolicy.Butt: "Butt",
+    corners.CornerPolicy.Orientation: "Orientation Priority",
+    corners.CornerPolicy.Miter: "Miter",
+}
+
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
 
+last_corner_policy = DEFAULT_CORNER_POLICY
+
 
 class PanelConfig:
     """
@@ -72,54 +73,6 @@ class PanelConfig:
         return isinstance(value, PanelConfig) and value.face_id == self.face_id
 
 
-def start():
-    """
-    Executed when add-in is run.
-    """
-
-    # Create a command Definition.
-    cmd_def = ui.commandDefinitions.addButtonDefinition(
-        CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER
-    )
-    cmd_def.toolClipFilename = ICON_FOLDER + "Toolclip.png"
-
-    # Define an event handler for the command created event. It will be called when the button is clicked.
-    futil.add_handler(cmd_def.commandCreated, command_created)
-
-    # ******** Add a button into the UI so the user can run the command. ********
-    # Get the target workspace the button will be created in.
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-
-    # Get the panel the button will be created in.
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-
-    # Create the button command control in the UI after the specified existing command.
-    control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, IS_BEFORE)
-
-    # Specify if the command is promoted to the main toolbar.
-    control.isPromoted = IS_PROMOTED
-
-
-def stop():
-    """
-    Executed when add-in is stopped.
-    """
-
-    # Get the various UI elements for this command
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-    command_control = panel.controls.itemById(CMD_ID)
-    command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-    # Delete the button command control
-    if command_control:
-        command_control.deleteMe()
-
-    # Delete the command definition
-    if command_definition:
-        command_definition.deleteMe()
-
-
 def command_created(args: adsk.core.CommandCreatedEventArgs):
     """
     Function that is called when a user clicks
@@ -129,7 +82,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Created Event")
+    futil.log("%s Command Created Event", CMD_NAME, level=futil.LogLevel.Debug)
 
     # Create the inputs for the command dialog.
     create_inputs(args.command.commandInputs)
@@ -146,7 +99,7 @@ def command_execute(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Execute Event")
+    futil.log("%s Command Execute Event", CMD_NAME, level=futil.LogLevel.Debug)
     inputs = args.command.commandInputs
 
     # Get the body from the first selected face
@@ -164,8 +117,29 @@ def command_execute(args: adsk.core.CommandEventArgs):
     )
     create_component = create_component_input.value
 
-    # Dress up the body
-    dress_up(body, panel_configs, create_component, remove_body=True)
+    # Get the corner policy
+    corner_policy = get_corner_policy(inputs.itemById(CORNER_POLICY_INPUT_ID))
+
+    # Timeline indices of the features created by the job, the user may
+    # create other features between its units
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    timeline_indices = []
+
+    # Create the panels one by one between the events of the user interface,
+    # the body is only removed once all the panels are created
+    futil.queue_job(
+        futil.Job(
+            f"{CMD_NAME} ({body.name})",
+            get_panel_units(
+                body, panel_configs, create_component, corner_policy, timeline_indices
+            ),
+            "Creating panels %v/%m",
+            on_done=lambda job: finish_dress_up(design, body, timeline_indices),
+            on_cancel=lambda job: finish_dress_up(
+                design, body, timeline_indices, False
+            ),
+        )
+    )
 
 
 def command_preview(args: adsk.core.CommandEventArgs):
@@ -175,7 +149,12 @@ def command_preview(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Preview Event")
+    futil.log(
+        "%s Command Preview Event",
+        CMD_NAME,
+        level=futil.LogLevel.Debug,
+        rate_limited=True,
+    )
     inputs = args.command.commandInputs
 
     # Get the body from the first selected face
@@ -205,7 +184,10 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
 
     # General logging for debug.
     futil.log(
-        f"{CMD_NAME} Input Changed Event fired from a change to {changed_input.id}"
+        "%s Input Changed Event fired from a change to %s",
+        CMD_NAME,
+        changed_input.id,
+        level=futil.LogLevel.Debug,
     )
 
     if changed_input.id == SELECT_FACES_INPUT_ID and isinstance(
@@ -287,6 +269,11 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         for panel_config in panel_configs.values():
             add_config_row_to_table(table_input, panel_config)
 
+    # Keep last corner policy value for next time
+    elif changed_input.id == CORNER_POLICY_INPUT_ID:
+        global last_corner_policy
+        last_corner_policy = get_corner_policy(changed_input)
+
 
 def command_destroy(args: adsk.core.CommandEventArgs):
     """
@@ -294,7 +281,13 @@ def command_destroy(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Destroy Event")
+    futil.log("%s Command Destroy Event", CMD_NAME, level=futil.LogLevel.Debug)
+
+    # Report the API calls made while the command was open
+    futil.dump_api_profile(CMD_NAME)
+
+    # Report the latencies of the command event handlers
+    futil.dump_event_latencies(__name__)
 
     # Reset the global variables
     global local_handlers
@@ -308,7 +301,12 @@ def command_pre_select(args: adsk.core.SelectionEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Pre-Select Event")
+    futil.log(
+        "%s Command Pre-Select Event",
+        CMD_NAME,
+        level=futil.LogLevel.Debug,
+        rate_limited=True,
+    )
 
     active_input = args.activeInput
     selected_entity = args.selection.entity
@@ -370,6 +368,24 @@ def create_inputs(inputs: adsk.core.CommandInputs):
         "If checked, a component will be created for each panel."
     )
 
+    # Create a dropdown input to choose how panels meet at the corners
+    corner_policy_input = inputs.addDropDownCommandInput(
+        CORNER_POLICY_INPUT_ID,
+        "Corners",
+        adsk.core.DropDownStyles.TextListDropDownStyle,
+    )
+    for policy, name in CORNER_POLICY_NAMES.items():
+        corner_policy_input.listItems.add(name, policy == last_corner_policy)
+    corner_policy_input.tooltip = "How the panels meet at the corners"
+    corner_policy_input.tooltipDescription = (
+        "<b>Overlap</b>: panels are not trimmed and overlap at each corner.<br/>"
+        "<b>Butt</b>: the largest panel runs through, the other one is trimmed.<br/>"
+        "<b>Orientation Priority</b>: panels facing Z run through panels facing Y, "
+        "which run through panels facing X.<br/>"
+        "<b>Miter</b>: both panels are cut at an angle.<br/><br/>"
+        "Only perpendicular panels with straight edges are trimmed."
+    )
+
     # Create an advanced configuration group
     config_group_input = inputs.addGroupCommandInput(
         CONFIG_GROUP_INPUT_ID,
@@ -503,15 +519,11 @@ def get_panel_configs_from_table(
 
 
 def draw_face_label(
-    face: adsk.fusion.BRepFace,
+    anchor: tuple[float, float, float],
     graphics: adsk.fusion.CustomGraphicsGroup,
     config: PanelConfig,
 ):
-    point = face.pointOnFace.copy()
-    _, normal = face.evaluator.getNormalAtPoint(point)
-    point.translateBy(normal)
-    matrix = adsk.core.Matrix3D.create()
-    matrix.translation = point.asVector()
+    matrix = futil.create_matrix3d(geometry.get_translation_matrix(anchor))
 
     text = graphics.addText(config.panel_name, "Arial", 2, matrix)
     text.viewScale = adsk.fusion.CustomGraphicsViewScale.create(
@@ -545,11 +557,191 @@ def draw_all_faces_labels(
 
     panel_configs = get_panel_configs_from_table(table_input)
 
+    face_ids = []
+    faces = []
     for i in range(1, table_input.rowCount):
         face_id_input = table_input.getInputAtPosition(i, TABLE_PANEL_FACE_ID_COLUMN)
         face_id = int(face_id_input.value)
+        face_ids.append(face_id)
+        faces.append(body.findByTempId(face_id)[0])
+
+    # Place the labels in front of their faces all together
+    planes = futil.get_face_planes(faces)
+    anchors = geometry.offset_points(
+        [plane.origin for plane in planes],
+        [plane.normal for plane in planes],
+        LABEL_OFFSET,
+    )
+    for face_id, anchor in zip(face_ids, anchors):
+        draw_face_label(anchor, graphics, panel_configs.get(face_id))
+
+
+def get_corner_policy(corner_policy_input: adsk.core.DropDownCommandInput) -> str:
+    """
+    Get the corner policy selected in the dropdown input.
+    """
+
+    selected_name = corner_policy_input.selectedItem.name
+    for policy, name in CORNER_POLICY_NAMES.items():
+        if name == selected_name:
+            return policy
+    return DEFAULT_CORNER_POLICY
+
+
+def get_face_outline(face: adsk.fusion.BRepFace):
+    """
+    Get the ordered vertices and edges of a planar face bounded by straight edges.
+
+    Returns None if the face is not planar, has holes or curved edges.
+    """
+
+    if face.geometry.surfaceType != adsk.core.SurfaceTypes.PlaneSurfaceType:
+        return None
+
+    if face.loops.count != 1:
+        return None
+
+    points = []
+    edges = []
+    for co_edge in face.loops.item(0).coEdges:
+        edge = co_edge.edge
+        if edge.geometry.curveType != adsk.core.Curve3DTypes.Line3DCurveType:
+            return None
+
+        vertex = edge.endVertex if co_edge.isOpposedToEdge else edge.startVertex
+        points.append(tuple(vertex.geometry.asArray()))
+        edges.append(edge)
+
+    return points, edges
+
+
+def resolve_panel_outlines(
+    body: adsk.fusion.BRepBody,
+    panel_configs: dict,
+    corner_policy: str,
+) -> dict:
+    """
+    Compute the trimmed outlines of the panels according to the corner policy.
+
+    Returns a dict of outlines by face id. Panels that do not need to be
+    trimmed or cannot be trimmed are not in the dict.
+    """
+
+    if corner_policy == corners.CornerPolicy.Overlap:
+        return {}
+
+    units_manager = app.activeProduct.unitsManager
+
+    # Collect the panels geometry
+    panels = {}
+    faces = {}
+    for face_id, panel_config in panel_configs.items():
         face: adsk.fusion.BRepFace = body.findByTempId(face_id)[0]
-        draw_face_label(face, graphics, panel_configs.get(face_id))
+        _, normal = face.evaluator.getNormalAtPoint(face.pointOnFace)
+        thickness = units_manager.evaluateExpression(
+            panel_config.thickness_expression, units_manager.internalUnits
+        )
+        panels[face_id] = corners.CornerPanel(
+            face_id, tuple(normal.asArray()), thickness, face.area
+        )
+        faces[face_id] = face
+
+    # Compute the outlines
+    outlines = {}
+    for face_id, panel in panels.items():
+        face_outline = get_face_outline(faces[face_id])
+        if not face_outline:
+            futil.log("%s Face %s can not be trimmed", CMD_NAME, face_id)
+            continue
+
+        points, edges = face_outline
+        insets = []
+        for edge in edges:
+            inset = (0.0, 0.0)
+            for neighbour_face in edge.faces:
+                neighbour = panels.get(neighbour_face.tempId)
+                if neighbour and neighbour is not panel:
+                    inset = corners.get_edge_insets(corner_policy, panel, neighbour)
+            insets.append(inset)
+
+        outline = corners.resolve_panel_outline(
+            points, panel.normal, panel.thickness, insets
+        )
+        if outline:
+            outlines[face_id] = outline
+
+    return outlines
+
+
+def draw_outline(sketch: adsk.fusion.Sketch, points: list):
+    """
+    Draw a closed polygon in a sketch from model space points.
+    """
+
+    sketch_points = [
+        sketch.modelToSketchSpace(adsk.core.Point3D.create(*point)) for point in points
+    ]
+
+    sketch_lines = sketch.sketchCurves.sketchLines
+    first_line = previous_line = None
+    for i in range(len(sketch_points)):
+        start = previous_line.endSketchPoint if previous_line else sketch_points[i]
+        end = (
+            first_line.startSketchPoint
+            if i == len(sketch_points) - 1
+            else sketch_points[i + 1]
+        )
+        previous_line = sketch_lines.addByTwoPoints(start, end)
+        first_line = first_line or previous_line
+
+
+def create_trimmed_panel(
+    panel_component: adsk.fusion.Component,
+    face: adsk.fusion.BRepFace,
+    outline: corners.PanelOutline,
+    thickness_expression: str,
+):
+    """
+    Create a panel body from its trimmed outer and inner outlines.
+
+    Returns the extrude or loft feature that creates the body.
+    """
+
+    # Draw the outer outline on the face
+    outer_sketch = panel_component.sketches.add(face)
+    draw_outline(outer_sketch, outline.outer)
+    outer_sketch.isVisible = False
+    outer_profile = outer_sketch.profiles.item(0)
+
+    # Extrude the outline when the panel edges are square
+    if outline.is_square:
+        return panel_component.features.extrudeFeatures.addSimple(
+            outer_profile,
+            adsk.core.ValueInput.createByString(f"{thickness_expression} * -1"),
+            adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
+        )
+
+    # Draw the inner outline on a plane offset by the panel thickness
+    construction_planes = panel_component.constructionPlanes
+    plane_input = construction_planes.createInput()
+    plane_input.setByOffset(
+        face, adsk.core.ValueInput.createByString(f"{thickness_expression} * -1")
+    )
+    inner_plane = construction_planes.add(plane_input)
+    inner_plane.isLightBulbOn = False
+    inner_sketch = panel_component.sketches.add(inner_plane)
+    draw_outline(inner_sketch, outline.inner)
+    inner_sketch.isVisible = False
+
+    # Loft between the two outlines
+    loft_features = panel_component.features.loftFeatures
+    loft_input = loft_features.createInput(
+        adsk.fusion.FeatureOperations.NewBodyFeatureOperation
+    )
+    loft_input.loftSections.add(outer_profile)
+    loft_input.loftSections.add(inner_sketch.profiles.item(0))
+    loft_input.isSolid = True
+    return loft_features.add(loft_input)
 
 
 def dress_up(
@@ -557,6 +749,7 @@ def dress_up(
     panel_configs: dict,
     create_component: bool = True,
     remove_body: bool = True,
+    corner_policy: str = DEFAULT_CORNER_POLICY,
 ):
     """
     Dress up a body with panels.
@@ -564,48 +757,161 @@ def dress_up(
 
     design = adsk.fusion.Design.cast(app.activeProduct)
 
-    # Get the timeline marker position
-    timeline = design.timeline
-    start_index = timeline.markerPosition
+    # Timeline indices of the created features
+    timeline_indices = []
+
+    for unit in get_panel_units(
+        body, panel_configs, create_component, corner_policy, timeline_indices
+    ):
+        unit()
+
+    finish_dress_up(design, body, timeline_indices, remove_body)
+
+
+def get_panel_units(
+    body: adsk.fusion.BRepBody,
+    panel_configs: dict,
+    create_component: bool = True,
+    corner_policy: str = DEFAULT_CORNER_POLICY,
+    timeline_indices: list[int] = None,
+) -> list:
+    """
+    Get the functions creating the panels of a body, one per panel.
+
+    The corners are resolved at once, before any panel is created. The
+    timeline indices of the features created by each function are appended
+    to `timeline_indices` if given.
+    """
 
     # Get body parent component
     parent_component = body.parentComponent
 
-    for value in panel_configs.values():
-        panel_config: PanelConfig = value
+    # Resolve the corners before creating any feature
+    panel_outlines = resolve_panel_outlines(body, panel_configs, corner_policy)
+
+    units = [
+        functools.partial(
+            create_panel,
+            parent_component,
+            body,
+            panel_config,
+            panel_outlines.get(panel_config.face_id),
+            create_component,
+        )
+        for panel_config in panel_configs.values()
+    ]
 
-        if create_component:
-            # Create a new component for the panel
-            panel_occurence = parent_component.occurrences.addNewComponent(
-                adsk.core.Matrix3D.create(),
-            )
-            panel_component = panel_occurence.component
-            # Rename the component
-            panel_component.name = panel_config.panel_name
-        else:
-            panel_component = parent_component
+    if timeline_indices is None:
+        return units
+    timeline = adsk.fusion.Design.cast(app.activeProduct).timeline
+    return [
+        functools.partial(record_timeline_indices, unit, timeline, timeline_indices)
+        for unit in units
+    ]
+
+
+def record_timeline_indices(
+    function: Callable, timeline: adsk.fusion.Timeline, timeline_indices: list[int]
+):
+    """
+    Call a function and append the timeline indices of the features it created.
+    """
+
+    start_index = timeline.markerPosition
+    try:
+        return function()
+    finally:
+        timeline_indices.extend(range(start_index, timeline.markerPosition))
+
+
+def create_panel(
+    parent_component: adsk.fusion.Component,
+    body: adsk.fusion.BRepBody,
+    panel_config: PanelConfig,
+    outline: corners.PanelOutline,
+    create_component: bool,
+):
+    """
+    Create the panel of a face of a body, trimmed to its outline if any.
+    """
 
+    if create_component:
+        # Create a new component for the panel
+        panel_occurence = parent_component.occurrences.addNewComponent(
+            adsk.core.Matrix3D.create(),
+        )
+        panel_component = panel_occurence.component
+        # Rename the component
+        panel_component.name = panel_config.panel_name
+    else:
+        panel_component = parent_component
+
+    face = body.findByTempId(panel_config.face_id)[0]
+
+    if outline:
+        # Create a new trimmed body for the panel
+        panel_feature = create_trimmed_panel(
+            panel_component, face, outline, panel_config.thickness_expression
+        )
+    else:
         # Create a new body for the panel
         value_input = adsk.core.ValueInput.createByString(
             f"{panel_config.thickness_expression} * -1"
         )
-        extrude_feature = panel_component.features.extrudeFeatures.addSimple(
-            body.findByTempId(panel_config.face_id)[0],
+        panel_feature = panel_component.features.extrudeFeatures.addSimple(
+            face,
             value_input,
             adsk.fusion.FeatureOperations.NewBodyFeatureOperation,
         )
 
-        # Rename the extrude feature
-        extrude_feature.name = f"Extrude ({panel_config.panel_name})"
+    # Rename the feature
+    feature_type = "Loft" if outline and not outline.is_square else "Extrude"
+    panel_feature.name = f"{feature_type} ({panel_config.panel_name})"
+
+    if not create_component:
+        # Rename the body
+        panel_feature.bodies.item(0).name = panel_config.panel_name
 
-        if not create_component:
-            # Rename the body
-            extrude_feature.bodies.item(0).name = panel_config.panel_name
+
+def finish_dress_up(
+    design: adsk.fusion.Design,
+    body: adsk.fusion.BRepBody,
+    timeline_indices: list[int],
+    remove_body: bool = True,
+):
+    """
+    Remove the dressed up body and group the features of the dress up.
+
+    `timeline_indices` are the timeline indices of the created panels. They
+    are only grouped when no other feature was created between them and the
+    last timeline item is one of them.
+    """
 
     # Remove the body
+    timeline = design.timeline
     if remove_body:
-        parent_component.features.removeFeatures.add(body)
+        record_timeline_indices(
+            lambda: body.parentComponent.features.removeFeatures.add(body),
+            timeline,
+            timeline_indices,
+        )
+
+    # Nothing to group if no panel was created
+    if not timeline_indices:
+        return
+
+    start_index, end_index = min(timeline_indices), max(timeline_indices)
+    if (
+        end_index - start_index + 1 != len(set(timeline_indices))
+        or end_index != timeline.markerPosition - 1
+    ):
+        futil.log(
+            "%s timeline group not created, other features were created meanwhile",
+            CMD_NAME,
+            level=futil.LogLevel.Warning,
+        )
+        return
 
     # Create a new timeline group
-    group = timeline.timelineGroups.add(start_index, timeline.markerPosition - 1)
+    group = timeline.timelineGroups.add(start_index, end_index)
     group.name = f"Dress Up ({body.name})"
@@ -1,100 +1,192 @@
 import adsk.core
 import adsk.fusion
+import csv
+import hashlib
+import io
+import json
+import math
 import platform
 import os
 import subprocess
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 
 from ...lib import fusionAddInUtils as futil
-from ... import config
+from ...lib.easyBoxCore import (
+    cutlist,
+    dxf,
+    fingerprint,
+    geometry,
+    kerf,
+    manifest,
+    nesting,
+    optimizer,
+)
+from . import CMD_ID, CMD_NAME, ICON_FOLDER
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_exportDXF"
-CMD_NAME = "Export DXF"
-CMD_Description = "Quickly export multiple faces profiles to DXF files."
-
-# Specify that the command will be promoted to the panel.
-IS_PROMOTED = True
-
-# This is done by specifying the workspace, the tab, and the panel, and the
-# command it will be inserted beside. Not providing the command to position it
-# will insert it at the end.
-WORKSPACE_ID = "FusionSolidEnvironment"
-PANEL_ID = "UtilityPanel"
-COMMAND_BESIDE_ID = ""
-IS_BEFORE = True
-
-# Resource location for command icons, here we assume a sub folder in this directory named "resources".
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
-
 # Input ids
 SELECT_FACES_INPUT_ID = f"{CMD_ID}_select_faces_input"
+ALL_PANELS_INPUT_ID = f"{CMD_ID}_all_panels_input"
+MIN_THICKNESS_INPUT_ID = f"{CMD_ID}_min_thickness_input"
 FOLDER_INPUT_ID = f"{CMD_ID}_folder_input"
 FOLDER_BUTTON_ID = f"{CMD_ID}_folder_button"
+KERF_INPUT_ID = f"{CMD_ID}_kerf_input"
+CUT_LIST_FORMAT_INPUT_ID = f"{CMD_ID}_cut_list_format_input"
+SHEET_GROUP_INPUT_ID = f"{CMD_ID}_sheet_group"
+SHEET_WIDTH_INPUT_ID = f"{CMD_ID}_sheet_width_input"
+SHEET_HEIGHT_INPUT_ID = f"{CMD_ID}_sheet_height_input"
+SHEET_SPACING_INPUT_ID = f"{CMD_ID}_sheet_spacing_input"
+ALLOW_ROTATION_INPUT_ID = f"{CMD_ID}_allow_rotation_input"
+OPTIMIZE_LAYOUT_INPUT_ID = f"{CMD_ID}_optimize_layout_input"
 
 # Constants
 SELECTION_SET_NAME = CMD_NAME
 DEFAULT_EXPORT_FOLDER = os.path.join(os.path.expanduser("~"), "Desktop", "DXF")
 MASTER_SKETCH_FILENAME = "master.dxf"
-MASTER_SKETCH_MAX_X = 50
-MASTER_SKETCH_SPACING = 0.1
+QUANTITIES_FILENAME = "quantities.csv"
+CUT_LIST_FILENAME = "cutlist"
+
+# Suffix of the files written before they replace the exported files
+TEMPORARY_FILE_SUFFIX = ".tmp"
+
+# Default values for the all panels mode, thinner bodies are not panels
+DEFAULT_ALL_PANELS = False
+DEFAULT_MIN_THICKNESS = 0.1
+
+# Default width of the cut, profiles are offset by half of it (0 to disable)
+DEFAULT_KERF = 0
+
+# Default format of the cut list
+DEFAULT_CUT_LIST_FORMAT = cutlist.CutListFormat.CSV
+
+# Cut list formats names displayed in the dropdown
+CUT_LIST_FORMAT_NAMES = {
+    cutlist.CutListFormat.CSV: "CSV",
+    cutlist.CutListFormat.JSON: "JSON",
+}
+
+# Default values for the master sheets
+DEFAULT_SHEET_WIDTH = 60
+DEFAULT_SHEET_HEIGHT = 40
+DEFAULT_SHEET_SPACING = 0.1
+DEFAULT_ALLOW_ROTATION = True
+DEFAULT_OPTIMIZE_LAYOUT = False
+
+# Time spent looking for a better layout when optimizing, in seconds
+OPTIMIZATION_TIME_BUDGET = 5
+
+# Number of decimals kept when comparing thicknesses, in centimeters
+THICKNESS_PRECISION = 3
+
+# Fusion internal units are centimeters, DXF files are written in millimeters
+DXF_UNITS_SCALE = 10
+
+# Maximum distance between a curve and the polyline approximating it
+STROKE_TOLERANCE = 0.001
+
+# Maximum distance between a polyline and its simplified version written to the files
+SIMPLIFY_TOLERANCE = 0.002
+
+# Number of threads writing the files, writing is mostly waiting for the disk
+EXPORT_WORKERS = 4
+
+# Number of faces read each time the export chunk event is handled, Fusion
+# stays responsive and the progress dialog is updated between two chunks
+EXPORT_CHUNK_SIZE = 10
+
+# Custom event fired to read the next chunk of faces
+EXPORT_CHUNK_EVENT_ID = f"{CMD_ID}_export_chunk"
+
+# Custom event fired by the export thread when all files are written
+EXPORT_DONE_EVENT_ID = f"{CMD_ID}_export_done"
 
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
 
+# Component path names by root component id, and read faces by entity token,
+# until the design changes
+component_names_cache = futil.get_cache(f"{CMD_ID}_component_names")
+face_parts_cache = futil.get_cache(f"{CMD_ID}_face_parts")
+
 export_folder = DEFAULT_EXPORT_FOLDER
 folder_dialog: adsk.core.FolderDialog = None
 
-master_sketch_offset_x, master_sketch_offset_y = 0, 0
+last_all_panels = DEFAULT_ALL_PANELS
+last_min_thickness = DEFAULT_MIN_THICKNESS
+last_kerf = DEFAULT_KERF
+last_cut_list_format = DEFAULT_CUT_LIST_FORMAT
+last_sheet_width = DEFAULT_SHEET_WIDTH
+last_sheet_height = DEFAULT_SHEET_HEIGHT
+last_sheet_spacing = DEFAULT_SHEET_SPACING
+last_allow_rotation = DEFAULT_ALLOW_ROTATION
+last_optimize_layout = DEFAULT_OPTIMIZE_LAYOUT
 
+export_job: "ExportJob" = None
+export_thread: threading.Thread = None
 
-def start():
+
+class ExportJob:
     """
-    Executed when add-in is run.
+    Faces waiting to be read by the export chunk event.
     """
 
-    # Create a command Definition.
-    cmd_def = ui.commandDefinitions.addButtonDefinition(
-        CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER
-    )
+    def __init__(
+        self,
+        faces: list[adsk.fusion.BRepFace],
+        component_names: dict[str, str],
+        folder: str,
+        kerf_width: float,
+        cut_list_format: str,
+        sheet_settings: tuple,
+        progress_dialog: adsk.core.ProgressDialog,
+    ):
+        self.faces = faces
+        # Path names of the components, computed once for all faces
+        self.component_names = component_names
+        # Indices of the faces of the bodies read so far, computed once per body
+        self.face_indices: dict = {}
+        self.folder = folder
+        self.kerf_width = kerf_width
+        self.cut_list_format = cut_list_format
+        self.sheet_settings = sheet_settings
+        self.progress_dialog = progress_dialog
+        # Index of the next face to read
+        self.index = 0
+        self.parts: list[dxf.Part] = []
+        self.failed_faces: list[str] = []
 
-    # Define an event handler for the command created event. It will be called when the button is clicked.
-    futil.add_handler(cmd_def.commandCreated, command_created)
 
-    # ******** Add a button into the UI so the user can run the command. ********
-    # Get the target workspace the button will be created in.
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
+def start():
+    """
+    Executed when the command module is loaded, on the first run of the command.
+    """
 
-    # Get the panel the button will be created in.
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
+    # Define an event handler for reading the faces chunk by chunk.
+    export_chunk_event = app.registerCustomEvent(EXPORT_CHUNK_EVENT_ID)
+    futil.add_handler(export_chunk_event, export_chunk)
 
-    # Create the button command control in the UI after the specified existing command.
-    control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, IS_BEFORE)
+    # Define an event handler for the end of the background export.
+    export_done_event = app.registerCustomEvent(EXPORT_DONE_EVENT_ID)
+    futil.add_handler(export_done_event, export_done)
 
-    # Specify if the command is promoted to the main toolbar.
-    control.isPromoted = IS_PROMOTED
+    # Exporting does not change the design, the read faces stay cached
+    futil.add_read_only_command(CMD_ID)
 
 
 def stop():
     """
-    Executed when add-in is stopped.
+    Executed when add-in is stopped, if the command module was loaded.
     """
 
-    # Get the various UI elements for this command
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-    command_control = panel.controls.itemById(CMD_ID)
-    command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-    # Delete the button command control
-    if command_control:
-        command_control.deleteMe()
-
-    # Delete the command definition
-    if command_definition:
-        command_definition.deleteMe()
+    # Unregister the export custom events
+    app.unregisterCustomEvent(EXPORT_CHUNK_EVENT_ID)
+    app.unregisterCustomEvent(EXPORT_DONE_EVENT_ID)
 
 
 def command_created(args: adsk.core.CommandCreatedEventArgs):
@@ -106,7 +198,7 @@ def command_created(args: adsk.core.CommandCreatedEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Created Event")
+    futil.log("%s Command Created Event", CMD_NAME, level=futil.LogLevel.Debug)
 
     # Create the inputs for the command dialog.
     create_inputs(args.command.commandInputs)
@@ -123,19 +215,39 @@ def command_execute(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Execute Event")
+    futil.log("%s Command Execute Event", CMD_NAME, level=futil.LogLevel.Debug)
     inputs = args.command.commandInputs
 
+    # Check if an export is still running, before changing the selection set
+    global export_job
+    if export_job or (export_thread and export_thread.is_alive()):
+        futil.msg_box(
+            "An export is already running, wait for it to finish.",
+            icon=adsk.core.MessageBoxIconTypes.WarningIconType,
+        )
+        return
+
     design = adsk.fusion.Design.cast(app.activeProduct)
 
-    # Get the selected faces
-    select_faces_input: adsk.core.SelectionCommandInput = inputs.itemById(
-        SELECT_FACES_INPUT_ID
-    )
-    selected_faces = [
-        select_faces_input.selection(i).entity
-        for i in range(select_faces_input.selectionCount)
-    ]
+    # Get the largest face of each panel or the selected faces
+    if inputs.itemById(ALL_PANELS_INPUT_ID).value:
+        selected_faces = get_panel_faces(
+            design.rootComponent, inputs.itemById(MIN_THICKNESS_INPUT_ID).value
+        )
+        if not selected_faces:
+            futil.msg_box(
+                "No visible panel found to export.",
+                icon=adsk.core.MessageBoxIconTypes.WarningIconType,
+            )
+            return
+    else:
+        select_faces_input: adsk.core.SelectionCommandInput = inputs.itemById(
+            SELECT_FACES_INPUT_ID
+        )
+        selected_faces = [
+            select_faces_input.selection(i).entity
+            for i in range(select_faces_input.selectionCount)
+        ]
 
     # Check if selection already exists
     selection_set = design.selectionSets.itemByName(SELECTION_SET_NAME)
@@ -145,53 +257,159 @@ def command_execute(args: adsk.core.CommandEventArgs):
     # Save selection in a selection set
     selection_set = design.selectionSets.add(selected_faces, SELECTION_SET_NAME)
 
-    # Check if folder exists, if not create it
-    if not os.path.exists(export_folder):
-        os.makedirs(export_folder)
+    # Get the sheets settings
+    sheet_settings = (
+        inputs.itemById(SHEET_WIDTH_INPUT_ID).value,
+        inputs.itemById(SHEET_HEIGHT_INPUT_ID).value,
+        inputs.itemById(SHEET_SPACING_INPUT_ID).value,
+        inputs.itemById(ALLOW_ROTATION_INPUT_ID).value,
+        inputs.itemById(OPTIMIZE_LAYOUT_INPUT_ID).value,
+    )
 
-    # Create a master sketch to copy the face sketches to
-    master_sketch = design.rootComponent.sketches.add(
-        design.rootComponent.xYConstructionPlane
+    # Show the progress while the faces are read
+    progress_dialog = ui.createProgressDialog()
+    progress_dialog.isCancelButtonShown = True
+    progress_dialog.show(CMD_NAME, "Reading faces %v/%m", 0, len(selected_faces))
+
+    # Read the faces profiles chunk by chunk, the files are written once all are read
+    export_job = ExportJob(
+        selected_faces,
+        component_names_cache.get(
+            design.rootComponent.id,
+            lambda: get_component_names(design.rootComponent),
+        ),
+        export_folder,
+        inputs.itemById(KERF_INPUT_ID).value,
+        get_cut_list_format(inputs.itemById(CUT_LIST_FORMAT_INPUT_ID)),
+        sheet_settings,
+        progress_dialog,
     )
-    master_sketch.isComputeDeferred = True
+    app.fireCustomEvent(EXPORT_CHUNK_EVENT_ID)
 
-    # Export the faces to DXF files
-    files: dict = {}
-    for face in selected_faces:
-        result, file_path = export_face_to_dxf(face, master_sketch)
 
-        if result == True:
-            files.update({file_path: result})
-        else:
+def export_chunk(args: adsk.core.CustomEventArgs):
+    """
+    This event handler is called on the main thread
+    to read the next chunk of faces of the export.
+    """
+
+    global export_job, export_thread
+    job = export_job
+    if not job:
+        return
+
+    try:
+        # Stop here if the user cancelled the export
+        if job.progress_dialog.wasCancelled:
+            job.progress_dialog.hide()
+            export_job = None
+            futil.log("%s export cancelled after %d faces", CMD_NAME, job.index)
+            return
+
+        # Read the next faces profiles, failed faces are reported at the end and
+        # read again by the next export
+        for face in job.faces[job.index : job.index + EXPORT_CHUNK_SIZE]:
+            result, face_name, part = face_parts_cache.get(
+                face.entityToken,
+                lambda: read_face_part(face, job.component_names, job.face_indices),
+                lambda result: result[0] and bool(result[2].entities),
+            )
+
+            if result == True:
+                job.parts.append(part)
+            else:
+                job.failed_faces.append(face_name)
+
+        job.index = min(job.index + EXPORT_CHUNK_SIZE, len(job.faces))
+        job.progress_dialog.progressValue = job.index
+
+        # Let Fusion handle its events before reading the next chunk
+        if job.index < len(job.faces):
+            app.fireCustomEvent(EXPORT_CHUNK_EVENT_ID)
+            return
+
+        job.progress_dialog.hide()
+        export_job = None
+
+        if not job.parts:
             futil.msg_box(
-                f"Failed to export face to DXF: {file_path}",
+                "Failed to read any face profile",
                 icon=adsk.core.MessageBoxIconTypes.CriticalIconType,
             )
             return
 
-    # Export the master sketch to a DXF file
-    master_sketch_filepath = os.path.join(export_folder, MASTER_SKETCH_FILENAME)
-    master_sketch.saveAsDXF(master_sketch_filepath)
+        # Write the files in the background, the report is shown when it is done
+        export_thread = threading.Thread(
+            target=run_export,
+            args=(
+                job.parts,
+                job.failed_faces,
+                job.folder,
+                job.kerf_width,
+                job.cut_list_format,
+                job.sheet_settings,
+            ),
+            daemon=True,
+        )
+        export_thread.start()
+    except:
+        # Let the next export start, the error is logged by the event handler
+        job.progress_dialog.hide()
+        export_job = None
+        raise
+
 
-    # Delete the master sketch
-    master_sketch.deleteMe()
+def export_done(args: adsk.core.CustomEventArgs):
+    """
+    This event handler is called on the main thread
+    when the background export is done.
+    """
+
+    # General logging for debug.
+    futil.log("%s Export Done Event", CMD_NAME, level=futil.LogLevel.Debug)
+    result = json.loads(args.additionalInfo)
+
+    if "error" in result:
+        futil.log(result["error"], level=futil.LogLevel.Error)
+        futil.msg_box(
+            "Failed to export faces to DXF files",
+            icon=adsk.core.MessageBoxIconTypes.CriticalIconType,
+        )
+        return
 
     # Show a message box with the exported files
-    message = f"<p>Exported {len(files)} faces to DXF files + 1 master:</b><ul>"
-    for file in files.keys():
-        message += f"<li><code>{file}</code></li>"
-    message += f"<li><code>{master_sketch_filepath}</code></li></ul>"
+    message = f"<p>Exported {result['faces']} faces to {len(result['files'])} DXF files + {len(result['master_files'])} master:</b><ul>"
+    for file, quantity in result["files"].items():
+        message += f"<li><code>{file}</code> &times; {quantity}"
+        if file in result["size_reductions"]:
+            message += f" ({result['size_reductions'][file]:.0%} smaller)"
+        message += "</li>"
+    for file, utilization in result["master_files"].items():
+        message += f"<li><code>{file}</code> ({utilization:.0%} used)</li>"
+    message += f"<li><code>{result['quantities_file']}</code></li>"
+    message += f"<li><code>{result['cut_list_file']}</code></li></ul>"
+    message += f"<p><i>Sheets utilization: {result['utilization']:.0%}</i></p>"
+    message += (
+        f"<p><i>{result['written']} files written, "
+        f"{result['unchanged']} unchanged, "
+        f"{result['removed']} removed</i></p>"
+    )
+    if result["failed_faces"]:
+        message += f"<p><b>Failed to read {len(result['failed_faces'])} faces:</b><ul>"
+        for face_name in result["failed_faces"]:
+            message += f"<li><code>{face_name}</code></li>"
+        message += "</ul></p>"
     message += f"<p><i>Selection set added: {SELECTION_SET_NAME}</i></p>"
     message += f"<p><b>Do you want to open the export folder?</b></p>"
 
-    result = futil.msg_box(
+    dialog_result = futil.msg_box(
         message,
         buttons=adsk.core.MessageBoxButtonTypes.OKCancelButtonType,
         icon=adsk.core.MessageBoxIconTypes.InformationIconType,
     )
 
-    if result == adsk.core.DialogResults.DialogOK:
-        open_finder_at_folder(export_folder)
+    if dialog_result == adsk.core.DialogResults.DialogOK:
+        open_finder_at_folder(result["folder"])
 
 
 def command_input_changed(args: adsk.core.InputChangedEventArgs):
@@ -206,7 +424,10 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
 
     # General logging for debug.
     futil.log(
-        f"{CMD_NAME} Input Changed Event fired from a change to {changed_input.id}"
+        "%s Input Changed Event fired from a change to %s",
+        CMD_NAME,
+        changed_input.id,
+        level=futil.LogLevel.Debug,
     )
 
     # Check if the folder button was clicked
@@ -222,6 +443,52 @@ def command_input_changed(args: adsk.core.InputChangedEventArgs):
         global export_folder
         export_folder = folder_dialog.folder
 
+    global last_all_panels, last_min_thickness, last_kerf, last_cut_list_format
+    global last_sheet_width, last_sheet_height, last_sheet_spacing
+    global last_allow_rotation, last_optimize_layout
+
+    # Select the faces by hand only when not exporting all panels
+    if changed_input.id == ALL_PANELS_INPUT_ID:
+        last_all_panels = changed_input.value
+        select_faces_input: adsk.core.SelectionCommandInput = inputs.itemById(
+            SELECT_FACES_INPUT_ID
+        )
+        select_faces_input.setSelectionLimits(0 if last_all_panels else 1, 0)
+        select_faces_input.isVisible = not last_all_panels
+        inputs.itemById(MIN_THICKNESS_INPUT_ID).isVisible = last_all_panels
+
+    # Keep last minimum thickness value for next time
+    elif changed_input.id == MIN_THICKNESS_INPUT_ID:
+        last_min_thickness = changed_input.value
+
+    # Keep last kerf value for next time
+    elif changed_input.id == KERF_INPUT_ID:
+        last_kerf = changed_input.value
+
+    # Keep last cut list format for next time
+    elif changed_input.id == CUT_LIST_FORMAT_INPUT_ID:
+        last_cut_list_format = get_cut_list_format(changed_input)
+
+    # Keep last sheet width value for next time
+    elif changed_input.id == SHEET_WIDTH_INPUT_ID:
+        last_sheet_width = changed_input.value
+
+    # Keep last sheet height value for next time
+    elif changed_input.id == SHEET_HEIGHT_INPUT_ID:
+        last_sheet_height = changed_input.value
+
+    # Keep last sheet spacing value for next time
+    elif changed_input.id == SHEET_SPACING_INPUT_ID:
+        last_sheet_spacing = changed_input.value
+
+    # Keep last allow rotation value for next time
+    elif changed_input.id == ALLOW_ROTATION_INPUT_ID:
+        last_allow_rotation = changed_input.value
+
+    # Keep last optimize layout value for next time
+    elif changed_input.id == OPTIMIZE_LAYOUT_INPUT_ID:
+        last_optimize_layout = changed_input.value
+
 
 def command_destroy(args: adsk.core.CommandEventArgs):
     """
@@ -229,13 +496,18 @@ def command_destroy(args: adsk.core.CommandEventArgs):
     """
 
     # General logging for debug.
-    futil.log(f"{CMD_NAME} Command Destroy Event")
+    futil.log("%s Command Destroy Event", CMD_NAME, level=futil.LogLevel.Debug)
+
+    # Report the API calls made while the command was open
+    futil.dump_api_profile(CMD_NAME)
+
+    # Report the latencies of the command event handlers
+    futil.dump_event_latencies(__name__)
 
     # Reset the global variables
-    global local_handlers, folder_dialog, master_sketch_offset_x, master_sketch_offset_y
+    global local_handlers, folder_dialog
     local_handlers = []
     folder_dialog = None
-    master_sketch_offset_x, master_sketch_offset_y = 0, 0
 
 
 def create_inputs(inputs: adsk.core.CommandInputs):
@@ -243,6 +515,9 @@ def create_inputs(inputs: adsk.core.CommandInputs):
     Create the inputs for the command dialog.
     """
 
+    # Get the default length units
+    default_units = app.activeProduct.unitsManager.defaultLengthUnits
+
     # Create the selection input
     select_faces_input_tooltip = "Select the faces to export to DXF"
     select_faces_input = inputs.addSelectionInput(
@@ -251,8 +526,26 @@ def create_inputs(inputs: adsk.core.CommandInputs):
         select_faces_input_tooltip,
     )
     select_faces_input.addSelectionFilter("SolidFaces")
-    select_faces_input.setSelectionLimits(1, 0)
+    select_faces_input.setSelectionLimits(0 if last_all_panels else 1, 0)
     select_faces_input.tooltip = select_faces_input_tooltip
+    select_faces_input.isVisible = not last_all_panels
+
+    # Create a bool input to export all the panels without selecting them
+    all_panels_input = inputs.addBoolValueInput(
+        ALL_PANELS_INPUT_ID, "All Panels", True, "", last_all_panels
+    )
+    all_panels_input.tooltip = "Export the largest flat face of each visible body"
+
+    # Create a value input to ignore bodies that are not panels
+    min_thickness_input = inputs.addValueInput(
+        MIN_THICKNESS_INPUT_ID,
+        "Minimum Thickness",
+        default_units,
+        adsk.core.ValueInput.createByReal(last_min_thickness),
+    )
+    min_thickness_input.minimumValue = 0
+    min_thickness_input.tooltip = "Bodies thinner than this are not exported"
+    min_thickness_input.isVisible = last_all_panels
 
     # Create the folder dialog
     global folder_dialog
@@ -274,6 +567,85 @@ def create_inputs(inputs: adsk.core.CommandInputs):
     folder_button.tooltip = "Select the folder to export the DXF files"
     folder_button.isFullWidth = True
 
+    # Create a value input to compensate the width of the cut
+    kerf_input = inputs.addValueInput(
+        KERF_INPUT_ID,
+        "Kerf",
+        default_units,
+        adsk.core.ValueInput.createByReal(last_kerf),
+    )
+    kerf_input.minimumValue = 0
+    kerf_input.tooltip = "Width of the cut, 0 to export the faces profiles as is"
+    kerf_input.tooltipDescription = (
+        "Outer profiles are offset outward and holes inward by half of the kerf."
+    )
+
+    # Create a dropdown input to choose the format of the cut list
+    cut_list_format_input = inputs.addDropDownCommandInput(
+        CUT_LIST_FORMAT_INPUT_ID,
+        "Cut List",
+        adsk.core.DropDownStyles.TextListDropDownStyle,
+    )
+    for cut_list_format, name in CUT_LIST_FORMAT_NAMES.items():
+        cut_list_format_input.listItems.add(
+            name, cut_list_format == last_cut_list_format
+        )
+    cut_list_format_input.tooltip = "Format of the cut list file"
+    cut_list_format_input.tooltipDescription = (
+        "One row per distinct panel with its component, body, material, "
+        "dimensions, area and quantity."
+    )
+
+    # Create a group for the master sheets settings
+    sheet_group_input = inputs.addGroupCommandInput(SHEET_GROUP_INPUT_ID, "Sheets")
+    sheet_group_input.isExpanded = False
+    sheet_group_children = sheet_group_input.children
+
+    # Create value inputs to set the size of the sheets
+    sheet_width_input = sheet_group_children.addValueInput(
+        SHEET_WIDTH_INPUT_ID,
+        "Width",
+        default_units,
+        adsk.core.ValueInput.createByReal(last_sheet_width),
+    )
+    sheet_width_input.minimumValue = 1
+    sheet_width_input.tooltip = "Width of the master sheets"
+
+    sheet_height_input = sheet_group_children.addValueInput(
+        SHEET_HEIGHT_INPUT_ID,
+        "Height",
+        default_units,
+        adsk.core.ValueInput.createByReal(last_sheet_height),
+    )
+    sheet_height_input.minimumValue = 1
+    sheet_height_input.tooltip = "Height of the master sheets"
+
+    # Create a value input to set the spacing between the parts
+    sheet_spacing_input = sheet_group_children.addValueInput(
+        SHEET_SPACING_INPUT_ID,
+        "Spacing",
+        default_units,
+        adsk.core.ValueInput.createByReal(last_sheet_spacing),
+    )
+    sheet_spacing_input.minimumValue = 0
+    sheet_spacing_input.tooltip = "Spacing between the parts"
+
+    # Create a bool input to allow the parts to be rotated
+    allow_rotation_input = sheet_group_children.addBoolValueInput(
+        ALLOW_ROTATION_INPUT_ID, "Allow Rotation", True, "", last_allow_rotation
+    )
+    allow_rotation_input.tooltip = "Allow the parts to be rotated by 90°"
+
+    # Create a bool input to search for a better layout
+    optimize_layout_input = sheet_group_children.addBoolValueInput(
+        OPTIMIZE_LAYOUT_INPUT_ID, "Optimize Layout", True, "", last_optimize_layout
+    )
+    optimize_layout_input.tooltip = "Search for a layout using less sheets"
+    optimize_layout_input.tooltipDescription = (
+        f"Try many parts orders on all CPU cores for {OPTIMIZATION_TIME_BUDGET} seconds "
+        "and keep the best layout."
+    )
+
 
 def connect_to_events(command: adsk.core.Command):
     """
@@ -287,72 +659,681 @@ def connect_to_events(command: adsk.core.Command):
     futil.add_handler(command.destroy, command_destroy, local_handlers=local_handlers)
 
 
-def export_face_to_dxf(
-    face: adsk.fusion.BRepFace, master: adsk.fusion.Sketch
-) -> tuple[bool, str]:
+def get_panel_faces(
+    root_component: adsk.fusion.Component, min_thickness: float
+) -> list[adsk.fusion.BRepFace]:
+    """
+    Get the largest planar face of each visible solid body of the design.
+
+    Bodies thinner than `min_thickness` along the normal of that face are skipped.
+    """
+
+    # Bodies of the occurrences are proxies in the context of the root component
+    bodies = list(root_component.bRepBodies)
+    for occurrence in root_component.allOccurrences:
+        bodies.extend(occurrence.bRepBodies)
+
+    faces = []
+    for body in bodies:
+        if not body.isVisible or not body.isSolid:
+            continue
+
+        largest_face, largest_area = None, 0
+        for face in body.faces:
+            if not isinstance(face.geometry, adsk.core.Plane):
+                continue
+            area = face.evaluator.area
+            if area > largest_area:
+                largest_face, largest_area = face, area
+
+        if largest_face and get_face_thickness(largest_face) >= min_thickness:
+            faces.append(largest_face)
+
+    return faces
+
+
+def get_face_thickness(face: adsk.fusion.BRepFace) -> float:
+    """
+    Get the thickness of the body of a face, measured along the face normal.
+    """
+
+    frame = get_face_frame(face)
+    bounding_box = app.measureManager.getOrientedBoundingBox(
+        face.body,
+        futil.create_vector3d(frame.normal),
+        futil.create_vector3d(frame.x_axis),
+    )
+    return bounding_box.length
+
+
+def get_cut_list_format(
+    cut_list_format_input: adsk.core.DropDownCommandInput,
+) -> str:
     """
-    Export the face to a DXF file.
+    Get the cut list format selected in the dropdown input.
     """
 
-    global master_sketch_offset_x, master_sketch_offset_y
+    selected_name = cut_list_format_input.selectedItem.name
+    for cut_list_format, name in CUT_LIST_FORMAT_NAMES.items():
+        if name == selected_name:
+            return cut_list_format
+    return DEFAULT_CUT_LIST_FORMAT
+
+
+def get_component_names(root_component: adsk.fusion.Component) -> dict[str, str]:
+    """
+    Get the path name of each component by id, from a single walk of the occurrences tree.
+
+    A component used several times is named after its first occurrence,
+    the root component has an empty name.
+    """
+
+    component_names = {root_component.id: ""}
+    for occurrence in root_component.allOccurrences:
+        component_id = occurrence.component.id
+        if component_id not in component_names:
+            component_names[component_id] = sanitize_name(occurrence.fullPathName)
+
+    return component_names
+
+
+def sanitize_name(name: str) -> str:
+    """
+    Make a name safe to use in a file name.
+    """
+
+    return name.replace("+", "-").replace(":", "_").replace(" ", "_")
+
+
+def get_face_indices(body: adsk.fusion.BRepBody) -> dict[int, int]:
+    """
+    Get the index of each face of a body by temporary id, from a single walk of its faces.
+    """
+
+    return {face.tempId: index for index, face in enumerate(body.faces)}
+
+
+def read_face_part(
+    face: adsk.fusion.BRepFace,
+    component_names: dict[str, str],
+    face_indices: dict[str, dict[int, int]],
+) -> tuple[bool, str, dxf.Part]:
+    """
+    Read the profile of the face, named after its component, its body and its index.
+
+    `face_indices` holds the face indices of the bodies already read by entity
+    token, the indices of the body of the face are added to it if missing.
+    """
+
+    face_name = "face"
+
+    try:
+        body = face.body
+        face_name = sanitize_name(body.name)
+
+        # Get the name of the face, stable between runs
+        body_token = body.entityToken
+        if body_token not in face_indices:
+            face_indices[body_token] = get_face_indices(body)
+        face_name = f"{face_name}-{face_indices[body_token][face.tempId]}"
+        component_name = component_names.get(body.parentComponent.id)
+        if component_name:
+            face_name = f"{component_name}-{face_name}"
+
+        # Read the face profile from its edges
+        part = get_face_part(face, face_name)
+
+        # Measure the stock the face is cut from and keep where it comes from
+        part.material = body.material.name if body.material else ""
+        part.thickness = get_face_thickness(face)
+        part.component_name = component_name or ""
+        part.body_name = body.name
+
+        return [True, face_name, part]
+    except Exception as e:
+        futil.log("Failed to read face profile: %s", e, level=futil.LogLevel.Warning)
+        return [False, face_name, None]
+
+
+def run_export(
+    parts: list[dxf.Part],
+    failed_faces: list[str],
+    folder: str,
+    kerf_width: float,
+    cut_list_format: str,
+    sheet_settings: tuple,
+):
+    """
+    Export the parts from a background thread and notify the main thread when done.
+
+    No Fusion API is used here, only files are written.
+    """
 
     try:
-        # Get the root component
-        design = adsk.fusion.Design.cast(app.activeProduct)
-        root_component = design.rootComponent
+        # The files of the faces that failed to read are not removed
+        result = export_parts(
+            parts,
+            folder,
+            kerf_width,
+            cut_list_format,
+            sheet_settings,
+            keep_previous_files=bool(failed_faces),
+        )
+        result["failed_faces"] = failed_faces
+    except:
+        result = {"error": traceback.format_exc()}
 
-        # Get the name of the face
-        face_name = f"{face.body.name}-{face.tempId}"
-        ancestors = root_component.allOccurrencesByComponent(face.body.parentComponent)
-        for ancestor in ancestors:
-            face_name = f"{ancestor.name}-{face_name}"
-        face_name = face_name.replace(":", "_").replace(" ", "_")
+    app.fireCustomEvent(EXPORT_DONE_EVENT_ID, json.dumps(result))
 
-        # Get the file path
-        file_path = os.path.join(export_folder, f"{face_name}.dxf")
 
-        # Create a sketch on the face
-        sketch = root_component.sketches.add(face)
+def export_parts(
+    parts: list[dxf.Part],
+    folder: str,
+    kerf_width: float,
+    cut_list_format: str,
+    sheet_settings: tuple,
+    keep_previous_files: bool = False,
+) -> dict:
+    """
+    Export the parts, their quantities and the master sheets to a folder.
 
-        # Project the face into the sketch
-        sketch.project(face)
+    Parts are nested on separate master sheets per material and thickness.
+    Files are formatted and written by a pool of threads. The files of the
+    previous export that are not exported anymore are removed, unless
+    `keep_previous_files` is set because some parts are missing. Returns a
+    report of the export.
+    """
 
-        # # Save the sketch as a DXF file
-        sketch.saveAsDXF(file_path)
+    # Check if folder exists, if not create it
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    # Load the hashes of the previous export
+    export_manifest = manifest.Manifest(folder)
+
+    # Group identical profiles cut from the same stock to export each of them once
+    stock_part_groups: dict = {}
+    for part in parts:
+        stock_part_groups.setdefault(get_stock_key(part), []).append(part)
+    for stock_key, stock_parts in stock_part_groups.items():
+        stock_part_groups[stock_key] = fingerprint.group_duplicate_parts(stock_parts)
+
+    # The cut list describes the panels as designed, before the kerf offset,
+    # its rows are only computed while they are written
+    designed_part_groups = [
+        part_group
+        for part_groups in stock_part_groups.values()
+        for part_group in part_groups
+    ]
+    cut_list_rows = (
+        cutlist.get_cut_list_row(part_group, DXF_UNITS_SCALE)
+        for part_group in designed_part_groups
+    )
+
+    # Offset each distinct profile by half the kerf, away from the material
+    if kerf_width:
+        for stock_key, part_groups in stock_part_groups.items():
+            stock_part_groups[stock_key] = [
+                [kerf.offset_part(part_group[0], kerf_width / 2), *part_group[1:]]
+                for part_group in part_groups
+            ]
+
+    # Simplify each distinct profile once, for its file and all its placements
+    stock_entities = {
+        stock_key: [
+            dxf.simplify_entities(part_group[0].entities, SIMPLIFY_TOLERANCE)
+            for part_group in part_groups
+        ]
+        for stock_key, part_groups in stock_part_groups.items()
+    }
+
+    all_part_groups = [
+        part_group
+        for part_groups in stock_part_groups.values()
+        for part_group in part_groups
+    ]
+    all_entities = [
+        entities
+        for entities_list in stock_entities.values()
+        for entities in entities_list
+    ]
+
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+        # Export the profiles to DXF files
+        file_futures = [
+            executor.submit(
+                export_part_to_dxf, part_group[0], entities, export_manifest
+            )
+            for part_group, entities in zip(all_part_groups, all_entities)
+        ]
 
-        # Redefine sketch plane to be root XY plane
-        sketch.redefine(design.rootComponent.xYConstructionPlane)
+        # Export the quantity of each profile
+        quantities_future = executor.submit(
+            export_quantities, all_part_groups, export_manifest
+        )
 
-        # Calculate sketch translation
-        master_min = master.boundingBox.minPoint
-        master_min.translateBy(
-            adsk.core.Vector3D.create(master_sketch_offset_x, master_sketch_offset_y, 0)
+        # Export the cut list of the panels
+        cut_list_future = executor.submit(
+            export_cut_list, cut_list_rows, cut_list_format, export_manifest
         )
-        sketch_min = sketch.boundingBox.minPoint
-        trans_matrix = adsk.core.Matrix3D.create()
-        trans_matrix.translation = sketch_min.vectorTo(master_min)
-
-        # Copy the sketch curves to the master sketch
-        obj_collection = adsk.core.ObjectCollection.create()
-        for item in sketch.sketchCurves:
-            obj_collection.add(item)
-        sketch.copy(obj_collection, trans_matrix, master)
-
-        # Update the master sketch offsets
-        master_sketch_offset_x = master.boundingBox.maxPoint.x + MASTER_SKETCH_SPACING
-        if master.boundingBox.maxPoint.x > MASTER_SKETCH_MAX_X:
-            master_sketch_offset_x = 0
-            master_sketch_offset_y = (
-                master.boundingBox.maxPoint.y + MASTER_SKETCH_SPACING
+
+        # Nest the parts of each stock on master sheets while the files are written,
+        # the optimization time is shared between the stocks
+        stock_sheets = {
+            stock_key: nest_parts(
+                part_groups,
+                *sheet_settings,
+                time_budget=OPTIMIZATION_TIME_BUDGET / len(stock_part_groups),
             )
+            for stock_key, part_groups in stock_part_groups.items()
+        }
+
+        files: dict = {}
+        size_reductions: dict = {}
+        for part_group, file_future in zip(all_part_groups, file_futures):
+            file_path, size_reduction = file_future.result()
+            files.update({file_path: len(part_group)})
+            if size_reduction:
+                size_reductions.update({file_path: size_reduction})
+        quantities_file_path = quantities_future.result()
+        cut_list_file_path = cut_list_future.result()
+        quantities_hash = export_manifest.files[QUANTITIES_FILENAME]
+
+        # Export each sheet of each stock to a master DXF file
+        master_files: dict = {}
+        master_futures = []
+        for stock_key, part_groups in stock_part_groups.items():
+            sheets = stock_sheets[stock_key]
+            stock_name = get_stock_name(*stock_key) if len(stock_sheets) > 1 else ""
+
+            # The master files only change when a part, a quantity or the layout change
+            master_hash = manifest.get_hashes_hash(
+                [
+                    quantities_hash,
+                    *(
+                        export_manifest.files[f"{part_group[0].name}.dxf"]
+                        for part_group in part_groups
+                    ),
+                ],
+                *get_layout_key(sheets),
+            )
+
+            for index, sheet in enumerate(sheets):
+                master_file_path = get_master_file_path(
+                    folder, stock_name, index, len(sheets)
+                )
+                if export_manifest.update(
+                    os.path.basename(master_file_path), master_hash
+                ):
+                    master_futures.append(
+                        executor.submit(
+                            write_master_dxf,
+                            master_file_path,
+                            sheet,
+                            part_groups,
+                            stock_entities[stock_key],
+                        )
+                    )
+                master_files.update({master_file_path: sheet.utilization})
+
+        for master_future in master_futures:
+            master_future.result()
+
+    written_count = len(export_manifest.changed_files)
+    unchanged_count = len(export_manifest.files) - written_count
+
+    # Remove the files of the previous export that are not exported anymore
+    if keep_previous_files:
+        deleted_files = []
+        export_manifest.keep_previous()
+    else:
+        deleted_files = export_manifest.prune()
+    export_manifest.save()
+
+    return {
+        "folder": folder,
+        "faces": len(parts),
+        "files": files,
+        "size_reductions": size_reductions,
+        "master_files": master_files,
+        "quantities_file": quantities_file_path,
+        "cut_list_file": cut_list_file_path,
+        "utilization": nesting.get_utilization(
+            [sheet for sheets in stock_sheets.values() for sheet in sheets]
+        ),
+        "written": written_count,
+        "unchanged": unchanged_count,
+        "removed": len(deleted_files),
+    }
+
+
+def get_stock_key(part: dxf.Part) -> tuple[str, float]:
+    """
+    Get the material and the thickness of the stock a part is cut from.
+    """
 
-        # Delete the sketch
-        sketch.deleteMe()
+    return (part.material, round(part.thickness, THICKNESS_PRECISION))
 
-        return [True, file_path]
-    except Exception as e:
-        futil.log(f"Failed to export face to DXF: {e}")
-        return [False, file_path]
+
+def get_stock_name(material: str, thickness: float) -> str:
+    """
+    Get a name of a stock that can be used in a file name.
+    """
+
+    thickness_name = f"{round(thickness * DXF_UNITS_SCALE, 2):g}mm"
+    if not material:
+        return thickness_name
+    return sanitize_name(f"{material}-{thickness_name}")
+
+
+def export_part_to_dxf(
+    part: dxf.Part, entities: list, export_manifest: manifest.Manifest
+) -> tuple[str, float]:
+    """
+    Export the simplified entities of the part to a DXF file named after the part.
+
+    The file is only written if its content changed since the previous export.
+    Returns the file path and the size reduction from simplifying the polylines
+    of the written file.
+    """
+
+    file_path = os.path.join(export_manifest.folder, f"{part.name}.dxf")
+
+    # Hash the profile independently of its position in the face plane
+    min_x, min_y, _, _ = part.bounds
+    content_hash = manifest.get_entities_hash(
+        dxf.transform_entities(entities, -min_x, -min_y),
+        dxf.DXF_VERSION,
+        DXF_UNITS_SCALE,
+    )
+
+    # Save the profile as a DXF file if it changed
+    size_reduction = 0
+    if export_manifest.update(os.path.basename(file_path), content_hash):
+        dxf.write_dxf(file_path, entities, DXF_UNITS_SCALE)
+
+        # Compare with the size the file would have without simplification
+        if entities != part.entities:
+            size_reduction = 1 - dxf.get_dxf_size(
+                entities, DXF_UNITS_SCALE
+            ) / dxf.get_dxf_size(part.entities, DXF_UNITS_SCALE)
+
+    return file_path, size_reduction
+
+
+def export_quantities(
+    part_groups: list[list[dxf.Part]], export_manifest: manifest.Manifest
+) -> str:
+    """
+    Export the quantity of each exported profile to a CSV file.
+    """
+
+    file_path = os.path.join(export_manifest.folder, QUANTITIES_FILENAME)
+
+    content = io.StringIO()
+    writer = csv.writer(content)
+    writer.writerow(["File", "Quantity", "Material", "Thickness", "Faces"])
+    for part_group in part_groups:
+        material, thickness = get_stock_key(part_group[0])
+        writer.writerow(
+            [
+                f"{part_group[0].name}.dxf",
+                len(part_group),
+                material,
+                round(thickness * DXF_UNITS_SCALE, 2),
+                " ".join(part.name for part in part_group),
+            ]
+        )
+    content = content.getvalue()
+
+    if export_manifest.update(QUANTITIES_FILENAME, manifest.get_hashes_hash([content])):
+        with open(file_path, "w", newline="") as file:
+            file.write(content)
+
+    return file_path
+
+
+def export_cut_list(
+    rows: Iterable[dict], cut_list_format: str, export_manifest: manifest.Manifest
+) -> str:
+    """
+    Export the cut list of the panels, streaming its rows to the file.
+
+    The rows are hashed while they are written to a temporary file, which
+    only replaces the previous cut list if its content changed.
+    """
+
+    file_name = f"{CUT_LIST_FILENAME}.{cut_list_format}"
+    file_path = os.path.join(export_manifest.folder, file_name)
+    temporary_file_path = f"{file_path}{TEMPORARY_FILE_SUFFIX}"
+
+    content_hash = hashlib.sha1(repr((cut_list_format,)).encode())
+    with open(temporary_file_path, "w", newline="") as file:
+        with cutlist.CutListWriter(file, cut_list_format) as writer:
+            for row in rows:
+                content_hash.update(json.dumps(row).encode())
+                writer.write_row(row)
+
+    if export_manifest.update(file_name, content_hash.hexdigest()):
+        os.replace(temporary_file_path, file_path)
+    else:
+        os.remove(temporary_file_path)
+
+    return file_path
+
+
+def nest_parts(
+    part_groups: list[list[dxf.Part]],
+    sheet_width: float,
+    sheet_height: float,
+    spacing: float,
+    allow_rotation: bool,
+    optimize_layout: bool = False,
+    time_budget: float = OPTIMIZATION_TIME_BUDGET,
+) -> list[nesting.Sheet]:
+    """
+    Nest the bounding rectangles of the parts on sheets, one per copy.
+
+    Placements keys are the indexes of the groups in the list, all copies
+    use the outline of the first part of their group.
+    """
+
+    rectangles = []
+    for index, part_group in enumerate(part_groups):
+        min_x, min_y, max_x, max_y = part_group[0].bounds
+        rectangles.extend([(index, max_x - min_x, max_y - min_y)] * len(part_group))
+
+    if optimize_layout:
+        return optimizer.optimize(
+            rectangles,
+            sheet_width,
+            sheet_height,
+            spacing,
+            allow_rotation,
+            time_budget,
+        )
+
+    return nesting.pack(rectangles, sheet_width, sheet_height, spacing, allow_rotation)
+
+
+def get_layout_key(sheets: list[nesting.Sheet]) -> list[tuple]:
+    """
+    Get a description of the layout of the sheets that can be hashed.
+    """
+
+    return [
+        (
+            sheet.width,
+            sheet.height,
+            [
+                (
+                    placement.key,
+                    round(placement.x, 6),
+                    round(placement.y, 6),
+                    placement.rotated,
+                )
+                for placement in sheet.placements
+            ],
+        )
+        for sheet in sheets
+    ]
+
+
+def get_placed_entities(
+    part: dxf.Part, entities: list, placement: nesting.Placement
+) -> list:
+    """
+    Get the simplified entities of a part moved to its placement on a sheet.
+    """
+
+    dx, dy = geometry.get_placement_offset(
+        part.bounds, placement.x, placement.y, placement.rotated
+    )
+    return dxf.transform_entities(entities, dx, dy, placement.rotated)
+
+
+def write_master_dxf(
+    file_path: str,
+    sheet: nesting.Sheet,
+    part_groups: list[list[dxf.Part]],
+    entities_list: list[list],
+):
+    """
+    Write the parts placed on a sheet to a master DXF file.
+
+    `entities_list` holds the simplified entities of each part group.
+    """
+
+    with open(file_path, "w") as file:
+        with dxf.DXFWriter(file, DXF_UNITS_SCALE) as writer:
+            for placement in sheet.placements:
+                writer.write_entities(
+                    get_placed_entities(
+                        part_groups[placement.key][0],
+                        entities_list[placement.key],
+                        placement,
+                    )
+                )
+
+
+def get_master_file_path(folder: str, stock_name: str, index: int, count: int) -> str:
+    """
+    Get the path of the master file of a sheet, named after its stock
+    and numbered when there are several sheets.
+    """
+
+    name, extension = os.path.splitext(MASTER_SKETCH_FILENAME)
+    if stock_name:
+        name = f"{name}-{stock_name}"
+    if count > 1:
+        name = f"{name}-{index + 1}"
+    return os.path.join(folder, f"{name}{extension}")
+
+
+def get_face_frame(face: adsk.fusion.BRepFace) -> geometry.Frame:
+    """
+    Get a 2D frame on the face plane, looking at the face from outside.
+
+    The X axis follows the longest straight edge so that profiles are aligned.
+    """
+
+    origin = face.pointOnFace
+    _, normal = face.evaluator.getNormalAtPoint(origin)
+
+    x_axis = None
+    longest_length = 0
+    for edge in face.edges:
+        curve = edge.geometry
+        if isinstance(curve, adsk.core.Line3D) and edge.length > longest_length:
+            longest_length = edge.length
+            x_axis = curve.startPoint.vectorTo(curve.endPoint)
+
+    if not x_axis:
+        # Any direction that is not parallel to the normal
+        if abs(normal.z) < 0.9:
+            x_axis = adsk.core.Vector3D.create(0, 0, 1).crossProduct(normal)
+        else:
+            x_axis = adsk.core.Vector3D.create(1, 0, 0)
+
+    return geometry.Frame(
+        futil.get_point(origin), futil.get_point(x_axis), futil.get_point(normal)
+    )
+
+
+def get_face_part(face: adsk.fusion.BRepFace, name: str) -> dxf.Part:
+    """
+    Convert the loops of a planar face to a 2D part in the face plane.
+    """
+
+    frame = get_face_frame(face)
+
+    loops = []
+    for loop in face.loops:
+        entities = []
+        for co_edge in loop.coEdges:
+            entities.append(get_edge_entity(co_edge, frame))
+        loops.append(dxf.Loop(entities, loop.isOuter))
+
+    return dxf.Part(name, loops)
+
+
+def get_edge_entity(co_edge: adsk.fusion.BRepCoEdge, frame: geometry.Frame):
+    """
+    Convert the edge of a co-edge to a 2D entity, in the direction of the co-edge.
+    """
+
+    edge = co_edge.edge
+    curve = edge.geometry
+    is_reversed = co_edge.isOpposedToEdge
+
+    def to_2d(point: adsk.core.Point3D) -> tuple[float, float]:
+        return frame.to_2d(futil.get_point(point))
+
+    if isinstance(curve, adsk.core.Line3D):
+        start_vertex = edge.endVertex if is_reversed else edge.startVertex
+        end_vertex = edge.startVertex if is_reversed else edge.endVertex
+        return dxf.Line(to_2d(start_vertex.geometry), to_2d(end_vertex.geometry))
+
+    if isinstance(curve, adsk.core.Circle3D):
+        return dxf.Circle(to_2d(curve.center), curve.radius)
+
+    if isinstance(curve, adsk.core.Arc3D):
+        evaluator = edge.evaluator
+        _, start_parameter, end_parameter = evaluator.getParameterExtents()
+        _, middle = evaluator.getPointAtParameter((start_parameter + end_parameter) / 2)
+
+        start_vertex = edge.endVertex if is_reversed else edge.startVertex
+        end_vertex = edge.startVertex if is_reversed else edge.endVertex
+        center = to_2d(curve.center)
+        start = to_2d(start_vertex.geometry)
+        middle = to_2d(middle)
+        end = to_2d(end_vertex.geometry)
+
+        # The arc turns counter-clockwise if start, middle and end are counter-clockwise
+        turn = (middle[0] - start[0]) * (end[1] - middle[1]) - (
+            middle[1] - start[1]
+        ) * (end[0] - middle[0])
+        sweep_angle = curve.endAngle - curve.startAngle
+        start_angle = math.atan2(start[1] - center[1], start[0] - center[0])
+        return dxf.Arc(
+            center,
+            curve.radius,
+            start_angle,
+            sweep_angle if turn > 0 else -sweep_angle,
+        )
+
+    # Approximate other curves (splines, ellipses) with a polyline
+    evaluator = edge.evaluator
+    _, start_parameter, end_parameter = evaluator.getParameterExtents()
+    _, points = evaluator.getStrokes(start_parameter, end_parameter, STROKE_TOLERANCE)
+    points = frame.to_2d_points(futil.get_points(points))
+    if is_reversed:
+        points.reverse()
+
+    # Closed curves (full ellipses, closed splines) end on their first point
+    if len(points) > 2 and math.dist(points[0], points[-1]) < STROKE_TOLERANCE:
+        return dxf.Polyline(points[:-1], True)
+    return dxf.Polyline(points)
 
 
 def open_finder_at_folder(folder_path):
@@ -366,4 +1347,4 @@ def open_finder_at_folder(folder_path):
         elif os_name == "Darwin":  # macos
             subprocess.run(["open", absolute_path], check=True)
     except subprocess.CalledProcessError as e:
-        futil.log(f"Failed to open Finder: {e}")
+        futil.log("Failed to open Finder: %s", e, level=futil.LogLevel.Warning)
@@ -10,6 +10,19 @@ import os
 # are ready to distribute it.
 DEBUG = True
 
+# Flag that indicates to profile the Fusion API calls made by the event handlers.
+# The objects given to the handlers are wrapped to record the number of calls and
+# the time spent in each API attribute, and a report sorted by time is written to
+# the Text Command window when a command is closed. Wrapping slows down every
+# call, so only enable it to find the slow paths of a command.
+PROFILE_API = False
+
+# Flag that indicates to measure the latency of the event handlers. The latency
+# percentiles of the handlers of a command are written to the Text Command window
+# when the command is closed, and the ones of all the handlers are written to
+# `event_latencies.txt` in the add-in folder when the add-in is stopped.
+TIME_EVENTS = False
+
 # Gets the name of the add-in from the name of the folder the py file is in.
 # This is used when defining unique internal names for various UI elements
 # that need a unique name. It's also recommended to use a company name as
@@ -0,0 +1,25 @@
+# Pure Python helpers shared by the commands.
+# Modules in this package must not import adsk so they can be used without Fusion.
+import importlib
+
+# Modules of the package, imported on first use so that importing one of them
+# does not import the others, some of which are slow to import.
+__all__ = [
+    "batch",
+    "box",
+    "corners",
+    "cutlist",
+    "dxf",
+    "fingerprint",
+    "geometry",
+    "kerf",
+    "manifest",
+    "nesting",
+    "optimizer",
+]
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
@@ -0,0 +1,220 @@
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import box
+
+# Name of the file recording the finished jobs in the output folder, one
+# JSON object per line, so that an interrupted batch can be resumed.
+PROGRESS_FILENAME = "progress.jsonl"
+
+# Name of the summary of all the jobs in the output folder.
+SUMMARY_FILENAME = "summary.csv"
+
+# Columns of the summary.
+SUMMARY_FIELDS = ["job", "status", "panels", "sheets", "utilization", "error"]
+
+
+class JobStatus:
+    """
+    The outcomes of a job
+    """
+
+    def __init__(self):
+        pass
+
+    # The files of the box were written.
+    Done = "done"
+    # The spec is not valid, nothing was written.
+    Failed = "failed"
+
+
+def read_jobs(source: str) -> list[tuple[str, dict]]:
+    """
+    Read the specs of a batch as (job id, spec data) pairs.
+
+    `source` is a folder of JSON specs, whose jobs are named after the files,
+    or a JSONL file with one spec per line, whose jobs are named after the
+    spec or numbered by line. Duplicate names get the line number appended.
+    A source of "-" reads the JSONL lines from the standard input.
+
+    A spec that cannot be read is kept as the error instead of its data, its
+    job is recorded as failed without stopping the batch.
+    """
+
+    jobs = []
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            job_id, extension = os.path.splitext(file_name)
+            if extension.lower() != ".json":
+                continue
+            try:
+                with open(os.path.join(source, file_name), "r") as file:
+                    data = _load_spec_data(file.read(), file_name)
+            except (OSError, ValueError) as error:
+                data = error
+            jobs.append((job_id, data))
+        return jobs
+
+    job_ids = set()
+    file = sys.stdin if source == "-" else open(source, "r")
+    with file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                data = _load_spec_data(line, f"line {line_number}")
+                name = data.get("name", f"box-{line_number}")
+            except ValueError as error:
+                data, name = error, f"box-{line_number}"
+            job_id = box.UNSAFE_NAME_CHARACTERS.sub("_", str(name))
+            if job_id in job_ids:
+                job_id = f"{job_id}-{line_number}"
+            job_ids.add(job_id)
+            jobs.append((job_id, data))
+    return jobs
+
+
+def run_job(job_id: str, data: dict, folder: str) -> dict:
+    """
+    Write the files of a box to its own folder and get its progress record.
+
+    Unreadable and invalid specs and errors writing the files are recorded
+    as failed instead of stopping the batch.
+    """
+
+    # The spec could not be read
+    if isinstance(data, Exception):
+        return _get_failed_record(job_id, data)
+
+    try:
+        spec = box.BoxSpec.from_dict(data, job_id)
+        report = box.export_box(spec, os.path.join(folder, job_id))
+    except Exception as error:
+        return _get_failed_record(job_id, error)
+
+    return {
+        "job": job_id,
+        "status": JobStatus.Done,
+        "panels": report["panels"],
+        "sheets": len(report["master_files"]),
+        "utilization": round(report["utilization"], 4),
+    }
+
+
+def run_batch(
+    jobs: list[tuple[str, dict]],
+    folder: str,
+    processes: int = None,
+    on_progress=None,
+) -> list[dict]:
+    """
+    Run the jobs of a batch on a pool of processes and write its summary.
+
+    Jobs already done in a previous run of the batch in the same folder are
+    skipped, failed ones are run again. Each finished job is appended to the
+    progress file at once, and `on_progress` is called with its record and
+    the number of jobs left. Returns the records of all the jobs.
+    """
+
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    progress_file_path = os.path.join(folder, PROGRESS_FILENAME)
+    records = {
+        job_id: record
+        for job_id, record in read_progress(progress_file_path).items()
+        if record["status"] == JobStatus.Done
+    }
+    pending_jobs = [(job_id, data) for job_id, data in jobs if job_id not in records]
+
+    if pending_jobs:
+        with open(progress_file_path, "ab") as progress_file:
+            # End the line a crash may have cut before appending to it
+            if progress_file.tell() and not _ends_with_newline(progress_file_path):
+                progress_file.write(b"\n")
+
+            with ProcessPoolExecutor(processes) as executor:
+                futures = {
+                    executor.submit(run_job, job_id, data, folder): job_id
+                    for job_id, data in pending_jobs
+                }
+                left_count = len(futures)
+                for future in as_completed(futures):
+                    # A worker may die or fail to send its record back
+                    try:
+                        record = future.result()
+                    except Exception as error:
+                        record = _get_failed_record(futures[future], error)
+                    left_count -= 1
+                    records[record["job"]] = record
+
+                    # Flush each record so that a crash loses no finished job
+                    progress_file.write(f"{json.dumps(record)}\n".encode())
+                    progress_file.flush()
+
+                    if on_progress:
+                        on_progress(record, left_count)
+
+    # Keep the order of the jobs in the summary
+    job_records = [records[job_id] for job_id, _ in jobs]
+    write_summary(os.path.join(folder, SUMMARY_FILENAME), job_records)
+    return job_records
+
+
+def read_progress(file_path: str) -> dict[str, dict]:
+    """
+    Read the records of the finished jobs by job id, the last record of a job wins.
+
+    A line cut by a crash is ignored.
+    """
+
+    records = {}
+    try:
+        with open(file_path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["job"]] = record
+    except OSError:
+        pass
+    return records
+
+
+def write_summary(file_path: str, records: list[dict]):
+    """
+    Write the summary of the jobs of a batch.
+    """
+
+    with open(file_path, "w", newline="") as file:
+        writer = csv.DictWriter(file, SUMMARY_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+
+
+def _get_failed_record(job_id: str, error: Exception) -> dict:
+    message = str(error)
+    if not isinstance(error, ValueError):
+        message = f"{type(error).__name__}: {message}"
+    return {"job": job_id, "status": JobStatus.Failed, "error": message}
+
+
+def _load_spec_data(text: str, source_name: str) -> dict:
+    try:
+        data = json.loads(text)
+    except ValueError as error:
+        raise ValueError(f"{source_name}: {error}")
+    if not isinstance(data, dict):
+        raise ValueError(f"{source_name}: a spec must be a JSON object")
+    return data
+
+
+def _ends_with_newline(file_path: str) -> bool:
+    with open(file_path, "rb") as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b"\n"
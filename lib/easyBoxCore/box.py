@@ -0,0 +1,521 @@
+import json
+import os
+import re
+
+from . import corners, cutlist, dxf, fingerprint, geometry, kerf, nesting
+
+# Faces of a box by name, as the axis of their normal and its direction.
+# X is the length, Y the width and Z the height of the box.
+FACES = {
+    "left": (0, -1),
+    "right": (0, 1),
+    "front": (1, -1),
+    "back": (1, 1),
+    "bottom": (2, -1),
+    "top": (2, 1),
+}
+
+# Size in centimeters of one unit of each unit system accepted in the specs.
+SPEC_UNITS = {"mm": 0.1, "cm": 1.0, "in": 2.54}
+
+# Unit system of the specs that do not give one.
+DEFAULT_SPEC_UNITS = "mm"
+
+# Settings of the specs that do not give them, lengths are in the spec units.
+DEFAULT_BOX_THICKNESS = 3
+DEFAULT_TENON_COUNT = 3
+DEFAULT_SHEET = {
+    "width": 600,
+    "height": 400,
+    "spacing": 1,
+    "allow_rotation": True,
+}
+
+# Factor from centimeters to the millimeters of the DXF files.
+DXF_UNITS_SCALE = 10
+
+# Names of the files written in the folder of a box.
+MASTER_FILENAME = "master.dxf"
+CUT_LIST_FILENAME = "cutlist.csv"
+
+# Characters of the box names that are replaced in the names of their files.
+UNSAFE_NAME_CHARACTERS = re.compile(r"[^\w.-]+")
+
+# Tolerance used to compare lengths in centimeters.
+TOLERANCE = geometry.TOLERANCE
+
+
+class Joint:
+    """
+    Finger joint along the edge shared by two panels of a box.
+
+    `tenon_width` is None to use the auto width of the Box Joint command.
+    """
+
+    def __init__(self, tenon_count: int, tenon_width: float = None):
+        self.tenon_count = tenon_count
+        self.tenon_width = tenon_width
+
+
+class BoxSpec:
+    """
+    Parametric description of a box, with its lengths in centimeters.
+
+    `size` is the outer length, width and height of the box, `thicknesses`
+    the thickness of each face that gets a panel, by face name. `joints` are
+    the finger joints by pair of face names, in the order of `FACES`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        size: tuple[float, float, float],
+        thicknesses: dict[str, float],
+        joints: dict[tuple[str, str], Joint],
+        material: str = "",
+        kerf_width: float = 0,
+        sheet_settings: tuple = None,
+    ):
+        self.name = name
+        self.size = size
+        self.thicknesses = thicknesses
+        self.joints = joints
+        self.material = material
+        self.kerf_width = kerf_width
+        self.sheet_settings = sheet_settings
+
+    @classmethod
+    def from_dict(cls, data: dict, default_name: str = "box") -> "BoxSpec":
+        """
+        Read a spec from its JSON data.
+
+        Lengths are in the `units` of the spec, millimeters by default:
+            {
+                "name": "drawer",
+                "length": 300, "width": 200, "height": 120,
+                "thickness": 6,
+                "faces": {"top": false, "front": {"thickness": 9}},
+                "tenon_count": 3,
+                "tenon_width": null,
+                "joints": {"front-bottom": {"tenon_count": 5}},
+                "material": "Plywood",
+                "kerf": 0.2,
+                "sheet": {"width": 600, "height": 400, "spacing": 1}
+            }
+        A face set to false has no panel, a null tenon width uses the auto
+        width. Raises ValueError when the spec is not valid.
+        """
+
+        units = data.get("units", DEFAULT_SPEC_UNITS)
+        if units not in SPEC_UNITS:
+            raise ValueError(f"Unknown units {units!r}")
+        scale = SPEC_UNITS[units]
+
+        def get_length(values: dict, key: str, default: float = None) -> float:
+            value = values.get(key, default)
+            if value is None:
+                return None
+            if not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"{key} must be a positive number")
+            return value * scale
+
+        size = tuple(get_length(data, key) for key in ("length", "width", "height"))
+        if any(not length for length in size):
+            raise ValueError("length, width and height are required")
+
+        # Each face gets a panel of the default thickness unless disabled
+        thickness = data.get("thickness", DEFAULT_BOX_THICKNESS)
+        thicknesses = {}
+        face_settings = _get_dict(data, "faces")
+        for face_name in face_settings:
+            if face_name not in FACES:
+                raise ValueError(f"Unknown face {face_name!r}")
+        for face_name in FACES:
+            face_setting = face_settings.get(face_name, True)
+            if face_setting is False:
+                continue
+            if face_setting is True:
+                face_setting = {}
+            if not isinstance(face_setting, dict):
+                raise ValueError(
+                    f"The {face_name} face must be true, false or an object"
+                )
+            face_setting = {"thickness": thickness, **face_setting}
+            thicknesses[face_name] = get_length(face_setting, "thickness")
+            if not thicknesses[face_name]:
+                raise ValueError(f"The thickness of the {face_name} panel is zero")
+
+        # Opposite panels must leave room between them
+        for axis in range(3):
+            opposite_thickness = sum(
+                thicknesses.get(face_name, 0)
+                for face_name, (face_axis, _) in FACES.items()
+                if face_axis == axis
+            )
+            if opposite_thickness >= size[axis]:
+                raise ValueError("The panels are thicker than the box")
+
+        # Joints default to the tenons of the spec, each one can override them
+        default_joint = _read_joint(data, Joint(DEFAULT_TENON_COUNT), scale)
+        joint_settings = _get_dict(data, "joints")
+        joints = {}
+        for face_a, face_b in get_joined_faces(thicknesses):
+            joints[(face_a, face_b)] = default_joint
+        for key, joint_setting in joint_settings.items():
+            face_names = tuple(sorted(key.split("-"), key=list(FACES).index))
+            if face_names not in joints:
+                raise ValueError(f"Unknown joint {key!r}")
+            if not isinstance(joint_setting, dict):
+                raise ValueError(f"The {key} joint must be an object")
+            joints[face_names] = _read_joint(joint_setting, default_joint, scale)
+
+        sheet = {**DEFAULT_SHEET, **_get_dict(data, "sheet")}
+        sheet_settings = (
+            get_length(sheet, "width"),
+            get_length(sheet, "height"),
+            get_length(sheet, "spacing"),
+            bool(sheet["allow_rotation"]),
+        )
+
+        # The name is used in the names of the files of the box
+        name = UNSAFE_NAME_CHARACTERS.sub("_", str(data.get("name", default_name)))
+
+        return cls(
+            name,
+            size,
+            thicknesses,
+            joints,
+            str(data.get("material", "")),
+            get_length(data, "kerf", 0),
+            sheet_settings,
+        )
+
+
+def load_box_spec(file_path: str) -> BoxSpec:
+    """
+    Read a spec from a JSON file, named after the file when it has no name.
+    """
+
+    with open(file_path, "r") as file:
+        data = json.load(file)
+    default_name = os.path.splitext(os.path.basename(file_path))[0]
+    return BoxSpec.from_dict(data, default_name)
+
+
+def get_joined_faces(thicknesses: dict[str, float]) -> list[tuple[str, str]]:
+    """
+    Get the pairs of panels that share an edge of the box, in the order of `FACES`.
+    """
+
+    face_names = [face_name for face_name in FACES if face_name in thicknesses]
+    return [
+        (face_a, face_b)
+        for index, face_a in enumerate(face_names)
+        for face_b in face_names[index + 1 :]
+        if FACES[face_a][0] != FACES[face_b][0]
+    ]
+
+
+def get_tenon_width(length: float, tenon_count: int) -> float:
+    """
+    Get the auto width of the tenons of a joint, as computed by the Box Joint command.
+
+    Tenons and gaps between them have the same width, with a gap at each end.
+    """
+
+    return length / (2 * tenon_count + 1)
+
+
+def get_tenon_intervals(length: float, joint: Joint) -> list[tuple[float, float]]:
+    """
+    Get the start and end of each tenon along a joint of the given length.
+
+    As in the Box Joint command, the tenons are centered on the joint and
+    spread so that the gaps between them and at both ends are equal.
+    """
+
+    count = joint.tenon_count
+    width = joint.tenon_width or get_tenon_width(length, count)
+
+    gap = (length - width * count) / (count + 1)
+    if gap < TOLERANCE:
+        raise ValueError(f"{count} tenons of {width:g} cm do not fit in {length:g} cm")
+
+    spacing = gap + width
+    return [
+        (gap + index * spacing, gap + index * spacing + width) for index in range(count)
+    ]
+
+
+def get_box_parts(spec: BoxSpec) -> list[dxf.Part]:
+    """
+    Get the flat outline of each panel of a box, with its finger joints.
+
+    As with the Dress Up command, each panel is its face of the box extruded
+    inward by its thickness, so neighbour panels overlap at each edge. The
+    overlap goes to the panel that runs through with the orientation corner
+    policy: it keeps both ends of the edge and is cut between the tenons of
+    the other panel. Outlines are drawn looking at the panel from outside.
+    """
+
+    corner_panels = {
+        face_name: _get_corner_panel(spec, face_name) for face_name in spec.thicknesses
+    }
+
+    parts = []
+    for face_name, thickness in spec.thicknesses.items():
+        axis, direction = FACES[face_name]
+        u_axis, v_axis = [other for other in range(3) if other != axis]
+        width, height = spec.size[u_axis], spec.size[v_axis]
+
+        # Areas of the face removed by the joints, as (u0, u1, v0, v1) rectangles
+        removed = []
+        for neighbour_name in spec.thicknesses:
+            neighbour_axis, neighbour_direction = FACES[neighbour_name]
+            if neighbour_axis == axis:
+                continue
+
+            joint = spec.joints[
+                tuple(sorted((face_name, neighbour_name), key=list(FACES).index))
+            ]
+            # The joint runs along the third axis of the box
+            edge_axis = 3 - axis - neighbour_axis
+            intervals = get_tenon_intervals(spec.size[edge_axis], joint)
+            if corners.runs_through(
+                corners.CornerPolicy.Orientation,
+                corner_panels[face_name],
+                corner_panels[neighbour_name],
+            ):
+                # Cut the mortises that take the tenons of the neighbour
+                cuts = intervals
+            else:
+                # Keep only the tenons
+                bounds = [0, *(bound for interval in intervals for bound in interval)]
+                cuts = list(zip(bounds[::2], [*bounds[1::2], spec.size[edge_axis]]))
+
+            # The cuts are as deep as the neighbour panel is thick
+            depth = spec.thicknesses[neighbour_name]
+            side_length = spec.size[neighbour_axis]
+            side = (
+                (0, depth)
+                if neighbour_direction < 0
+                else (side_length - depth, side_length)
+            )
+            for start, end in cuts:
+                if edge_axis == u_axis:
+                    removed.append((start, end, *side))
+                else:
+                    removed.append((*side, start, end))
+
+        loops = _trace_outline(width, height, removed)
+
+        # The (u, v) frame looks at the front and back faces from inside, and
+        # the other faces from inside when they face the negative direction
+        if (direction < 0) != (axis == 1):
+            loops = [
+                (_mirror_points(points, width), is_outer) for points, is_outer in loops
+            ]
+
+        parts.append(
+            dxf.Part(
+                f"{spec.name}-{face_name}",
+                [dxf.Loop(_get_lines(points), is_outer) for points, is_outer in loops],
+                spec.material,
+                thickness,
+                spec.name,
+                face_name,
+            )
+        )
+
+    return parts
+
+
+def export_box(spec: BoxSpec, folder: str) -> dict:
+    """
+    Write the panels of a box to DXF files in a folder, with a cut list and master sheets.
+
+    Identical panels are written once. All the panels are nested on master
+    sheets, one file per sheet. Returns a report of the export.
+    """
+
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    part_groups = fingerprint.group_duplicate_parts(get_box_parts(spec))
+
+    # The cut list describes the panels as designed, before the kerf offset
+    cut_list_file_path = os.path.join(folder, CUT_LIST_FILENAME)
+    with open(cut_list_file_path, "w", newline="") as file:
+        with cutlist.CutListWriter(file) as writer:
+            for part_group in part_groups:
+                writer.write_row(cutlist.get_cut_list_row(part_group, DXF_UNITS_SCALE))
+
+    # Offset each distinct panel by half the kerf, away from the material
+    if spec.kerf_width:
+        part_groups = [
+            [kerf.offset_part(part_group[0], spec.kerf_width / 2), *part_group[1:]]
+            for part_group in part_groups
+        ]
+
+    files = {}
+    for part_group in part_groups:
+        file_path = os.path.join(folder, f"{part_group[0].name}.dxf")
+        dxf.write_dxf(file_path, part_group[0].entities, DXF_UNITS_SCALE)
+        files[file_path] = len(part_group)
+
+    rectangles = []
+    for index, part_group in enumerate(part_groups):
+        min_x, min_y, max_x, max_y = part_group[0].bounds
+        rectangles.extend([(index, max_x - min_x, max_y - min_y)] * len(part_group))
+    sheets = nesting.pack(rectangles, *spec.sheet_settings)
+
+    master_files = {}
+    name, extension = os.path.splitext(MASTER_FILENAME)
+    for index, sheet in enumerate(sheets):
+        suffix = f"-{index + 1}" if len(sheets) > 1 else ""
+        file_path = os.path.join(folder, f"{name}{suffix}{extension}")
+        with open(file_path, "w") as file:
+            with dxf.DXFWriter(file, DXF_UNITS_SCALE) as writer:
+                for placement in sheet.placements:
+                    writer.write_entities(
+                        get_placed_entities(part_groups[placement.key][0], placement)
+                    )
+        master_files[file_path] = sheet.utilization
+
+    return {
+        "name": spec.name,
+        "folder": folder,
+        "panels": sum(len(part_group) for part_group in part_groups),
+        "files": files,
+        "master_files": master_files,
+        "cut_list_file": cut_list_file_path,
+        "utilization": nesting.get_utilization(sheets),
+    }
+
+
+def get_placed_entities(part: dxf.Part, placement: nesting.Placement) -> list:
+    """
+    Get the entities of a part moved to its placement on a sheet.
+    """
+
+    dx, dy = geometry.get_placement_offset(
+        part.bounds, placement.x, placement.y, placement.rotated
+    )
+    return dxf.transform_entities(part.entities, dx, dy, placement.rotated)
+
+
+def _get_dict(data: dict, key: str) -> dict:
+    value = data.get(key, {})
+    if not isinstance(value, dict):
+        raise ValueError(f"{key} must be an object")
+    return value
+
+
+def _read_joint(values: dict, default: Joint, scale: float) -> Joint:
+    tenon_count = values.get("tenon_count", default.tenon_count)
+    if not isinstance(tenon_count, int) or tenon_count < 1:
+        raise ValueError("tenon_count must be a positive integer")
+
+    if "tenon_width" not in values:
+        return Joint(tenon_count, default.tenon_width)
+
+    tenon_width = values["tenon_width"]
+    if tenon_width is not None:
+        if not isinstance(tenon_width, (int, float)) or tenon_width <= 0:
+            raise ValueError("tenon_width must be a positive number or null")
+        tenon_width *= scale
+
+    return Joint(tenon_count, tenon_width)
+
+
+def _get_corner_panel(spec: BoxSpec, face_name: str) -> corners.CornerPanel:
+    axis, direction = FACES[face_name]
+    normal = tuple(float(direction) if index == axis else 0.0 for index in range(3))
+    u_axis, v_axis = [other for other in range(3) if other != axis]
+    return corners.CornerPanel(
+        list(FACES).index(face_name),
+        normal,
+        spec.thicknesses[face_name],
+        spec.size[u_axis] * spec.size[v_axis],
+    )
+
+
+def _trace_outline(
+    width: float, height: float, removed: list[tuple[float, float, float, float]]
+) -> list[tuple[list[tuple[float, float]], bool]]:
+    # Split the face in a grid on the bounds of the removed rectangles
+    xs = sorted({0, width, *(x for rect in removed for x in rect[:2])})
+    ys = sorted({0, height, *(y for rect in removed for y in rect[2:])})
+
+    def is_kept(i: int, j: int) -> bool:
+        if not (0 <= i < len(xs) - 1 and 0 <= j < len(ys) - 1):
+            return False
+        x = (xs[i] + xs[i + 1]) / 2
+        y = (ys[j] + ys[j + 1]) / 2
+        return not any(x0 < x < x1 and y0 < y < y1 for x0, x1, y0, y1 in removed)
+
+    # Edges between kept and removed cells, with the material on their left
+    next_points: dict = {}
+    for i in range(len(xs) - 1):
+        for j in range(len(ys) - 1):
+            if not is_kept(i, j):
+                continue
+            for start, end, neighbour in (
+                ((i, j), (i + 1, j), (i, j - 1)),
+                ((i + 1, j), (i + 1, j + 1), (i + 1, j)),
+                ((i + 1, j + 1), (i, j + 1), (i, j + 1)),
+                ((i, j + 1), (i, j), (i - 1, j)),
+            ):
+                if not is_kept(*neighbour):
+                    next_points.setdefault(start, []).append(end)
+
+    # Chain the edges into loops, turning left where two loops touch
+    loops = []
+    while next_points:
+        start = next(iter(next_points))
+        points = [start]
+        point = start
+        direction = None
+        while True:
+            candidates = next_points[point]
+            if direction and len(candidates) > 1:
+                candidates.sort(
+                    key=lambda end: -geometry.cross_2d(
+                        direction, (end[0] - point[0], end[1] - point[1])
+                    )
+                )
+            end = candidates.pop(0)
+            if not candidates:
+                del next_points[point]
+            direction = (end[0] - point[0], end[1] - point[1])
+            point = end
+            if point == start:
+                break
+            points.append(point)
+
+        # Only keep the corners of the loop
+        corners_2d = [
+            (xs[point[0]], ys[point[1]])
+            for index, point in enumerate(points)
+            if geometry.cross_2d(
+                geometry.sub(point, points[index - 1]),
+                geometry.sub(points[(index + 1) % len(points)], point),
+            )
+        ]
+        loops.append((corners_2d, geometry.get_signed_area(corners_2d) > 0))
+
+    if sum(is_outer for _, is_outer in loops) != 1:
+        raise ValueError("The joints split the panel in several pieces")
+
+    return loops
+
+
+def _mirror_points(
+    points: list[tuple[float, float]], width: float
+) -> list[tuple[float, float]]:
+    # Reverse the order to keep the orientation of the loop
+    return [(width - x, y) for x, y in reversed(points)]
+
+
+def _get_lines(points: list[tuple[float, float]]) -> list[dxf.Line]:
+    return [dxf.Line(points[index - 1], point) for index, point in enumerate(points)]
@@ -0,0 +1,197 @@
+from . import geometry
+
+# Tolerance used to compare vectors and coordinates.
+TOLERANCE = geometry.TOLERANCE
+
+# Axis order used by the orientation policy: panels facing the first axis run
+# through the panels facing the next ones (Z: top/bottom, Y: front/back, X: sides).
+ORIENTATION_PRIORITY = (2, 1, 0)
+
+
+class CornerPolicy:
+    """
+    The different ways two panels can meet at a corner
+    """
+
+    def __init__(self):
+        pass
+
+    # Panels are not trimmed and overlap at each corner.
+    Overlap = "Overlap"
+    # The largest panel runs through, the other one butts against it.
+    Butt = "Butt"
+    # The panel facing the highest priority axis runs through.
+    Orientation = "Orientation"
+    # Both panels are cut at an angle and meet on the corner bisector.
+    Miter = "Miter"
+
+
+class CornerPanel:
+    """
+    Geometry of a panel needed to resolve its corners.
+    """
+
+    def __init__(
+        self,
+        face_id: int,
+        normal: tuple[float, float, float],
+        thickness: float,
+        area: float,
+    ):
+        self.face_id = face_id
+        self.normal = geometry.normalize(normal)
+        self.thickness = thickness
+        self.area = area
+
+
+class PanelOutline:
+    """
+    Trimmed outlines of the outer and inner faces of a panel in model space.
+    """
+
+    def __init__(
+        self,
+        outer: list[tuple[float, float, float]],
+        inner: list[tuple[float, float, float]],
+        is_square: bool,
+    ):
+        self.outer = outer
+        self.inner = inner
+        # True when the inner outline is the outer one moved by the thickness
+        self.is_square = is_square
+
+
+def are_perpendicular(
+    normal_a: tuple[float, float, float], normal_b: tuple[float, float, float]
+) -> bool:
+    """
+    Check if two unit normals are perpendicular.
+    """
+
+    return abs(geometry.dot(normal_a, normal_b)) < TOLERANCE
+
+
+def runs_through(policy: str, panel: CornerPanel, neighbour: CornerPanel) -> bool:
+    """
+    Check if a panel runs through its neighbour at their common edge.
+    """
+
+    if policy == CornerPolicy.Orientation:
+        panel_rank = _get_orientation_rank(panel.normal)
+        neighbour_rank = _get_orientation_rank(neighbour.normal)
+        if panel_rank != neighbour_rank:
+            return panel_rank < neighbour_rank
+
+    # Largest panel wins, ties are broken by face id to stay deterministic
+    if abs(panel.area - neighbour.area) > TOLERANCE:
+        return panel.area > neighbour.area
+    return panel.face_id < neighbour.face_id
+
+
+def get_edge_insets(
+    policy: str, panel: CornerPanel, neighbour: CornerPanel
+) -> tuple[float, float]:
+    """
+    Get how far a panel edge shared with a neighbour panel should be pulled back.
+
+    Returns the inset on the outer face and on the inner face of the panel.
+    Only perpendicular panels are trimmed, other corners are left untouched.
+    """
+
+    if policy == CornerPolicy.Overlap or not are_perpendicular(
+        panel.normal, neighbour.normal
+    ):
+        return (0.0, 0.0)
+
+    # The miter plane goes from the outer edge to the inner corner
+    if policy == CornerPolicy.Miter:
+        return (0.0, neighbour.thickness)
+
+    if runs_through(policy, panel, neighbour):
+        return (0.0, 0.0)
+
+    return (neighbour.thickness, neighbour.thickness)
+
+
+def inset_polygon(
+    points: list[tuple[float, float]], insets: list[float]
+) -> list[tuple[float, float]]:
+    """
+    Move each edge of a 2D polygon towards its interior.
+
+    The edge `i` goes from `points[i]` to `points[i + 1]` and is moved by `insets[i]`.
+    New vertices are the intersections of consecutive moved edges.
+    """
+
+    count = len(points)
+
+    # Interior is on the left of counter-clockwise polygons
+    side = 1 if geometry.get_signed_area(points) > 0 else -1
+
+    lines = []
+    for i in range(count):
+        start, end = points[i], points[(i + 1) % count]
+        direction = geometry.normalize((end[0] - start[0], end[1] - start[1]))
+        normal = (-direction[1] * side, direction[0] * side)
+        origin = (start[0] + normal[0] * insets[i], start[1] + normal[1] * insets[i])
+        lines.append((origin, direction))
+
+    result = []
+    for i in range(count):
+        previous_origin, previous_direction = lines[i - 1]
+        origin, direction = lines[i]
+
+        denominator = geometry.cross_2d(previous_direction, direction)
+        # Collinear edges, keep the vertex on the current edge
+        if abs(denominator) < TOLERANCE:
+            result.append(origin)
+            continue
+
+        delta = (origin[0] - previous_origin[0], origin[1] - previous_origin[1])
+        t = geometry.cross_2d(delta, direction) / denominator
+        result.append(
+            (
+                previous_origin[0] + previous_direction[0] * t,
+                previous_origin[1] + previous_direction[1] * t,
+            )
+        )
+
+    return result
+
+
+def resolve_panel_outline(
+    points: list[tuple[float, float, float]],
+    normal: tuple[float, float, float],
+    thickness: float,
+    insets: list[tuple[float, float]],
+) -> PanelOutline:
+    """
+    Compute the trimmed outline of a planar panel.
+
+    `points` is the outline of the outer face of the panel, `normal` its outward
+    normal and `insets` the outer and inner insets of each edge.
+    Returns None if the panel does not need to be trimmed.
+    """
+
+    if all(
+        abs(outer) < TOLERANCE and abs(inner) < TOLERANCE for outer, inner in insets
+    ):
+        return None
+
+    # Build a 2D frame on the face plane
+    frame = geometry.Frame(points[0], geometry.sub(points[1], points[0]), normal)
+    points_2d = frame.to_2d_points(points)
+
+    outer = inset_polygon(points_2d, [outer for outer, _ in insets])
+    inner = inset_polygon(points_2d, [inner for _, inner in insets])
+
+    return PanelOutline(
+        [frame.to_3d(point) for point in outer],
+        [frame.to_3d(point, thickness) for point in inner],
+        all(abs(outer - inner) < TOLERANCE for outer, inner in insets),
+    )
+
+
+def _get_orientation_rank(normal: tuple[float, float, float]) -> int:
+    axis = max(range(3), key=lambda i: abs(normal[i]))
+    return ORIENTATION_PRIORITY.index(axis)
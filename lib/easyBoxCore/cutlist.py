@@ -0,0 +1,98 @@
+import csv
+import json
+
+from . import dxf
+
+# Columns of the cut list, lengths are in the units of the export.
+CUT_LIST_FIELDS = [
+    "file",
+    "component",
+    "body",
+    "material",
+    "length",
+    "width",
+    "thickness",
+    "area",
+    "quantity",
+]
+
+# Number of decimals kept for lengths and areas.
+CUT_LIST_PRECISION = 2
+
+
+class CutListFormat:
+    """
+    The file formats of the cut list
+    """
+
+    def __init__(self):
+        pass
+
+    # Comma separated values, one line per panel.
+    CSV = "csv"
+    # JSON array, one object per panel.
+    JSON = "json"
+
+
+class CutListWriter:
+    """
+    Stream the rows of a cut list to a file.
+
+    Use as a context manager around an open text file, the header or the
+    opening of the JSON array is written on enter and closed on exit.
+    """
+
+    def __init__(self, file, file_format: str = CutListFormat.CSV):
+        self.file = file
+        self.file_format = file_format
+        self._row_count = 0
+        self._csv_writer = None
+
+    def __enter__(self):
+        if self.file_format == CutListFormat.JSON:
+            self.file.write("[")
+        else:
+            self._csv_writer = csv.DictWriter(self.file, CUT_LIST_FIELDS)
+            self._csv_writer.writeheader()
+        return self
+
+    def __exit__(self, *args):
+        if self.file_format == CutListFormat.JSON:
+            self.file.write("\n]\n")
+
+    def write_row(self, row: dict):
+        """
+        Write the row of a panel.
+        """
+
+        if self.file_format == CutListFormat.JSON:
+            separator = "," if self._row_count else ""
+            self.file.write(f"{separator}\n  {json.dumps(row)}")
+        else:
+            self._csv_writer.writerow(row)
+        self._row_count += 1
+
+
+def get_cut_list_row(part_group: list[dxf.Part], scale: float = 1.0) -> dict:
+    """
+    Get the cut list row of a group of identical parts.
+
+    The length and the width are the sides of the bounding box of the part in
+    its face plane, which is aligned to the longest straight edge of the face.
+    """
+
+    part = part_group[0]
+    min_x, min_y, max_x, max_y = part.bounds
+    length, width = sorted((max_x - min_x, max_y - min_y), reverse=True)
+
+    return {
+        "file": f"{part.name}.dxf",
+        "component": part.component_name,
+        "body": part.body_name,
+        "material": part.material,
+        "length": round(length * scale, CUT_LIST_PRECISION),
+        "width": round(width * scale, CUT_LIST_PRECISION),
+        "thickness": round(part.thickness * scale, CUT_LIST_PRECISION),
+        "area": round(part.area * scale * scale, CUT_LIST_PRECISION),
+        "quantity": len(part_group),
+    }
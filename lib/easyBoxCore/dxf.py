@@ -0,0 +1,464 @@
+import math
+from functools import cached_property
+
+from . import geometry
+
+# DXF version written in the header (AutoCAD R12). R12 has no header
+# variable for the drawing units, the files are written in millimeters.
+DXF_VERSION = "AC1009"
+
+# Layer used for all entities.
+DXF_LAYER = "0"
+
+# Number of decimals kept for coordinates and angles.
+DXF_PRECISION = 4
+
+
+class Line:
+    """
+    A straight segment going from start to end.
+    """
+
+    def __init__(self, start: tuple[float, float], end: tuple[float, float]):
+        self.start = start
+        self.end = end
+
+
+class Arc:
+    """
+    A circular arc starting at `start_angle` and turning by `sweep_angle`.
+
+    Angles are in radians, a positive sweep turns counter-clockwise.
+    """
+
+    def __init__(
+        self,
+        center: tuple[float, float],
+        radius: float,
+        start_angle: float,
+        sweep_angle: float,
+    ):
+        self.center = center
+        self.radius = radius
+        self.start_angle = start_angle
+        self.sweep_angle = sweep_angle
+
+    @property
+    def end_angle(self) -> float:
+        return self.start_angle + self.sweep_angle
+
+    def point_at(self, angle: float) -> tuple[float, float]:
+        return (
+            self.center[0] + self.radius * math.cos(angle),
+            self.center[1] + self.radius * math.sin(angle),
+        )
+
+
+class Circle:
+    """
+    A full circle.
+    """
+
+    def __init__(self, center: tuple[float, float], radius: float):
+        self.center = center
+        self.radius = radius
+
+
+class Polyline:
+    """
+    A chain of straight segments, used for curves without a native DXF entity.
+    """
+
+    def __init__(self, points: list[tuple[float, float]], closed: bool = False):
+        self.points = points
+        self.closed = closed
+
+
+class Loop:
+    """
+    A closed chain of entities bounding a face.
+    """
+
+    def __init__(self, entities: list, is_outer: bool = True):
+        self.entities = entities
+        self.is_outer = is_outer
+
+
+class Part:
+    """
+    The 2D profile of a face, made of one outer loop and optional holes.
+
+    `material` and `thickness` describe the stock the part is cut from,
+    `component_name` and `body_name` where the face comes from.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loops: list[Loop],
+        material: str = "",
+        thickness: float = 0,
+        component_name: str = "",
+        body_name: str = "",
+    ):
+        self.name = name
+        self.loops = loops
+        self.material = material
+        self.thickness = thickness
+        self.component_name = component_name
+        self.body_name = body_name
+
+    @property
+    def entities(self) -> list:
+        return [entity for loop in self.loops for entity in loop.entities]
+
+    @cached_property
+    def bounds(self) -> tuple[float, float, float, float]:
+        # Computed once, parts are not modified after being read
+        return get_bounds(self.entities)
+
+    @cached_property
+    def area(self) -> float:
+        # Area of the outer loop minus the area of the holes
+        return sum(
+            abs(get_loop_area(loop.entities)) * (1 if loop.is_outer else -1)
+            for loop in self.loops
+        )
+
+    def with_loops(self, loops: list[Loop]) -> "Part":
+        """
+        Get a copy of the part with other loops.
+        """
+
+        return Part(
+            self.name,
+            loops,
+            self.material,
+            self.thickness,
+            self.component_name,
+            self.body_name,
+        )
+
+
+def get_bounds(entities: list) -> tuple[float, float, float, float]:
+    """
+    Get the bounding box of entities as (min x, min y, max x, max y).
+    """
+
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for entity in entities:
+        for x, y in _get_extreme_points(entity):
+            min_x, min_y = min(min_x, x), min(min_y, y)
+            max_x, max_y = max(max_x, x), max(max_y, y)
+    return (min_x, min_y, max_x, max_y)
+
+
+def get_loop_area(entities: list) -> float:
+    """
+    Get the signed area enclosed by a closed chain of entities.
+
+    The area is positive when the chain turns counter-clockwise.
+    """
+
+    # Sum of the integrals of (x dy - y dx) / 2 along each entity
+    area = 0
+    for entity in entities:
+        if isinstance(entity, Line):
+            area += geometry.cross_2d(entity.start, entity.end) / 2
+
+        elif isinstance(entity, Arc):
+            (x, y), r = entity.center, entity.radius
+            start_angle, end_angle = entity.start_angle, entity.end_angle
+            area += (
+                r * x * (math.sin(end_angle) - math.sin(start_angle))
+                - r * y * (math.cos(end_angle) - math.cos(start_angle))
+                + r * r * entity.sweep_angle
+            ) / 2
+
+        elif isinstance(entity, Circle):
+            area += math.pi * entity.radius**2
+
+        elif isinstance(entity, Polyline):
+            points = entity.points
+            if entity.closed:
+                points = [*points, points[0]]
+            area += sum(geometry.cross_2d(a, b) for a, b in zip(points, points[1:])) / 2
+
+    return area
+
+
+def transform_entities(
+    entities: list, dx: float = 0, dy: float = 0, rotated: bool = False
+) -> list:
+    """
+    Get a copy of entities turned a quarter counter-clockwise around the origin
+    if `rotated`, then moved by (dx, dy).
+    """
+
+    def transform_point(point: tuple[float, float]) -> tuple[float, float]:
+        x, y = (-point[1], point[0]) if rotated else point
+        return (x + dx, y + dy)
+
+    angle = math.pi / 2 if rotated else 0
+
+    result = []
+    for entity in entities:
+        if isinstance(entity, Line):
+            result.append(
+                Line(transform_point(entity.start), transform_point(entity.end))
+            )
+        elif isinstance(entity, Arc):
+            result.append(
+                Arc(
+                    transform_point(entity.center),
+                    entity.radius,
+                    entity.start_angle + angle,
+                    entity.sweep_angle,
+                )
+            )
+        elif isinstance(entity, Circle):
+            result.append(Circle(transform_point(entity.center), entity.radius))
+        elif isinstance(entity, Polyline):
+            result.append(
+                Polyline(
+                    [transform_point(point) for point in entity.points], entity.closed
+                )
+            )
+    return result
+
+
+def simplify_points(
+    points: list[tuple[float, float]], tolerance: float, closed: bool = False
+) -> list[tuple[float, float]]:
+    """
+    Remove the points of a chain that are not needed to stay within `tolerance`
+    of the original chain (Douglas-Peucker algorithm).
+
+    The first and last points of an open chain are always kept.
+    """
+
+    if len(points) < 3:
+        return list(points)
+
+    if closed:
+        # Split the loop at its farthest point from the first one,
+        # both halves are then simplified as open chains
+        farthest = max(
+            range(1, len(points)), key=lambda i: math.dist(points[0], points[i])
+        )
+        first_half = simplify_points(points[: farthest + 1], tolerance)
+        second_half = simplify_points([*points[farthest:], points[0]], tolerance)
+        return first_half[:-1] + second_half[:-1]
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+
+    # Keep the farthest point from each segment until all points are close enough
+    segments = [(0, len(points) - 1)]
+    while segments:
+        start, end = segments.pop()
+        farthest, max_distance = None, tolerance
+        for i in range(start + 1, end):
+            distance = _get_segment_distance(points[i], points[start], points[end])
+            if distance > max_distance:
+                farthest, max_distance = i, distance
+
+        if farthest is not None:
+            keep[farthest] = True
+            segments.extend([(start, farthest), (farthest, end)])
+
+    return [point for point, is_kept in zip(points, keep) if is_kept]
+
+
+def simplify_entities(entities: list, tolerance: float) -> list:
+    """
+    Get a copy of entities with simplified polylines.
+
+    Entities that are not changed are kept as is.
+    """
+
+    result = []
+    for entity in entities:
+        if isinstance(entity, Polyline):
+            points = simplify_points(entity.points, tolerance, entity.closed)
+            if len(points) < len(entity.points):
+                entity = Polyline(points, entity.closed)
+        result.append(entity)
+    return result
+
+
+class DXFWriter:
+    """
+    Stream entities to a DXF file.
+
+    Use as a context manager around an open text file, the header is written
+    on enter and the file is terminated on exit.
+    """
+
+    def __init__(self, file, scale: float = 1.0):
+        self.file = file
+        self.scale = scale
+
+    def __enter__(self):
+        self._write_pairs(
+            (0, "SECTION"),
+            (2, "HEADER"),
+            (9, "$ACADVER"),
+            (1, DXF_VERSION),
+            (0, "ENDSEC"),
+            (0, "SECTION"),
+            (2, "ENTITIES"),
+        )
+        return self
+
+    def __exit__(self, *args):
+        self._write_pairs((0, "ENDSEC"), (0, "EOF"))
+
+    def write_entities(self, entities: list):
+        """
+        Write a list of entities.
+        """
+
+        for entity in entities:
+            self.write_entity(entity)
+
+    def write_entity(self, entity):
+        """
+        Write a single entity.
+        """
+
+        if isinstance(entity, Line):
+            self._write_pairs(
+                (0, "LINE"),
+                (8, DXF_LAYER),
+                *self._point_pairs(entity.start, 10),
+                *self._point_pairs(entity.end, 11),
+            )
+
+        elif isinstance(entity, Arc):
+            # DXF arcs always turn counter-clockwise
+            start_angle, end_angle = entity.start_angle, entity.end_angle
+            if entity.sweep_angle < 0:
+                start_angle, end_angle = end_angle, start_angle
+            self._write_pairs(
+                (0, "ARC"),
+                (8, DXF_LAYER),
+                *self._point_pairs(entity.center, 10),
+                (40, self._format_length(entity.radius)),
+                (50, _format_number(math.degrees(start_angle) % 360)),
+                (51, _format_number(math.degrees(end_angle) % 360)),
+            )
+
+        elif isinstance(entity, Circle):
+            self._write_pairs(
+                (0, "CIRCLE"),
+                (8, DXF_LAYER),
+                *self._point_pairs(entity.center, 10),
+                (40, self._format_length(entity.radius)),
+            )
+
+        elif isinstance(entity, Polyline):
+            self._write_pairs(
+                (0, "POLYLINE"),
+                (8, DXF_LAYER),
+                (66, 1),
+                (10, 0),
+                (20, 0),
+                (30, 0),
+                (70, 1 if entity.closed else 0),
+            )
+            for point in entity.points:
+                self._write_pairs(
+                    (0, "VERTEX"), (8, DXF_LAYER), *self._point_pairs(point, 10)
+                )
+            self._write_pairs((0, "SEQEND"), (8, DXF_LAYER))
+
+    def _point_pairs(self, point: tuple[float, float], code: int) -> tuple:
+        return (
+            (code, self._format_length(point[0])),
+            (code + 10, self._format_length(point[1])),
+            (code + 20, 0),
+        )
+
+    def _format_length(self, value: float) -> str:
+        return _format_number(value * self.scale)
+
+    def _write_pairs(self, *pairs):
+        self.file.write("".join(f"{code}\n{value}\n" for code, value in pairs))
+
+
+def write_dxf(file_path: str, entities: list, scale: float = 1.0):
+    """
+    Write entities to a new DXF file.
+    """
+
+    with open(file_path, "w") as file:
+        with DXFWriter(file, scale) as writer:
+            writer.write_entities(entities)
+
+
+def get_dxf_size(entities: list, scale: float = 1.0) -> int:
+    """
+    Get the number of characters of the DXF file of entities, without writing it.
+    """
+
+    counter = _SizeCounter()
+    with DXFWriter(counter, scale) as writer:
+        writer.write_entities(entities)
+    return counter.size
+
+
+class _SizeCounter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text: str):
+        self.size += len(text)
+
+
+def _get_segment_distance(point, start, end) -> float:
+    length_squared = (end[0] - start[0]) ** 2 + (end[1] - start[1]) ** 2
+    if not length_squared:
+        return math.dist(point, start)
+
+    # Project the point on the segment, clamped to its ends
+    t = (
+        (point[0] - start[0]) * (end[0] - start[0])
+        + (point[1] - start[1]) * (end[1] - start[1])
+    ) / length_squared
+    t = max(0, min(1, t))
+    return math.dist(
+        point, (start[0] + t * (end[0] - start[0]), start[1] + t * (end[1] - start[1]))
+    )
+
+
+def _get_extreme_points(entity) -> list[tuple[float, float]]:
+    if isinstance(entity, Line):
+        return [entity.start, entity.end]
+
+    if isinstance(entity, Circle):
+        x, y = entity.center
+        r = entity.radius
+        return [(x - r, y - r), (x + r, y + r)]
+
+    if isinstance(entity, Arc):
+        start_angle = min(entity.start_angle, entity.end_angle)
+        end_angle = max(entity.start_angle, entity.end_angle)
+        points = [entity.point_at(start_angle), entity.point_at(end_angle)]
+        # Add the quadrant points crossed by the arc
+        quadrant = math.ceil(start_angle / (math.pi / 2))
+        while quadrant * math.pi / 2 <= end_angle:
+            points.append(entity.point_at(quadrant * math.pi / 2))
+            quadrant += 1
+        return points
+
+    if isinstance(entity, Polyline):
+        return entity.points
+
+    return []
+
+
+def _format_number(value: float) -> str:
+    text = f"{value:.{DXF_PRECISION}f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
@@ -0,0 +1,159 @@
+import hashlib
+import math
+
+from . import dxf, geometry
+
+# Number of decimals kept when comparing lengths, so that numerical noise
+# does not make identical parts different.
+FINGERPRINT_PRECISION = 4
+
+
+def get_part_fingerprint(part: dxf.Part) -> str:
+    """
+    Get a fingerprint of the shape of a part.
+
+    Moving or rotating a part does not change its fingerprint. Mirrored parts
+    share the same fingerprint too, which is fine as flat panels can be flipped.
+    Different parts may share a fingerprint too, it only narrows the parts
+    to compare, see group_duplicate_parts.
+    """
+
+    entities = part.entities
+
+    # Key points move with the part, their distances to their center do not
+    key_points = [point for entity in entities for point in _get_key_points(entity)]
+    center_x = sum(x for x, _ in key_points) / len(key_points)
+    center_y = sum(y for _, y in key_points) / len(key_points)
+    distances = sorted(
+        _round(math.hypot(x - center_x, y - center_y)) for x, y in key_points
+    )
+
+    # Entities shapes without their position
+    shapes = sorted(_get_entity_shape(entity) for entity in entities)
+
+    # Loops structure
+    loops = sorted((loop.is_outer, len(loop.entities)) for loop in part.loops)
+
+    return hashlib.sha1(repr((loops, shapes, distances)).encode()).hexdigest()
+
+
+def group_duplicate_parts(parts: list[dxf.Part]) -> list[list[dxf.Part]]:
+    """
+    Group congruent parts, in the order of their first part.
+
+    The fingerprint only sorts the parts into buckets, each part is then
+    compared to the first part of the groups of its bucket in all the poses
+    that can make them match, mirrored ones included.
+    """
+
+    buckets: dict = {}
+    groups = []
+    for part in parts:
+        bucket = buckets.setdefault(get_part_fingerprint(part), [])
+        form = None
+        for group, forms in bucket:
+            if form is None:
+                form = _get_canonical_forms(part)[0]
+            if form in forms:
+                group.append(part)
+                break
+        else:
+            group = [part]
+            bucket.append((group, set(_get_canonical_forms(part))))
+            groups.append(group)
+    return groups
+
+
+def _get_canonical_forms(part: dxf.Part) -> list[tuple]:
+    # Poses are anchored on the center of the key points, with the x axis
+    # going through one of the farthest key points, as a congruent part has
+    # the same center and farthest points
+    entities = part.entities
+    key_points = [point for entity in entities for point in _get_key_points(entity)]
+    center = (
+        sum(x for x, _ in key_points) / len(key_points),
+        sum(y for _, y in key_points) / len(key_points),
+    )
+    distances = [
+        geometry.get_length(geometry.sub(point, center)) for point in key_points
+    ]
+    max_distance = max(distances)
+    if max_distance < geometry.TOLERANCE:
+        x_axes = [(1.0, 0.0)]
+    else:
+        x_axes = [
+            geometry.normalize(geometry.sub(point, center))
+            for point, distance in zip(key_points, distances)
+            if distance > max_distance - 10**-FINGERPRINT_PRECISION
+        ]
+
+    forms = []
+    for x_axis in x_axes:
+        for is_mirrored in (False, True):
+            y_axis = (-x_axis[1], x_axis[0])
+            if is_mirrored:
+                y_axis = (x_axis[1], -x_axis[0])
+
+            def to_pose(point: tuple[float, float]) -> tuple[float, float]:
+                delta = geometry.sub(point, center)
+                return (
+                    _round(geometry.dot(delta, x_axis)),
+                    _round(geometry.dot(delta, y_axis)),
+                )
+
+            forms.append(
+                tuple(
+                    sorted(
+                        _get_entity_shape(entity)
+                        + tuple(
+                            sorted(to_pose(point) for point in _get_key_points(entity))
+                        )
+                        for entity in entities
+                    )
+                )
+            )
+    return forms
+
+
+def _get_key_points(entity) -> list[tuple[float, float]]:
+    if isinstance(entity, dxf.Line):
+        return [entity.start, entity.end]
+
+    if isinstance(entity, dxf.Arc):
+        return [
+            entity.center,
+            entity.point_at(entity.start_angle),
+            entity.point_at(entity.end_angle),
+        ]
+
+    if isinstance(entity, dxf.Circle):
+        return [entity.center]
+
+    if isinstance(entity, dxf.Polyline):
+        return entity.points
+
+    return []
+
+
+def _get_entity_shape(entity) -> tuple:
+    if isinstance(entity, dxf.Line):
+        return ("LINE", _round(math.dist(entity.start, entity.end)))
+
+    if isinstance(entity, dxf.Arc):
+        return ("ARC", _round(entity.radius), _round(abs(entity.sweep_angle)))
+
+    if isinstance(entity, dxf.Circle):
+        return ("CIRCLE", _round(entity.radius))
+
+    if isinstance(entity, dxf.Polyline):
+        length = sum(
+            math.dist(start, end)
+            for start, end in zip(entity.points, entity.points[1:])
+        )
+        return ("POLYLINE", entity.closed, len(entity.points), _round(length))
+
+    return (type(entity).__name__,)
+
+
+def _round(value: float) -> float:
+    return round(value, FINGERPRINT_PRECISION) + 0.0
@@ -0,0 +1,226 @@
+import math
+
+# Tolerance used to compare vectors and coordinates.
+TOLERANCE = 1e-6
+
+# Number of points from which bulk operations are run with NumPy.
+NUMPY_MIN_POINTS = 32
+
+# NumPy is slow to import and not always shipped with Fusion, it is imported
+# on first use and the pure Python code is used without it
+_numpy = None
+
+
+class Plane:
+    """
+    An infinite plane through `origin`, facing the direction of `normal`.
+    """
+
+    def __init__(
+        self, origin: tuple[float, float, float], normal: tuple[float, float, float]
+    ):
+        self.origin = tuple(origin)
+        self.normal = normalize(normal)
+
+    def get_distance(self, point: tuple[float, float, float]) -> float:
+        """
+        Get the signed distance of a point to the plane, positive in front of it.
+        """
+
+        return dot(sub(point, self.origin), self.normal)
+
+    def is_coplanar_to(self, other: "Plane", tolerance: float = TOLERANCE) -> bool:
+        """
+        Check if two planes are the same, whatever the direction of their normals.
+        """
+
+        return (
+            abs(abs(dot(self.normal, other.normal)) - 1) < tolerance
+            and abs(self.get_distance(other.origin)) < tolerance
+        )
+
+
+class Frame:
+    """
+    A 2D coordinate system on a plane in model space.
+    """
+
+    def __init__(
+        self,
+        origin: tuple[float, float, float],
+        x_axis: tuple[float, float, float],
+        normal: tuple[float, float, float],
+    ):
+        self.origin = tuple(origin)
+        self.normal = normalize(normal)
+        # Remove any normal component so the axes are orthogonal
+        x_axis = sub(x_axis, scale(self.normal, dot(x_axis, self.normal)))
+        self.x_axis = normalize(x_axis)
+        self.y_axis = cross(self.normal, self.x_axis)
+
+    def to_2d(self, point: tuple[float, float, float]) -> tuple[float, float]:
+        """
+        Project a model space point on the plane.
+        """
+
+        delta = sub(point, self.origin)
+        return (dot(delta, self.x_axis), dot(delta, self.y_axis))
+
+    def to_2d_points(
+        self, points: list[tuple[float, float, float]]
+    ) -> list[tuple[float, float]]:
+        """
+        Project model space points on the plane, as arrays when there are many of them.
+        """
+
+        numpy = get_numpy() if len(points) >= NUMPY_MIN_POINTS else None
+        if not numpy:
+            return [self.to_2d(point) for point in points]
+
+        deltas = numpy.asarray(points, dtype=float) - self.origin
+        axes = numpy.array([self.x_axis, self.y_axis]).T
+        return [tuple(point) for point in (deltas @ axes).tolist()]
+
+    def to_3d(
+        self, point: tuple[float, float], depth: float = 0
+    ) -> tuple[float, float, float]:
+        """
+        Get the model space point of a 2D point, moved by `depth` behind the plane.
+        """
+
+        return tuple(
+            self.origin[i]
+            + self.x_axis[i] * point[0]
+            + self.y_axis[i] * point[1]
+            - self.normal[i] * depth
+            for i in range(3)
+        )
+
+
+def add(a, b) -> tuple:
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def sub(a, b) -> tuple:
+    return tuple(x - y for x, y in zip(a, b))
+
+
+def scale(vector, factor: float) -> tuple:
+    return tuple(x * factor for x in vector)
+
+
+def dot(a, b) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def cross(a, b) -> tuple[float, float, float]:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def cross_2d(a, b) -> float:
+    return a[0] * b[1] - a[1] * b[0]
+
+
+def get_length(vector) -> float:
+    return math.sqrt(sum(x * x for x in vector))
+
+
+def normalize(vector) -> tuple:
+    length = get_length(vector)
+    return tuple(x / length for x in vector)
+
+
+def get_coplanar_mask(
+    plane: Plane, planes: list[Plane], tolerance: float = TOLERANCE
+) -> list[bool]:
+    """
+    Check which planes of a list are coplanar to a plane, as arrays when there are many of them.
+    """
+
+    numpy = get_numpy() if len(planes) >= NUMPY_MIN_POINTS else None
+    if not numpy:
+        return [plane.is_coplanar_to(other, tolerance) for other in planes]
+
+    normals = numpy.array([other.normal for other in planes])
+    origins = numpy.array([other.origin for other in planes])
+    is_parallel = numpy.abs(numpy.abs(normals @ plane.normal) - 1) < tolerance
+    is_on_plane = numpy.abs((origins - plane.origin) @ plane.normal) < tolerance
+    return (is_parallel & is_on_plane).tolist()
+
+
+def offset_points(
+    points: list[tuple[float, float, float]],
+    directions: list[tuple[float, float, float]],
+    distance: float,
+) -> list[tuple[float, float, float]]:
+    """
+    Move each point by `distance` along its unit direction.
+    """
+
+    numpy = get_numpy() if len(points) >= NUMPY_MIN_POINTS else None
+    if not numpy:
+        return [
+            add(point, scale(direction, distance))
+            for point, direction in zip(points, directions)
+        ]
+
+    moved = numpy.asarray(points, dtype=float) + numpy.asarray(directions) * distance
+    return [tuple(point) for point in moved.tolist()]
+
+
+def get_translation_matrix(vector: tuple[float, float, float]) -> list[float]:
+    """
+    Get the 4x4 matrix of a translation, row by row.
+    """
+
+    x, y, z = vector
+    return [1, 0, 0, x, 0, 1, 0, y, 0, 0, 1, z, 0, 0, 0, 1]
+
+
+def get_signed_area(points: list[tuple[float, float]]) -> float:
+    """
+    Get the area of a 2D polygon, positive if it turns counter-clockwise.
+    """
+
+    area = 0.0
+    for i in range(len(points)):
+        x1, y1 = points[i - 1]
+        x2, y2 = points[i]
+        area += x1 * y2 - x2 * y1
+    return area / 2
+
+
+def get_placement_offset(
+    bounds: tuple[float, float, float, float], x: float, y: float, rotated: bool
+) -> tuple[float, float]:
+    """
+    Get the translation that moves the bounding box of a 2D shape to (x, y).
+
+    When `rotated`, the shape is first turned a quarter counter-clockwise
+    around the origin, its bottom left corner is then (-max_y, min_x).
+    """
+
+    min_x, min_y, max_x, max_y = bounds
+    if rotated:
+        return (x + max_y, y - min_x)
+    return (x - min_x, y - min_y)
+
+
+def get_numpy():
+    """
+    Get the NumPy module, imported on first use, or False if it is not installed.
+    """
+
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy
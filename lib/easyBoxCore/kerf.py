@@ -0,0 +1,486 @@
+import math
+
+from . import dxf, geometry
+
+# Ratio between the length of a miter and the offset distance above which
+# sharp corners are beveled instead.
+MITER_LIMIT = 4
+
+# Minimum sine of the angle between two entities to consider them not tangent.
+TANGENT_TOLERANCE = 1e-6
+
+# Marker of a corner between two lines joined by a bevel line.
+BEVEL_CORNER = "bevel"
+
+
+def offset_part(part: dxf.Part, distance: float) -> dxf.Part:
+    """
+    Get a copy of a part with its loops offset away from the material.
+
+    Outer loops grow and holes shrink by `distance`, which is expected to be
+    smaller than the smallest feature of the part.
+    """
+
+    loops = []
+    for loop in part.loops:
+        # A loop made of a single circle has no direction
+        if len(loop.entities) == 1 and isinstance(loop.entities[0], dxf.Circle):
+            circle = loop.entities[0]
+            radius = circle.radius + (distance if loop.is_outer else -distance)
+            loops.append(dxf.Loop([dxf.Circle(circle.center, radius)], loop.is_outer))
+            continue
+
+        # The outside of a counter-clockwise loop is on the right of its entities
+        is_clockwise = dxf.get_loop_area(loop.entities) < 0
+        right_distance = distance if loop.is_outer != is_clockwise else -distance
+        loops.append(
+            dxf.Loop(offset_entities(loop.entities, right_distance), loop.is_outer)
+        )
+
+    return part.with_loops(loops)
+
+
+def offset_entities(entities: list, distance: float) -> list:
+    """
+    Offset a closed chain of entities by `distance` to their right.
+
+    Lines meet with miter corners (beveled when too sharp), other entities meet
+    with round corners outside turns and are trimmed inside turns. The lines
+    of long chains and the corners between them are computed as arrays.
+    """
+
+    line_indices = [
+        index for index, entity in enumerate(entities) if isinstance(entity, dxf.Line)
+    ]
+    if len(line_indices) >= geometry.NUMPY_MIN_POINTS and geometry.get_numpy():
+        offset, line_corners = _offset_lines_numpy(entities, line_indices, distance)
+    else:
+        offset = [_offset_entity(entity, distance) for entity in entities]
+        line_corners = _get_line_corners(entities, offset, distance)
+
+    result = []
+    for index, entity in enumerate(entities):
+        result.append(offset[index])
+
+        next_index = (index + 1) % len(entities)
+        previous, following = offset[index], offset[next_index]
+
+        # A loop made of a single entity was already joined at its seam
+        if next_index == index:
+            continue
+
+        # Corners between two lines are already solved
+        if index in line_corners:
+            corner = line_corners[index]
+            if corner == BEVEL_CORNER:
+                result.append(dxf.Line(previous.end, following.start))
+            elif corner:
+                previous.end = following.start = corner
+            continue
+
+        end_direction = _get_end_direction(entity)
+        start_direction = _get_start_direction(entities[next_index])
+        turn = geometry.cross_2d(end_direction, start_direction)
+
+        # Tangent entities are still connected once offset
+        if (
+            abs(turn) < TANGENT_TOLERANCE
+            and geometry.dot(end_direction, start_direction) > 0
+        ):
+            continue
+
+        corner = _get_end_point(entity)
+        is_outside_turn = turn * distance > 0
+
+        if is_outside_turn:
+            # Go around the corner at the offset distance
+            start_angle = _get_angle(corner, _get_end_point(previous))
+            end_angle = _get_angle(corner, _get_start_point(following))
+            sweep_angle = (end_angle - start_angle) % (2 * math.pi)
+            if turn < 0:
+                sweep_angle -= 2 * math.pi
+            result.append(dxf.Arc(corner, abs(distance), start_angle, sweep_angle))
+
+        else:
+            intersections = _intersect_carriers(
+                _get_end_carrier(previous), _get_start_carrier(following)
+            )
+            if intersections:
+                intersection = min(
+                    intersections, key=lambda point: math.dist(point, corner)
+                )
+                _set_end_point(previous, intersection)
+                _set_start_point(following, intersection)
+            else:
+                result.append(
+                    dxf.Line(_get_end_point(previous), _get_start_point(following))
+                )
+
+    return result
+
+
+def offset_points(
+    points: list[tuple[float, float]], distance: float, closed: bool = False
+) -> list[tuple[float, float]]:
+    """
+    Offset a chain of points by `distance` to its right, with miter corners.
+    """
+
+    # Repeated points have no direction
+    points = [
+        point
+        for point, previous in zip(points, [None, *points[:-1]])
+        if point != previous
+    ]
+    if closed and len(points) > 1 and points[0] == points[-1]:
+        points = points[:-1]
+    if len(points) < 2:
+        return points
+
+    if len(points) >= geometry.NUMPY_MIN_POINTS and geometry.get_numpy():
+        return _offset_points_numpy(points, distance, closed)
+
+    segments = list(zip(points, points[1:]))
+    if closed:
+        segments.append((points[-1], points[0]))
+    normals = [_get_right_normal(start, end) for start, end in segments]
+
+    # Ends of open chains use the normal of their only segment
+    previous_normals = [normals[-1] if closed else normals[0], *normals[:-1]]
+    next_normals = normals if closed else [*normals, normals[-1]]
+
+    result = []
+    for point, previous, following in zip(points, previous_normals, next_normals):
+        factor = distance / max(
+            1 + geometry.dot(previous, following), 2 / MITER_LIMIT**2
+        )
+        result.append(
+            (
+                point[0] + (previous[0] + following[0]) * factor,
+                point[1] + (previous[1] + following[1]) * factor,
+            )
+        )
+    return result
+
+
+def _offset_points_numpy(
+    points: list[tuple[float, float]], distance: float, closed: bool
+) -> list[tuple[float, float]]:
+    numpy = geometry.get_numpy()
+    array = numpy.asarray(points, dtype=float)
+
+    ends = numpy.roll(array, -1, axis=0) if closed else array[1:]
+    directions = ends - array[: len(ends)]
+    directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+    normals = numpy.stack([directions[:, 1], -directions[:, 0]], axis=1)
+
+    # Ends of open chains use the normal of their only segment
+    if closed:
+        previous_normals = numpy.roll(normals, 1, axis=0)
+        next_normals = normals
+    else:
+        previous_normals = numpy.concatenate([normals[:1], normals])
+        next_normals = numpy.concatenate([normals, normals[-1:]])
+
+    dots = numpy.sum(previous_normals * next_normals, axis=1)
+    factors = distance / numpy.maximum(1 + dots, 2 / MITER_LIMIT**2)
+    result = array + (previous_normals + next_normals) * factors[:, None]
+    return [tuple(point) for point in result.tolist()]
+
+
+def _get_line_corners(entities: list, offset: list, distance: float) -> dict:
+    # Corner after each line followed by a line, by index of the first line:
+    # the miter point, BEVEL_CORNER, or None when the offset lines already meet
+    # or cannot be joined
+    corners = {}
+    for index, entity in enumerate(entities):
+        next_index = (index + 1) % len(entities)
+        if not (
+            isinstance(entity, dxf.Line) and isinstance(entities[next_index], dxf.Line)
+        ):
+            continue
+
+        end_direction = _get_end_direction(entity)
+        start_direction = _get_start_direction(entities[next_index])
+        turn = geometry.cross_2d(end_direction, start_direction)
+        corners[index] = None
+        if (
+            abs(turn) < TANGENT_TOLERANCE
+            and geometry.dot(end_direction, start_direction) > 0
+        ):
+            continue
+
+        is_outside_turn = turn * distance > 0
+        intersection = _intersect_lines(
+            offset[index].end,
+            end_direction,
+            offset[next_index].start,
+            start_direction,
+        )
+        if intersection and (
+            not is_outside_turn
+            or math.dist(intersection, entity.end) <= MITER_LIMIT * abs(distance)
+        ):
+            corners[index] = intersection
+        elif is_outside_turn:
+            corners[index] = BEVEL_CORNER
+
+    return corners
+
+
+def _offset_lines_numpy(
+    entities: list, line_indices: list[int], distance: float
+) -> tuple[list, dict]:
+    # Same as offsetting each entity and calling _get_line_corners, with the
+    # lines and their corners computed as arrays
+    numpy = geometry.get_numpy()
+    lines = [entities[index] for index in line_indices]
+    starts = numpy.array([line.start for line in lines], dtype=float)
+    ends = numpy.array([line.end for line in lines], dtype=float)
+
+    directions = ends - starts
+    directions /= numpy.linalg.norm(directions, axis=1)[:, None]
+    normals = numpy.stack([directions[:, 1], -directions[:, 0]], axis=1)
+    offset_starts = starts + normals * distance
+    offset_ends = ends + normals * distance
+
+    offset_lines = iter(
+        dxf.Line(tuple(start), tuple(end))
+        for start, end in zip(offset_starts.tolist(), offset_ends.tolist())
+    )
+    offset = [
+        (
+            next(offset_lines)
+            if isinstance(entity, dxf.Line)
+            else _offset_entity(entity, distance)
+        )
+        for entity in entities
+    ]
+
+    # Pairs of lines following each other in the chain
+    positions = {index: position for position, index in enumerate(line_indices)}
+    pairs = [
+        (index, positions[index], positions[(index + 1) % len(entities)])
+        for index in line_indices
+        if (index + 1) % len(entities) in positions
+    ]
+    if not pairs:
+        return offset, {}
+    first = numpy.array([pair[1] for pair in pairs])
+    second = numpy.array([pair[2] for pair in pairs])
+
+    end_directions = directions[first]
+    start_directions = directions[second]
+    turns = (
+        end_directions[:, 0] * start_directions[:, 1]
+        - end_directions[:, 1] * start_directions[:, 0]
+    )
+    dots = numpy.sum(end_directions * start_directions, axis=1)
+    is_tangent = (numpy.abs(turns) < TANGENT_TOLERANCE) & (dots > 0)
+    is_outside_turn = turns * distance > 0
+
+    # Intersections of the offset lines, where they are not parallel
+    has_intersection = numpy.abs(turns) >= TANGENT_TOLERANCE
+    safe_turns = numpy.where(has_intersection, turns, 1)
+    deltas = offset_starts[second] - offset_ends[first]
+    t = (
+        deltas[:, 0] * start_directions[:, 1] - deltas[:, 1] * start_directions[:, 0]
+    ) / safe_turns
+    intersections = offset_ends[first] + end_directions * t[:, None]
+    miter_lengths = numpy.linalg.norm(intersections - ends[first], axis=1)
+
+    is_miter = (
+        ~is_tangent
+        & has_intersection
+        & (~is_outside_turn | (miter_lengths <= MITER_LIMIT * abs(distance)))
+    )
+    is_bevel = ~is_tangent & ~is_miter & is_outside_turn
+
+    corners = {}
+    for (index, _, _), intersection, miter, bevel in zip(
+        pairs, intersections.tolist(), is_miter.tolist(), is_bevel.tolist()
+    ):
+        corners[index] = (
+            tuple(intersection) if miter else BEVEL_CORNER if bevel else None
+        )
+    return offset, corners
+
+
+def _offset_entity(entity, distance: float):
+    if isinstance(entity, dxf.Line):
+        normal = _get_right_normal(entity.start, entity.end)
+        return dxf.Line(
+            _move(entity.start, normal, distance), _move(entity.end, normal, distance)
+        )
+
+    if isinstance(entity, dxf.Arc):
+        # The right of a counter-clockwise arc is away from its center
+        radius = entity.radius + (distance if entity.sweep_angle > 0 else -distance)
+        return dxf.Arc(entity.center, radius, entity.start_angle, entity.sweep_angle)
+
+    if isinstance(entity, dxf.Polyline):
+        return dxf.Polyline(
+            offset_points(entity.points, distance, entity.closed), entity.closed
+        )
+
+    return entity
+
+
+def _get_start_point(entity) -> tuple[float, float]:
+    if isinstance(entity, dxf.Line):
+        return entity.start
+    if isinstance(entity, dxf.Arc):
+        return entity.point_at(entity.start_angle)
+    if isinstance(entity, dxf.Polyline):
+        return entity.points[0]
+    return entity.center
+
+
+def _get_end_point(entity) -> tuple[float, float]:
+    if isinstance(entity, dxf.Line):
+        return entity.end
+    if isinstance(entity, dxf.Arc):
+        return entity.point_at(entity.end_angle)
+    if isinstance(entity, dxf.Polyline):
+        return entity.points[0] if entity.closed else entity.points[-1]
+    return entity.center
+
+
+def _get_start_direction(entity) -> tuple[float, float]:
+    if isinstance(entity, dxf.Line):
+        return geometry.normalize(geometry.sub(entity.end, entity.start))
+    if isinstance(entity, dxf.Arc):
+        return _get_arc_direction(entity, entity.start_angle)
+    if isinstance(entity, dxf.Polyline):
+        return geometry.normalize(geometry.sub(entity.points[1], entity.points[0]))
+    return (0, 0)
+
+
+def _get_end_direction(entity) -> tuple[float, float]:
+    if isinstance(entity, dxf.Line):
+        return geometry.normalize(geometry.sub(entity.end, entity.start))
+    if isinstance(entity, dxf.Arc):
+        return _get_arc_direction(entity, entity.end_angle)
+    if isinstance(entity, dxf.Polyline):
+        if entity.closed:
+            return geometry.normalize(geometry.sub(entity.points[0], entity.points[-1]))
+        return geometry.normalize(geometry.sub(entity.points[-1], entity.points[-2]))
+    return (0, 0)
+
+
+def _get_arc_direction(arc: dxf.Arc, angle: float) -> tuple[float, float]:
+    direction = (-math.sin(angle), math.cos(angle))
+    if arc.sweep_angle < 0:
+        return (-direction[0], -direction[1])
+    return direction
+
+
+def _get_start_carrier(entity) -> tuple:
+    # Line or circle supporting the start of an entity
+    if isinstance(entity, dxf.Arc):
+        return ("circle", entity.center, entity.radius)
+    return ("line", _get_start_point(entity), _get_start_direction(entity))
+
+
+def _get_end_carrier(entity) -> tuple:
+    # Line or circle supporting the end of an entity
+    if isinstance(entity, dxf.Arc):
+        return ("circle", entity.center, entity.radius)
+    return ("line", _get_end_point(entity), _get_end_direction(entity))
+
+
+def _set_start_point(entity, point: tuple[float, float]):
+    if isinstance(entity, dxf.Line):
+        entity.start = point
+    elif isinstance(entity, dxf.Arc):
+        delta = _wrap_angle(_get_angle(entity.center, point) - entity.start_angle)
+        entity.start_angle += delta
+        entity.sweep_angle -= delta
+    elif isinstance(entity, dxf.Polyline) and not entity.closed:
+        entity.points[0] = point
+
+
+def _set_end_point(entity, point: tuple[float, float]):
+    if isinstance(entity, dxf.Line):
+        entity.end = point
+    elif isinstance(entity, dxf.Arc):
+        entity.sweep_angle += _wrap_angle(
+            _get_angle(entity.center, point) - entity.end_angle
+        )
+    elif isinstance(entity, dxf.Polyline) and not entity.closed:
+        entity.points[-1] = point
+
+
+def _intersect_carriers(first: tuple, second: tuple) -> list[tuple[float, float]]:
+    if first[0] == "line" and second[0] == "line":
+        intersection = _intersect_lines(first[1], first[2], second[1], second[2])
+        return [intersection] if intersection else []
+
+    if first[0] == "circle" and second[0] == "circle":
+        return _intersect_circles(first[1], first[2], second[1], second[2])
+
+    line, circle = (first, second) if first[0] == "line" else (second, first)
+    return _intersect_line_circle(line[1], line[2], circle[1], circle[2])
+
+
+def _intersect_lines(
+    first_point, first_direction, second_point, second_direction
+) -> tuple[float, float]:
+    denominator = geometry.cross_2d(first_direction, second_direction)
+    if abs(denominator) < TANGENT_TOLERANCE:
+        return None
+    t = (
+        geometry.cross_2d(geometry.sub(second_point, first_point), second_direction)
+        / denominator
+    )
+    return _move(first_point, first_direction, t)
+
+
+def _intersect_line_circle(
+    point, direction, center, radius
+) -> list[tuple[float, float]]:
+    delta = geometry.sub(point, center)
+    b = geometry.dot(direction, delta)
+    discriminant = b * b - geometry.dot(delta, delta) + radius * radius
+    if discriminant < 0:
+        return []
+    root = math.sqrt(discriminant)
+    return [_move(point, direction, -b - root), _move(point, direction, -b + root)]
+
+
+def _intersect_circles(
+    first_center, first_radius, second_center, second_radius
+) -> list[tuple[float, float]]:
+    distance = math.dist(first_center, second_center)
+    if (
+        not distance
+        or distance > first_radius + second_radius
+        or distance < abs(first_radius - second_radius)
+    ):
+        return []
+
+    # Distance from the first center to the chord joining the intersections
+    a = (first_radius**2 - second_radius**2 + distance**2) / (2 * distance)
+    h = math.sqrt(max(first_radius**2 - a * a, 0))
+    direction = geometry.normalize(geometry.sub(second_center, first_center))
+    middle = _move(first_center, direction, a)
+    normal = (-direction[1], direction[0])
+    return [_move(middle, normal, h), _move(middle, normal, -h)]
+
+
+def _get_right_normal(start, end) -> tuple[float, float]:
+    direction = geometry.normalize(geometry.sub(end, start))
+    return (direction[1], -direction[0])
+
+
+def _get_angle(center, point) -> float:
+    return math.atan2(point[1] - center[1], point[0] - center[0])
+
+
+def _wrap_angle(angle: float) -> float:
+    # Wrap an angle in [-pi, pi)
+    return (angle + math.pi) % (2 * math.pi) - math.pi
+
+
+def _move(point, direction, distance: float) -> tuple[float, float]:
+    return (point[0] + direction[0] * distance, point[1] + direction[1] * distance)
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+
+from . import dxf
+
+# Name of the manifest file in the export folder.
+MANIFEST_FILENAME = "manifest.json"
+
+# Version of the manifest format, older manifests are ignored.
+MANIFEST_VERSION = 1
+
+# Number of decimals kept when hashing coordinates, so that numerical noise
+# between two runs does not change the hash.
+HASH_PRECISION = 6
+
+
+class Manifest:
+    """
+    Content hashes of the files written in an export folder.
+
+    The hashes of the previous export are loaded from the folder, the hashes
+    of the current export are recorded with `update` and saved with `save`.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.previous_files: dict = {}
+        self.files: dict = {}
+        self.changed_files: list[str] = []
+        # Files can be recorded from several threads
+        self._lock = threading.Lock()
+
+        file_path = os.path.join(folder, MANIFEST_FILENAME)
+        try:
+            with open(file_path, "r") as file:
+                data = json.load(file)
+            if data.get("version") == MANIFEST_VERSION:
+                self.previous_files = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    def update(self, file_name: str, content_hash: str) -> bool:
+        """
+        Record the hash of a file of the current export.
+
+        Returns True if the file has to be written because its content
+        changed or it is missing from the folder.
+        """
+
+        is_changed = self.previous_files.get(
+            file_name
+        ) != content_hash or not os.path.exists(os.path.join(self.folder, file_name))
+
+        with self._lock:
+            self.files[file_name] = content_hash
+            if is_changed:
+                self.changed_files.append(file_name)
+
+        return is_changed
+
+    def prune(self) -> list[str]:
+        """
+        Delete the files of the previous export that are not part of the current one.
+
+        Returns the names of the deleted files.
+        """
+
+        deleted_files = []
+        for file_name in self.previous_files:
+            if file_name in self.files:
+                continue
+
+            file_path = os.path.join(self.folder, file_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+                deleted_files.append(file_name)
+
+        return deleted_files
+
+    def keep_previous(self):
+        """
+        Keep the files of the previous export that are not part of the current one.
+
+        Used instead of `prune` when the export is not complete, the kept files
+        stay in the manifest so that a later export can still prune them.
+        """
+
+        for file_name, content_hash in self.previous_files.items():
+            if file_name not in self.files:
+                self.files[file_name] = content_hash
+
+    def save(self):
+        """
+        Write the hashes of the current export to the folder.
+        """
+
+        file_path = os.path.join(self.folder, MANIFEST_FILENAME)
+        with open(file_path, "w") as file:
+            json.dump(
+                {"version": MANIFEST_VERSION, "files": self.files},
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+def get_entities_hash(entities: list, *settings) -> str:
+    """
+    Get a hash of the geometry of entities and of the settings used to write them.
+    """
+
+    content_hash = hashlib.sha1(repr(settings).encode())
+    for entity in entities:
+        content_hash.update(repr(_get_entity_key(entity)).encode())
+    return content_hash.hexdigest()
+
+
+def get_hashes_hash(hashes: list[str], *settings) -> str:
+    """
+    Get a hash combining other hashes and settings.
+    """
+
+    content_hash = hashlib.sha1(repr(settings).encode())
+    for value in hashes:
+        content_hash.update(value.encode())
+    return content_hash.hexdigest()
+
+
+def _get_entity_key(entity) -> tuple:
+    def rounded(*values) -> tuple:
+        return tuple(round(value, HASH_PRECISION) + 0.0 for value in values)
+
+    if isinstance(entity, dxf.Line):
+        return ("LINE", rounded(*entity.start, *entity.end))
+
+    if isinstance(entity, dxf.Arc):
+        return (
+            "ARC",
+            rounded(
+                *entity.center, entity.radius, entity.start_angle, entity.sweep_angle
+            ),
+        )
+
+    if isinstance(entity, dxf.Circle):
+        return ("CIRCLE", rounded(*entity.center, entity.radius))
+
+    if isinstance(entity, dxf.Polyline):
+        return (
+            "POLYLINE",
+            entity.closed,
+            rounded(*(value for point in entity.points for value in point)),
+        )
+
+    return (type(entity).__name__,)
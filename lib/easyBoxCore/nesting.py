@@ -0,0 +1,211 @@
+import math
+
+
+class Placement:
+    """
+    Position of a rectangle on a sheet.
+
+    `x` and `y` are the bottom left corner of the rectangle once placed,
+    `width` and `height` are its size once placed (swapped when rotated).
+    """
+
+    def __init__(
+        self,
+        key,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        rotated: bool = False,
+    ):
+        self.key = key
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rotated = rotated
+
+
+class Sheet:
+    """
+    A sheet of stock packed with the MaxRects algorithm.
+
+    Free space is kept as a list of maximal free rectangles and each new
+    rectangle goes where it leaves the shortest side of a free rectangle
+    (best short side fit).
+    """
+
+    def __init__(self, width: float, height: float, spacing: float = 0):
+        self.width = width
+        self.height = height
+        self.spacing = spacing
+        self.placements: list[Placement] = []
+        # Packed area, updated on each insert
+        self.used_area = 0
+        # Rectangles are inflated by the spacing, so is the sheet to allow
+        # parts to touch its borders
+        self._free_rectangles = [(0, 0, width + spacing, height + spacing)]
+
+    @property
+    def utilization(self) -> float:
+        return self.used_area / (self.width * self.height)
+
+    def insert(
+        self, key, width: float, height: float, allow_rotation: bool = True
+    ) -> Placement:
+        """
+        Place a rectangle on the sheet.
+
+        Returns None if the rectangle does not fit.
+        """
+
+        best = None
+        best_score = (math.inf, math.inf)
+        orientations = [(width, height, False)]
+        if allow_rotation and width != height:
+            orientations.append((height, width, True))
+
+        for free_x, free_y, free_width, free_height in self._free_rectangles:
+            for placed_width, placed_height, rotated in orientations:
+                inflated_width = placed_width + self.spacing
+                inflated_height = placed_height + self.spacing
+                if inflated_width > free_width or inflated_height > free_height:
+                    continue
+
+                leftover_x = free_width - inflated_width
+                leftover_y = free_height - inflated_height
+                score = (min(leftover_x, leftover_y), max(leftover_x, leftover_y))
+                if score < best_score:
+                    best_score = score
+                    best = Placement(
+                        key, free_x, free_y, placed_width, placed_height, rotated
+                    )
+
+        if best:
+            self._split_free_rectangles(
+                (
+                    best.x,
+                    best.y,
+                    best.width + self.spacing,
+                    best.height + self.spacing,
+                )
+            )
+            self.placements.append(best)
+            self.used_area += best.width * best.height
+
+        return best
+
+    def _split_free_rectangles(self, used: tuple[float, float, float, float]):
+        used_x, used_y, used_width, used_height = used
+        used_right, used_top = used_x + used_width, used_y + used_height
+
+        free_rectangles = []
+        for free in self._free_rectangles:
+            free_x, free_y, free_width, free_height = free
+            free_right, free_top = free_x + free_width, free_y + free_height
+
+            # Keep free rectangles that do not intersect the used one
+            if (
+                used_x >= free_right
+                or used_right <= free_x
+                or used_y >= free_top
+                or used_top <= free_y
+            ):
+                free_rectangles.append(free)
+                continue
+
+            # Split the free rectangle around the used one
+            if used_x > free_x:
+                free_rectangles.append((free_x, free_y, used_x - free_x, free_height))
+            if used_right < free_right:
+                free_rectangles.append(
+                    (used_right, free_y, free_right - used_right, free_height)
+                )
+            if used_y > free_y:
+                free_rectangles.append((free_x, free_y, free_width, used_y - free_y))
+            if used_top < free_top:
+                free_rectangles.append(
+                    (free_x, used_top, free_width, free_top - used_top)
+                )
+
+        # Remove free rectangles contained in another one
+        self._free_rectangles = [
+            rectangle
+            for i, rectangle in enumerate(free_rectangles)
+            if not any(
+                i != j and _contains(other, rectangle) and (other != rectangle or j < i)
+                for j, other in enumerate(free_rectangles)
+            )
+        ]
+
+
+def pack(
+    rectangles: list[tuple],
+    sheet_width: float,
+    sheet_height: float,
+    spacing: float = 0,
+    allow_rotation: bool = True,
+) -> list[Sheet]:
+    """
+    Pack rectangles on as few sheets as possible.
+
+    `rectangles` is a list of (key, width, height) tuples. Rectangles are
+    placed from the largest to the smallest on the first sheet they fit in.
+    A rectangle larger than a sheet gets its own sheet, sized to fit it.
+    """
+
+    ordered_rectangles = sorted(
+        rectangles,
+        key=lambda rectangle: (max(rectangle[1:]), min(rectangle[1:])),
+        reverse=True,
+    )
+    return pack_in_order(
+        ordered_rectangles, sheet_width, sheet_height, spacing, allow_rotation
+    )
+
+
+def pack_in_order(
+    rectangles: list[tuple],
+    sheet_width: float,
+    sheet_height: float,
+    spacing: float = 0,
+    allow_rotation: bool = True,
+) -> list[Sheet]:
+    """
+    Pack rectangles on sheets in the given order.
+    """
+
+    sheets: list[Sheet] = []
+    for key, width, height in rectangles:
+        for sheet in sheets:
+            if sheet.insert(key, width, height, allow_rotation):
+                break
+        else:
+            sheet = Sheet(sheet_width, sheet_height, spacing)
+            if not sheet.insert(key, width, height, allow_rotation):
+                # Oversize rectangle, use a sheet of its size
+                sheet = Sheet(width, height, spacing)
+                sheet.insert(key, width, height, False)
+            sheets.append(sheet)
+
+    return sheets
+
+
+def get_utilization(sheets: list[Sheet]) -> float:
+    """
+    Get the overall utilization of a list of sheets.
+    """
+
+    total_area = sum(sheet.width * sheet.height for sheet in sheets)
+    if not total_area:
+        return 0
+    return sum(sheet.used_area for sheet in sheets) / total_area
+
+
+def _contains(outer: tuple, inner: tuple) -> bool:
+    return (
+        inner[0] >= outer[0]
+        and inner[1] >= outer[1]
+        and inner[0] + inner[2] <= outer[0] + outer[2]
+        and inner[1] + inner[3] <= outer[1] + outer[3]
+    )
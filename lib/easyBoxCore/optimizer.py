@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from . import nesting
+
+# Orders tried before the random ones, as sort keys of (key, width, height).
+ORDERINGS = [
+    lambda rectangle: (max(rectangle[1:]), min(rectangle[1:])),
+    lambda rectangle: rectangle[1] * rectangle[2],
+    lambda rectangle: rectangle[1] + rectangle[2],
+    lambda rectangle: rectangle[1],
+    lambda rectangle: rectangle[2],
+]
+
+
+def optimize(
+    rectangles: list[tuple],
+    sheet_width: float,
+    sheet_height: float,
+    spacing: float = 0,
+    allow_rotation: bool = True,
+    time_budget: float = 5,
+    processes: int = None,
+    seed: int = 0,
+) -> list[nesting.Sheet]:
+    """
+    Pack rectangles on sheets, trying many orders until the time budget is spent.
+
+    Attempts are spread over a pool of processes, each process shuffles the
+    best order it found so far. The best layout uses the fewest sheets and
+    leaves the emptiest last sheet. Falls back to a single process when no
+    Python executable can be used to start workers.
+    """
+
+    settings = (sheet_width, sheet_height, spacing, allow_rotation)
+    deadline = time.time() + time_budget
+    processes = processes or max(1, (os.cpu_count() or 1) - 1)
+
+    python_executable = get_python_executable()
+    if processes == 1 or not python_executable:
+        results = [_run_attempts(rectangles, settings, deadline, seed)]
+    else:
+        # Workers are started from scratch and import this module by its name,
+        # they copy the path when the pool starts them so the shared
+        # interpreter of Fusion only sees it while the pool is created
+        import_root = _get_import_root()
+        is_import_root_added = import_root not in sys.path
+        if is_import_root_added:
+            sys.path.append(import_root)
+
+        context = multiprocessing.get_context("spawn")
+        context.set_executable(python_executable)
+        try:
+            pool = context.Pool(processes)
+        finally:
+            if is_import_root_added:
+                sys.path.remove(import_root)
+
+        with pool:
+            results = pool.starmap(
+                _run_attempts,
+                [
+                    (rectangles, settings, deadline, seed + index)
+                    for index in range(processes)
+                ],
+            )
+
+    _, best_order = min(results, key=lambda result: result[0])
+    return nesting.pack_in_order(best_order, *settings)
+
+
+def get_python_executable() -> str:
+    """
+    Get a Python executable able to run worker processes.
+
+    Inside Fusion `sys.executable` is the Fusion application, the Python
+    executable is then looked up in the Python installation.
+    Returns None if no executable is found.
+    """
+
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+
+    for relative_path in ["python.exe", os.path.join("bin", "python3")]:
+        path = os.path.join(sys.prefix, relative_path)
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+def get_score(sheets: list[nesting.Sheet]) -> tuple[int, float]:
+    """
+    Get the score of a layout, lower is better.
+    """
+
+    return (len(sheets), min(sheet.used_area for sheet in sheets))
+
+
+def _run_attempts(
+    rectangles: list[tuple], settings: tuple, deadline: float, seed: int
+) -> tuple[tuple, list[tuple]]:
+    generator = random.Random(seed)
+
+    # Start with the deterministic orders
+    best_score, best_order = None, None
+    for ordering in ORDERINGS:
+        order = sorted(rectangles, key=ordering, reverse=True)
+        score = get_score(nesting.pack_in_order(order, *settings))
+        if best_score is None or score < best_score:
+            best_score, best_order = score, order
+
+    # Then swap a few rectangles of the best order until the deadline
+    while time.time() < deadline and len(rectangles) > 1:
+        order = list(best_order)
+        for _ in range(generator.randint(1, 3)):
+            i, j = generator.sample(range(len(order)), 2)
+            order[i], order[j] = order[j], order[i]
+
+        score = get_score(nesting.pack_in_order(order, *settings))
+        if score < best_score:
+            best_score, best_order = score, order
+
+    return best_score, best_order
+
+
+def _get_import_root() -> str:
+    # Walk up one folder per package level of the module name
+    root = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(__name__.count(".")):
+        root = os.path.dirname(root)
+    return root
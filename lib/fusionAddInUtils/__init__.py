@@ -1,2 +1,9 @@
+from .logging_utils import *
 from .general_utils import *
 from .event_utils import *
+from .profiling_utils import *
+from .timing_utils import *
+from .cache_utils import *
+from .job_utils import *
+from .geometry_utils import *
+from .command_utils import *
@@ -0,0 +1,213 @@
+from typing import Callable
+
+import adsk.core
+import adsk.fusion
+from .event_utils import add_handler, set_event_started_callback
+from .logging_utils import LogLevel, log
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Version of the active design, increased each time a change is found
+_design_version = 0
+
+# Cheap description of the active design the last time it was checked
+_design_state: tuple = None
+
+# True when the design state was checked during the current event
+_is_state_checked = False
+
+# True when the events signaling a change of the design are listened to,
+# otherwise the design state is checked on each access
+_is_watching = False
+
+# Registered caches by name
+_caches: dict[str, "VersionedCache"] = {}
+
+# Commands of Fusion that only change the selection
+SELECTION_COMMAND_IDS = ["SelectCommand"]
+
+# Commands whose termination does not change the design
+_read_only_command_ids: set[str] = set(SELECTION_COMMAND_IDS)
+
+
+class VersionedCache:
+    """
+    Values computed from the active design, dropped when the design changes.
+
+    Values are kept for the version of the design they were computed for, the
+    first access after a change of the design clears the cache.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.version: int = None
+        self.values: dict = {}
+
+    def get(self, key, compute: Callable, is_cacheable: Callable = None):
+        """
+        Get the value of a key, computed by `compute` if it is not cached yet.
+
+        A computed value for which `is_cacheable` returns False, such as a
+        failed result, is returned without being cached.
+        """
+
+        version = get_design_version()
+        if version != self.version:
+            if self.values:
+                log(
+                    "%s cache cleared, %d values dropped",
+                    self.name,
+                    len(self.values),
+                    level=LogLevel.Debug,
+                )
+            self.values.clear()
+            self.version = version
+
+        if key in self.values:
+            return self.values[key]
+
+        value = compute()
+        if is_cacheable is None or is_cacheable(value):
+            self.values[key] = value
+        return value
+
+    def clear(self):
+        """
+        Drop all the values.
+        """
+
+        self.values.clear()
+        self.version = None
+
+
+def get_cache(name: str) -> VersionedCache:
+    """
+    Get the cache registered with a name, registering it on first use.
+
+    Commands get their caches by name so that a reloaded command module
+    finds its cache again.
+    """
+
+    if name not in _caches:
+        _caches[name] = VersionedCache(name)
+    return _caches[name]
+
+
+def get_design_version() -> int:
+    """
+    Get the version of the active design, increased each time it changes.
+
+    Changes are signaled by the document and command events of the API.
+    Changes without a signal, such as moving the timeline marker, are found
+    by comparing a cheap description of the design once per event, selection
+    events excepted.
+    """
+
+    global _design_version, _design_state, _is_state_checked
+
+    if not (_is_watching and _is_state_checked):
+        _is_state_checked = True
+        state = _get_design_state()
+        if state != _design_state:
+            _design_state = state
+            _design_version += 1
+
+    return _design_version
+
+
+def invalidate_caches():
+    """
+    Drop the values of all the caches, after a change of the design made by the add-in.
+    """
+
+    global _design_version
+    _design_version += 1
+
+
+def add_read_only_command(command_id: str):
+    """
+    Keep the values of the caches when a command that does not change the design terminates.
+    """
+
+    _read_only_command_ids.add(command_id)
+
+
+def start_design_watch():
+    """
+    Listen to the API events that signal a change of the active design.
+    """
+
+    # Another document is now the active one
+    add_handler(app.documentActivated, _on_design_changed)
+
+    # Any other command, including undo and redo, may have changed the design
+    add_handler(ui.commandTerminated, _on_command_terminated)
+
+    # Check the design state again at the start of each event
+    set_event_started_callback(_on_event_started)
+
+    global _is_watching
+    _is_watching = True
+
+
+def stop_design_watch():
+    """
+    Stop checking the design, and drop the values of all the caches.
+    """
+
+    global _is_watching
+    _is_watching = False
+
+    set_event_started_callback(None)
+    for cache in _caches.values():
+        cache.clear()
+
+
+def _on_design_changed(args: adsk.core.EventArgs):
+    invalidate_caches()
+
+
+def _on_command_terminated(args: adsk.core.ApplicationCommandEventArgs):
+    # Cancelled commands roll their changes back
+    if (
+        args.terminationReason
+        != adsk.core.CommandTerminationReason.CompletedTerminationReason
+    ):
+        return
+
+    if args.commandId not in _read_only_command_ids:
+        invalidate_caches()
+
+
+def _on_event_started(args: adsk.core.EventArgs):
+    global _is_state_checked
+
+    # The design does not change while entities are hovered or selected, the
+    # frequent selection events keep the last check
+    if isinstance(args, adsk.core.SelectionEventArgs):
+        return
+
+    _is_state_checked = False
+
+
+def _get_design_state() -> tuple:
+    design = adsk.fusion.Design.cast(app.activeProduct)
+    if not design:
+        return None
+
+    # Counts of the root component only, the counts of the whole assembly
+    # would walk all of its components
+    root_component = design.rootComponent
+    state = (
+        root_component.id,
+        root_component.occurrences.count,
+        root_component.bRepBodies.count,
+    )
+
+    # Direct modeling designs have no timeline
+    if design.designType == adsk.fusion.DesignTypes.ParametricDesignType:
+        timeline = design.timeline
+        state += (timeline.markerPosition, timeline.count)
+
+    return state
@@ -0,0 +1,125 @@
+import importlib
+import os
+from types import ModuleType
+from typing import Callable
+
+import adsk.core
+from .event_utils import add_handler
+from .logging_utils import LogLevel, log
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Name of the module of a command package that implements the command
+COMMAND_ENTRY_MODULE = "entry"
+
+
+class LazyCommand:
+    """
+    Button of a command whose module is only imported when the command is first run.
+
+    The command package holds the static metadata of the button: CMD_ID,
+    CMD_NAME, CMD_Description, ICON_FOLDER, TOOLCLIP_FILENAME, WORKSPACE_ID,
+    PANEL_ID, COMMAND_BESIDE_ID, IS_BEFORE and IS_PROMOTED. Its entry module
+    implements `command_created`, and optionally `start` and `stop` which are
+    called when the module is loaded and when the add-in is stopped.
+    """
+
+    def __init__(self, package: ModuleType):
+        self.package = package
+        self.module: ModuleType = None
+
+    def start(self):
+        """
+        Create the button of the command, without importing the command module.
+        """
+
+        package = self.package
+
+        # Create a command Definition.
+        cmd_def = ui.commandDefinitions.addButtonDefinition(
+            package.CMD_ID,
+            package.CMD_NAME,
+            package.CMD_Description,
+            package.ICON_FOLDER,
+        )
+        if package.TOOLCLIP_FILENAME:
+            cmd_def.toolClipFilename = os.path.join(
+                package.ICON_FOLDER, package.TOOLCLIP_FILENAME
+            )
+
+        # Define an event handler for the command created event. It will be called when the button is clicked.
+        add_handler(cmd_def.commandCreated, self.get_command_created_handler())
+
+        # ******** Add a button into the UI so the user can run the command. ********
+        # Get the target workspace the button will be created in.
+        workspace = ui.workspaces.itemById(package.WORKSPACE_ID)
+
+        # Get the panel the button will be created in.
+        panel = workspace.toolbarPanels.itemById(package.PANEL_ID)
+
+        # Create the button command control in the UI after the specified existing command.
+        control = panel.controls.addCommand(
+            cmd_def, package.COMMAND_BESIDE_ID, package.IS_BEFORE
+        )
+
+        # Specify if the command is promoted to the main toolbar.
+        control.isPromoted = package.IS_PROMOTED
+
+    def stop(self):
+        """
+        Remove the button of the command, and stop the command module if it was loaded.
+        """
+
+        package = self.package
+
+        # Get the various UI elements for this command
+        workspace = ui.workspaces.itemById(package.WORKSPACE_ID)
+        panel = workspace.toolbarPanels.itemById(package.PANEL_ID)
+        command_control = panel.controls.itemById(package.CMD_ID)
+        command_definition = ui.commandDefinitions.itemById(package.CMD_ID)
+
+        # Delete the button command control
+        if command_control:
+            command_control.deleteMe()
+
+        # Delete the command definition
+        if command_definition:
+            command_definition.deleteMe()
+
+        if self.module and hasattr(self.module, "stop"):
+            self.module.stop()
+        self.module = None
+
+    def load(self) -> ModuleType:
+        """
+        Import the command module on first use, and start it.
+        """
+
+        if not self.module:
+            log(
+                "%s Loading command module", self.package.CMD_NAME, level=LogLevel.Debug
+            )
+            module = importlib.import_module(
+                f".{COMMAND_ENTRY_MODULE}", self.package.__name__
+            )
+            if hasattr(module, "start"):
+                module.start()
+            self.module = module
+        return self.module
+
+    def get_command_created_handler(self) -> Callable:
+        """
+        Get a handler forwarding the command created event to the command module.
+
+        The handler is named after the `command_created` function of the command
+        module, so that its API profile and latencies are reported with the
+        other handlers of the command.
+        """
+
+        def command_created(args: adsk.core.CommandCreatedEventArgs):
+            self.load().command_created(args)
+
+        command_created.__module__ = f"{self.package.__name__}.{COMMAND_ENTRY_MODULE}"
+        command_created.__qualname__ = command_created.__name__
+        return command_created
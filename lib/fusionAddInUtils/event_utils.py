@@ -9,16 +9,26 @@
 #  AUTODESK, INC. DOES NOT WARRANT THAT THE OPERATION OF THE PROGRAM WILL BE
 #  UNINTERRUPTED OR ERROR FREE.
 
+import functools
 import sys
 from typing import Callable
 
 import adsk.core
 from .general_utils import handle_error
-
+from .profiling_utils import (
+    PROFILE_API,
+    get_handler_name,
+    profile_handler,
+    unwrap_api_object,
+)
+from .timing_utils import TIME_EVENTS, get_latency_histogram, time_handler
 
 # Global Variable to hold Event Handlers
 _handlers = []
 
+# Function called before each event is handled, if any
+_event_started_callback: Callable = None
+
 
 def add_handler(
     event: adsk.core.Event,
@@ -46,6 +56,8 @@ def add_handler(
     :returns:
         The event handler that was created.  You don't often need this reference, but it can be useful in some cases.
     """
+    # Events reached from profiled event arguments are wrapped
+    event = unwrap_api_object(event)
     module = sys.modules[event.__module__]
     handler_type = module.__dict__[event.add.__annotations__["handler"]]
     handler = _create_handler(handler_type, callback, event, name, local_handlers)
@@ -59,6 +71,17 @@ def clear_handlers():
     _handlers = []
 
 
+def set_event_started_callback(callback: Callable):
+    """Sets a function called before each event is handled.
+
+    Arguments:
+    callback -- The function, called with the arguments of the event,
+                or None to remove it.
+    """
+    global _event_started_callback
+    _event_started_callback = callback
+
+
 def _create_handler(
     handler_type,
     callback: Callable,
@@ -74,13 +97,22 @@ def _create_handler(
 def _define_handler(handler_type, callback, name: str = None):
     name = name or handler_type.__name__
 
+    # Wrap the callback once here, so that disabled tools cost nothing per event
+    run = callback
+    if PROFILE_API:
+        run = functools.partial(profile_handler, get_handler_name(callback), run)
+    if TIME_EVENTS:
+        run = functools.partial(time_handler, get_latency_histogram(callback), run)
+
     class Handler(handler_type):
         def __init__(self):
             super().__init__()
 
         def notify(self, args):
             try:
-                callback(args)
+                if _event_started_callback:
+                    _event_started_callback(args)
+                run(args)
             except:
                 handle_error(name)
 
@@ -12,44 +12,11 @@
 import os
 import traceback
 import adsk.core
+from .logging_utils import LogLevel, log
 
 app = adsk.core.Application.get()
 ui = app.userInterface
 
-# Attempt to read DEBUG flag from parent config.
-try:
-    from ... import config
-
-    DEBUG = config.DEBUG
-except:
-    DEBUG = False
-
-
-def log(
-    message: str,
-    level: adsk.core.LogLevels = adsk.core.LogLevels.InfoLogLevel,
-    force_console: bool = False,
-):
-    """Utility function to easily handle logging in your app.
-
-    Arguments:
-    message -- The message to log.
-    level -- The logging severity level.
-    force_console -- Forces the message to be written to the Text Command window.
-    """
-    # Always print to console, only seen through IDE.
-    print(message)
-
-    # Log all errors to Fusion log file.
-    if level == adsk.core.LogLevels.ErrorLogLevel:
-        log_type = adsk.core.LogTypes.FileLogType
-        app.log(message, level, log_type)
-
-    # If config.DEBUG is True write all log messages to the console.
-    if DEBUG or force_console:
-        log_type = adsk.core.LogTypes.ConsoleLogType
-        app.log(message, level, log_type)
-
 
 def handle_error(name: str, show_message_box: bool = False):
     """Utility function to simplify error handling.
@@ -61,8 +28,7 @@ def handle_error(name: str, show_message_box: bool = False):
                         and logged to the log file.
     """
 
-    log("===== Error =====", adsk.core.LogLevels.ErrorLogLevel)
-    log(f"{name}\n{traceback.format_exc()}", adsk.core.LogLevels.ErrorLogLevel)
+    log("===== Error =====\n%s\n%s", name, traceback.format_exc(), level=LogLevel.Error)
 
     # If desired you could show an error as a message box.
     if show_message_box:
@@ -83,5 +49,5 @@ def msg_box(
     buttons -- The buttons to display. Default to OK.
     icon -- The icon to display. Default to none.
     """
-    log(f"{title} {message}", adsk.core.LogLevels.InfoLogLevel, True)
+    log("%s %s", title, message, force_console=True)
     return ui.messageBox(message, title, buttons, icon)
@@ -0,0 +1,51 @@
+import adsk.core
+import adsk.fusion
+from ..easyBoxCore import geometry
+
+
+def get_point(point: adsk.core.Point3D) -> tuple[float, float, float]:
+    """Get the coordinates of a point or of a vector of the API.
+
+    Arguments:
+    point -- A Point3D or a Vector3D.
+    """
+    return tuple(point.asArray())
+
+
+def get_points(points: list[adsk.core.Point3D]) -> list[tuple[float, float, float]]:
+    """Get the coordinates of a list of points or vectors of the API."""
+    return [tuple(point.asArray()) for point in points]
+
+
+def create_point3d(point: tuple[float, float, float]) -> adsk.core.Point3D:
+    """Create a point of the API from its coordinates."""
+    return adsk.core.Point3D.create(*point)
+
+
+def create_vector3d(vector: tuple[float, float, float]) -> adsk.core.Vector3D:
+    """Create a vector of the API from its coordinates."""
+    return adsk.core.Vector3D.create(*vector)
+
+
+def create_matrix3d(matrix: list[float]) -> adsk.core.Matrix3D:
+    """Create a matrix of the API from its 16 values, row by row."""
+    matrix3d = adsk.core.Matrix3D.create()
+    matrix3d.setWithArray(matrix)
+    return matrix3d
+
+
+def get_face_plane(face: adsk.fusion.BRepFace) -> geometry.Plane:
+    """Get the plane of a face through a point on the face, facing outside of its body.
+
+    Arguments:
+    face -- The face, its normal is evaluated at that point so that curved
+            faces get their tangent plane.
+    """
+    point = face.pointOnFace
+    _, normal = face.evaluator.getNormalAtPoint(point)
+    return geometry.Plane(tuple(point.asArray()), tuple(normal.asArray()))
+
+
+def get_face_planes(faces: list[adsk.fusion.BRepFace]) -> list[geometry.Plane]:
+    """Get the plane of each face of a list, see get_face_plane."""
+    return [get_face_plane(face) for face in faces]
@@ -0,0 +1,178 @@
+import time
+from typing import Callable
+
+import adsk.core
+from .cache_utils import invalidate_caches
+from .event_utils import add_handler
+from .general_utils import handle_error
+from .logging_utils import LogLevel, log
+
+# Attempt to read ADDIN_NAME from parent config.
+try:
+    from ... import config
+
+    ADDIN_NAME = config.ADDIN_NAME
+except:
+    ADDIN_NAME = "AddIn"
+
+app = adsk.core.Application.get()
+ui = app.userInterface
+
+# Id of the custom event running the units of the queued jobs
+JOB_EVENT_ID = f"{ADDIN_NAME}_job_queue"
+
+# Time spent running units in one event before letting Fusion handle the
+# user interface again, in seconds. A unit is never split, so a slow unit
+# runs alone in its event.
+JOB_SLICE_DURATION = 0.1
+
+# Jobs waiting to run, the first one is running
+_jobs: list["Job"] = []
+
+# True when the custom event of the queue is registered
+_is_registered = False
+
+
+class Job:
+    """
+    An operation sliced into units, run one after the other between the events
+    of the user interface.
+
+    Each unit is a function called without arguments, a unit returning False
+    is counted as failed and the next units still run. `on_done` is called
+    with the job once all the units ran, `on_cancel` when the user cancelled
+    it or when a unit raised an error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        units: list[Callable],
+        message: str = "%v/%m",
+        on_done: Callable = None,
+        on_cancel: Callable = None,
+    ):
+        self.name = name
+        self.units = units
+        # Message of the progress dialog, see ProgressDialog.show
+        self.message = message
+        self.on_done = on_done
+        self.on_cancel = on_cancel
+        # Index of the next unit to run
+        self.index = 0
+        self.failed_count = 0
+        self.progress_dialog: adsk.core.ProgressDialog = None
+        # Design the units were created for
+        self.product = None
+
+
+def queue_job(job: Job):
+    """
+    Queue a job, it starts once the jobs queued before it are done.
+
+    The units of the job run on the design active when it is queued, the job
+    is cancelled if another design is activated in the meantime.
+    """
+
+    global _is_registered
+
+    # Register the event on first use, most sessions never queue a job
+    if not _is_registered:
+        job_event = app.registerCustomEvent(JOB_EVENT_ID)
+        add_handler(job_event, _run_job_units, name="job queue")
+        _is_registered = True
+
+    job.product = app.activeProduct
+    _jobs.append(job)
+    log("%s job queued with %d units", job.name, len(job.units), level=LogLevel.Debug)
+
+    if len(_jobs) == 1:
+        app.fireCustomEvent(JOB_EVENT_ID)
+
+
+def get_queued_jobs() -> list[Job]:
+    """
+    Get the jobs not done yet, the first one is running.
+    """
+
+    return list(_jobs)
+
+
+def stop_job_queue():
+    """
+    Drop the queued jobs without running their remaining units.
+    """
+
+    global _is_registered
+
+    for job in _jobs:
+        if job.progress_dialog:
+            job.progress_dialog.hide()
+        log("%s job dropped after %d units", job.name, job.index)
+    _jobs.clear()
+
+    if _is_registered:
+        app.unregisterCustomEvent(JOB_EVENT_ID)
+        _is_registered = False
+
+
+def _run_job_units(args: adsk.core.CustomEventArgs):
+    if not _jobs:
+        return
+
+    job = _jobs[0]
+    if not job.progress_dialog:
+        job.progress_dialog = ui.createProgressDialog()
+        job.progress_dialog.isCancelButtonShown = True
+        job.progress_dialog.show(job.name, job.message, 0, len(job.units))
+
+    # The units can only run on the design they were created for
+    if job.progress_dialog.wasCancelled or app.activeProduct != job.product:
+        log("%s job cancelled after %d units", job.name, job.index)
+        _end_job(job, job.on_cancel)
+        return
+
+    # Run units until the slice is spent, at least one
+    end_time = time.perf_counter() + JOB_SLICE_DURATION
+    is_failed = False
+    try:
+        while job.index < len(job.units):
+            if job.units[job.index]() is False:
+                job.failed_count += 1
+            job.index += 1
+            if time.perf_counter() > end_time:
+                break
+    except:
+        handle_error(f"{job.name} job")
+        is_failed = True
+
+    # The add-in changed the design without any command
+    invalidate_caches()
+
+    # Stop the job at the first error, the next units may depend on the failed one
+    if is_failed:
+        _end_job(job, job.on_cancel)
+        return
+
+    job.progress_dialog.progressValue = job.index
+    if job.index == len(job.units):
+        _end_job(job, job.on_done)
+        return
+
+    # Let Fusion handle its events before running the next units
+    app.fireCustomEvent(JOB_EVENT_ID)
+
+
+def _end_job(job: Job, callback: Callable):
+    job.progress_dialog.hide()
+    _jobs.remove(job)
+
+    try:
+        if callback:
+            callback(job)
+    except:
+        handle_error(f"{job.name} job")
+
+    # Start the next job
+    if _jobs:
+        app.fireCustomEvent(JOB_EVENT_ID)
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import adsk.core
+
+app = adsk.core.Application.get()
+
+# Attempt to read DEBUG flag from parent config.
+try:
+    from ... import config
+
+    DEBUG = config.DEBUG
+except:
+    DEBUG = False
+
+
+class LogLevel:
+    """
+    Severity of a log message.
+    """
+
+    def __init__(self):
+        pass
+
+    Debug = 10
+    Info = 20
+    Warning = 30
+    Error = 40
+
+
+# Fusion log level of each level
+FUSION_LOG_LEVELS = {
+    LogLevel.Debug: adsk.core.LogLevels.InfoLogLevel,
+    LogLevel.Info: adsk.core.LogLevels.InfoLogLevel,
+    LogLevel.Warning: adsk.core.LogLevels.WarningLogLevel,
+    LogLevel.Error: adsk.core.LogLevels.ErrorLogLevel,
+}
+
+# Name of each level in the log file
+LOG_LEVEL_NAMES = {
+    LogLevel.Debug: "DEBUG",
+    LogLevel.Info: "INFO",
+    LogLevel.Warning: "WARNING",
+    LogLevel.Error: "ERROR",
+}
+
+# Messages below this level are dropped before being formatted, so that they
+# cost nothing in production
+LOG_LEVEL = LogLevel.Debug if DEBUG else LogLevel.Warning
+
+# Number of messages buffered before they are written to the Fusion log file
+LOG_BUFFER_SIZE = 100
+
+# Minimum time in seconds between two rate limited messages of the same format
+LOG_RATE_LIMIT_INTERVAL = 1.0
+
+# Messages waiting to be written to the Fusion log file, flushed once they are
+# LOG_BUFFER_SIZE and at once on errors. Not bounded so that the messages of
+# other threads logged before the flush are not lost.
+_buffer: list[tuple[int, str]] = []
+_buffer_lock = threading.Lock()
+
+# Time of the last message and number of skipped messages by rate limited format
+_last_times: dict[str, float] = {}
+_skipped_counts: dict[str, int] = {}
+
+
+def log(
+    message,
+    *args,
+    level: int = LogLevel.Info,
+    force_console: bool = False,
+    rate_limited: bool = False,
+):
+    """Log a message to the Fusion log file, and to the Text Command window in debug mode.
+
+    Arguments:
+    message -- The message, a format string for the arguments with the `%` operator,
+               or a function returning the message. It is only formatted when
+               the message is logged.
+    args -- The arguments of the format string.
+    level -- The severity level, messages below `LOG_LEVEL` are dropped.
+    force_console -- Forces the message to be written to the Text Command window.
+    rate_limited -- Logs the message at most once per `LOG_RATE_LIMIT_INTERVAL`
+                    seconds for each format, for handlers of frequent events.
+    """
+    if level < LOG_LEVEL and not force_console:
+        return
+
+    suffix = ""
+    if rate_limited:
+        key = message if isinstance(message, str) else message.__qualname__
+        now = time.monotonic()
+        if (
+            now - _last_times.get(key, -LOG_RATE_LIMIT_INTERVAL)
+            < LOG_RATE_LIMIT_INTERVAL
+        ):
+            _skipped_counts[key] = _skipped_counts.get(key, 0) + 1
+            return
+        _last_times[key] = now
+        skipped_count = _skipped_counts.pop(key, 0)
+        if skipped_count:
+            suffix = f" ({skipped_count} similar messages skipped)"
+
+    if callable(message):
+        message = message()
+    elif args:
+        message = message % args
+    message = f"{message}{suffix}"
+
+    # Print to the console of the IDE while debugging
+    if DEBUG:
+        print(message)
+
+    # If config.DEBUG is True write all log messages to the Text Command window.
+    if DEBUG or force_console:
+        app.log(message, FUSION_LOG_LEVELS[level], adsk.core.LogTypes.ConsoleLogType)
+
+    with _buffer_lock:
+        _buffer.append((level, f"[{LOG_LEVEL_NAMES[level]}] {message}"))
+        is_full = len(_buffer) >= LOG_BUFFER_SIZE
+
+    # Write errors at once with the messages that lead to them
+    if is_full or level >= LogLevel.Error:
+        flush_log()
+
+
+def flush_log():
+    """Write the buffered messages to the Fusion log file in a single call."""
+    with _buffer_lock:
+        if not _buffer:
+            return
+        level = max(level for level, _ in _buffer)
+        messages = "\n".join(message for _, message in _buffer)
+        _buffer.clear()
+
+    app.log(messages, FUSION_LOG_LEVELS[level], adsk.core.LogTypes.FileLogType)
@@ -0,0 +1,223 @@
+import time
+from typing import Callable
+
+import adsk.core
+from .logging_utils import log
+
+# Attempt to read PROFILE_API flag from parent config.
+try:
+    from ... import config
+
+    PROFILE_API = config.PROFILE_API
+except:
+    PROFILE_API = False
+
+# Number of API attributes listed for each handler in the report
+PROFILE_REPORT_LIMIT = 20
+
+# Attributes of the API objects that hold their native object
+SWIG_ATTRIBUTES = ("this", "thisown")
+
+# Stack of the names of the handlers being run, the last one is the current one
+_handler_names: list[str] = []
+
+# Number of calls and cumulative time by handler name
+_handler_records: dict[str, list] = {}
+
+# Number of calls and cumulative time by handler name and API attribute
+_attribute_records: dict[tuple[str, str], list] = {}
+
+
+class ApiProxy:
+    """
+    Wrapper of an API object that records the use of its attributes.
+
+    The time and the number of uses of each attribute are recorded for the
+    handler being run. Objects returned by the API are wrapped too, and
+    wrapped objects are unwrapped before being given back to the API.
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target: adsk.core.Base):
+        object.__setattr__(self, "_target", target)
+
+    @property
+    def __class__(self):
+        # Keep isinstance working on the wrapped object
+        return type(self._target)
+
+    def __getattr__(self, name: str):
+        target = self._target
+
+        # The API finds the native object of a wrapped object through its
+        # `this` attribute, so wrapped objects can be given to unwrapped ones
+        if name in SWIG_ATTRIBUTES or name.startswith("_"):
+            return getattr(target, name)
+
+        key = f"{type(target).__name__}.{name}"
+
+        start_time = time.perf_counter()
+        value = getattr(target, name)
+
+        if callable(value) and not isinstance(value, adsk.core.Base):
+
+            def call(*args, **kwargs):
+                start_time = time.perf_counter()
+                result = value(
+                    *unwrap_api_object(args),
+                    **{k: unwrap_api_object(v) for k, v in kwargs.items()},
+                )
+                _record_attribute(key, time.perf_counter() - start_time)
+                return wrap_api_object(result)
+
+            return call
+
+        _record_attribute(key, time.perf_counter() - start_time)
+        return wrap_api_object(value)
+
+    def __setattr__(self, name: str, value):
+        target = self._target
+        start_time = time.perf_counter()
+        setattr(target, name, unwrap_api_object(value))
+        _record_attribute(
+            f"{type(target).__name__}.{name}", time.perf_counter() - start_time
+        )
+
+    def __iter__(self):
+        target = self._target
+        key = f"{type(target).__name__}.__iter__"
+
+        iterator = iter(target)
+        while True:
+            start_time = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            _record_attribute(key, time.perf_counter() - start_time)
+            yield wrap_api_object(item)
+
+    def __getitem__(self, index):
+        target = self._target
+        start_time = time.perf_counter()
+        item = target[index]
+        _record_attribute(
+            f"{type(target).__name__}.__getitem__", time.perf_counter() - start_time
+        )
+        return wrap_api_object(item)
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def __bool__(self) -> bool:
+        return bool(self._target)
+
+    def __eq__(self, other) -> bool:
+        return self._target == unwrap_api_object(other)
+
+    def __ne__(self, other) -> bool:
+        return self._target != unwrap_api_object(other)
+
+    def __hash__(self) -> int:
+        return hash(self._target)
+
+    def __repr__(self) -> str:
+        return repr(self._target)
+
+
+def wrap_api_object(value):
+    """
+    Wrap the API objects of a value, inside lists and tuples too.
+    """
+
+    if isinstance(value, ApiProxy):
+        return value
+    if isinstance(value, adsk.core.Base):
+        return ApiProxy(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(wrap_api_object(item) for item in value)
+    return value
+
+
+def unwrap_api_object(value):
+    """
+    Get back the API objects of a value, inside lists and tuples too.
+    """
+
+    if isinstance(value, ApiProxy):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, (list, tuple)):
+        return type(value)(unwrap_api_object(item) for item in value)
+    return value
+
+
+def profile_handler(name: str, callback: Callable, args: adsk.core.EventArgs):
+    """
+    Run a handler with wrapped event arguments and record its duration.
+    """
+
+    _handler_names.append(name)
+    start_time = time.perf_counter()
+    try:
+        callback(wrap_api_object(args))
+    finally:
+        record = _handler_records.setdefault(name, [0, 0.0])
+        record[0] += 1
+        record[1] += time.perf_counter() - start_time
+        _handler_names.pop()
+
+
+def get_handler_name(callback: Callable) -> str:
+    """
+    Get the name of a handler from its callback, relative to the add-in.
+    """
+
+    addin_package = __name__.split(".lib.")[0]
+    module = callback.__module__.removeprefix(f"{addin_package}.")
+    return f"{module}.{callback.__qualname__}"
+
+
+def dump_api_profile(title: str):
+    """
+    Log the API use recorded since the last dump, the slowest handlers and attributes first.
+    """
+
+    if not PROFILE_API or not _handler_records:
+        return
+
+    lines = [f"{title} API profile"]
+    handlers = sorted(_handler_records.items(), key=lambda item: -item[1][1])
+    for handler_name, (handler_count, handler_time) in handlers:
+        attributes = sorted(
+            (
+                (key[1], record)
+                for key, record in _attribute_records.items()
+                if key[0] == handler_name
+            ),
+            key=lambda item: -item[1][1],
+        )
+        api_count = sum(record[0] for _, record in attributes)
+        api_time = sum(record[1] for _, record in attributes)
+        lines.append(
+            f"{handler_name}: {handler_count} runs in {handler_time * 1000:.1f} ms,"
+            f" {api_count} API calls in {api_time * 1000:.1f} ms"
+        )
+        for attribute, (count, cumulative_time) in attributes[:PROFILE_REPORT_LIMIT]:
+            lines.append(
+                f"    {attribute:<48} {count:>8} {cumulative_time * 1000:>10.2f} ms"
+            )
+
+    log("\n".join(lines), force_console=True)
+
+    _handler_records.clear()
+    _attribute_records.clear()
+
+
+def _record_attribute(key: str, duration: float):
+    # Uses outside of a profiled handler are not recorded
+    if not _handler_names:
+        return
+    record = _attribute_records.setdefault((_handler_names[-1], key), [0, 0.0])
+    record[0] += 1
+    record[1] += duration
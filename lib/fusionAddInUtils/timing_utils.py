@@ -0,0 +1,132 @@
+import bisect
+import time
+from typing import Callable
+
+from .logging_utils import log
+from .profiling_utils import get_handler_name
+
+# Attempt to read TIME_EVENTS flag from parent config.
+try:
+    from ... import config
+
+    TIME_EVENTS = config.TIME_EVENTS
+except:
+    TIME_EVENTS = False
+
+# Number of latency histogram buckets for each factor of ten, the upper bound
+# of each bucket is 26% above the one of the previous bucket
+LATENCY_BUCKETS_PER_DECADE = 10
+
+# Upper bounds of the latency histogram buckets in milliseconds, from 10µs to
+# 10s, the last bucket holds the longer latencies
+LATENCY_BUCKETS = [
+    0.01 * 10 ** (i / LATENCY_BUCKETS_PER_DECADE)
+    for i in range(6 * LATENCY_BUCKETS_PER_DECADE + 1)
+]
+
+# Percentiles shown in the latency report
+LATENCY_PERCENTILES = [50, 90, 99]
+
+# Latency histograms by module and callback name
+_histograms: dict[tuple[str, str], "LatencyHistogram"] = {}
+
+
+class LatencyHistogram:
+    """
+    Distribution of the latencies of an event handler, in fixed buckets.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, latency: float):
+        """
+        Add a latency in milliseconds.
+        """
+
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Get the latency in milliseconds under which the given percentage of the events are.
+
+        The latency is the upper bound of the bucket it falls in, or the
+        largest latency when it falls in the last bucket.
+        """
+
+        rank = self.count * percentile / 100
+        cumulative_count = 0
+        for i, count in enumerate(self.counts):
+            cumulative_count += count
+            if count and cumulative_count >= rank:
+                if i < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[i], self.max)
+                break
+        return self.max
+
+
+def time_handler(histogram: LatencyHistogram, callback: Callable, args):
+    """
+    Run a handler and record its latency.
+    """
+
+    start_time = time.perf_counter()
+    try:
+        callback(args)
+    finally:
+        histogram.record((time.perf_counter() - start_time) * 1000)
+
+
+def get_latency_histogram(callback: Callable) -> LatencyHistogram:
+    """
+    Get the latency histogram of a handler, shared by the handlers of the same callback.
+    """
+
+    key = (callback.__module__, callback.__qualname__)
+    if key not in _histograms:
+        _histograms[key] = LatencyHistogram(get_handler_name(callback))
+    return _histograms[key]
+
+
+def dump_event_latencies(module_name: str = None, file_path: str = None):
+    """
+    Report the latencies of the event handlers since the add-in started.
+
+    Only the handlers of the given module are reported when a module name is
+    given. The report is written to the Text Command window, or to a file when
+    a path is given.
+    """
+
+    if not TIME_EVENTS:
+        return
+
+    header = "".join(f"{f'p{percentile}':>10}" for percentile in LATENCY_PERCENTILES)
+    lines = [f"{'Event handler':<56}{'count':>8}{header}{'max':>10}{'total':>12}"]
+    for (module, _), histogram in sorted(
+        _histograms.items(), key=lambda item: -item[1].total
+    ):
+        if not histogram.count or module_name and module != module_name:
+            continue
+
+        percentiles = "".join(
+            f"{histogram.get_percentile(percentile):>8.1f}ms"
+            for percentile in LATENCY_PERCENTILES
+        )
+        lines.append(
+            f"{histogram.name:<56}{histogram.count:>8}{percentiles}"
+            f"{histogram.max:>8.1f}ms{histogram.total:>10.1f}ms"
+        )
+
+    report = "\n".join(lines)
+    if file_path:
+        with open(file_path, "w") as file:
+            file.write(f"{report}\n")
+    else:
+        log(f"Event latencies\n{report}", force_console=True)
@@ -0,0 +1,46 @@
+"""
+Generate the DXF files of a box from its JSON spec, without Fusion.
+
+The panels, their finger joints and the master sheets are computed by
+`easyBoxCore.box`, see `BoxSpec.from_dict` for the format of the spec.
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPTS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+ADDIN_FOLDER = os.path.dirname(SCRIPTS_FOLDER)
+
+# The core package does not import adsk, it can be imported on its own
+sys.path.insert(0, os.path.join(ADDIN_FOLDER, "lib"))
+
+from easyBoxCore import box
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("spec", help="path of the JSON spec of the box")
+    parser.add_argument(
+        "folder",
+        nargs="?",
+        help="folder of the DXF files, named after the box by default",
+    )
+    args = parser.parse_args()
+
+    try:
+        spec = box.load_box_spec(args.spec)
+    except ValueError as error:
+        parser.error(f"{args.spec}: {error}")
+
+    report = box.export_box(spec, args.folder or spec.name)
+
+    for file_path, quantity in report["files"].items():
+        print(f"{quantity} x {file_path}")
+    for file_path, utilization in report["master_files"].items():
+        print(f"{file_path} ({utilization:.0%} used)")
+    print(report["cut_list_file"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Generate the DXF files of a batch of boxes from their JSON specs, without Fusion.
+
+Each box is written to its own folder in the output folder, with a summary of
+all the boxes. An interrupted batch is resumed by running it again with the
+same output folder, the boxes already done are skipped.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPTS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+ADDIN_FOLDER = os.path.dirname(SCRIPTS_FOLDER)
+
+# The core package does not import adsk, it can be imported on its own
+sys.path.insert(0, os.path.join(ADDIN_FOLDER, "lib"))
+
+from easyBoxCore import batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "source",
+        help="folder of JSON specs, JSONL file of specs, or - to read JSONL from stdin",
+    )
+    parser.add_argument("folder", help="output folder of the batch")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="number of worker processes, one per CPU by default",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="only print the totals of the batch"
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = batch.read_jobs(args.source)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    def on_progress(record: dict, left_count: int):
+        if args.quiet:
+            return
+        message = record.get("error") or f"{record['panels']} panels"
+        print(f"[{left_count} left] {record['job']}: {record['status']}, {message}")
+
+    start_time = time.perf_counter()
+    records = batch.run_batch(jobs, args.folder, args.processes, on_progress)
+    duration = time.perf_counter() - start_time
+
+    failed_count = sum(record["status"] == batch.JobStatus.Failed for record in records)
+    print(
+        f"{len(records) - failed_count} boxes done, {failed_count} failed"
+        f" in {duration:.1f} s, see {os.path.join(args.folder, batch.SUMMARY_FILENAME)}"
+    )
+    if failed_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
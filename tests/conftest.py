@@ -0,0 +1,8 @@
+import os
+import sys
+
+TESTS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+ADDIN_FOLDER = os.path.dirname(TESTS_FOLDER)
+
+# The core package does not import adsk, it can be tested without Fusion
+sys.path.insert(0, os.path.join(ADDIN_FOLDER, "lib"))
@@ -0,0 +1,45 @@
+import json
+
+from easyBoxCore import batch
+
+# Spec of a small valid box
+SPEC = {"length": 100, "width": 80, "height": 50, "thickness": 4}
+
+
+def test_unreadable_specs_are_recorded_as_failed(tmp_path):
+    source = tmp_path / "specs.jsonl"
+    source.write_text(f"{json.dumps(SPEC)}\n{{oops\n[1]\n{json.dumps(SPEC)}\n")
+
+    records = batch.run_batch(batch.read_jobs(str(source)), str(tmp_path / "out"), 1)
+
+    assert [(record["job"], record["status"]) for record in records] == [
+        ("box-1", batch.JobStatus.Done),
+        ("box-2", batch.JobStatus.Failed),
+        ("box-3", batch.JobStatus.Failed),
+        ("box-4", batch.JobStatus.Done),
+    ]
+    assert records[1]["error"].startswith("line 2: ")
+    assert set(
+        batch.read_progress(str(tmp_path / "out" / batch.PROGRESS_FILENAME))
+    ) == {
+        "box-1",
+        "box-2",
+        "box-3",
+        "box-4",
+    }
+
+
+def test_unreadable_spec_files_are_recorded_as_failed(tmp_path):
+    (tmp_path / "bad.json").write_text("")
+    (tmp_path / "good.json").write_text(json.dumps(SPEC))
+
+    jobs = batch.read_jobs(str(tmp_path))
+    records = [
+        batch.run_job(job_id, data, str(tmp_path / "out")) for job_id, data in jobs
+    ]
+
+    assert [record["status"] for record in records] == [
+        batch.JobStatus.Failed,
+        batch.JobStatus.Done,
+    ]
+    assert records[0]["error"].startswith("bad.json: ")
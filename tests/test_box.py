@@ -0,0 +1,122 @@
+import itertools
+
+import pytest
+
+from easyBoxCore import box, corners
+
+# Specs of the tested boxes, in millimeters
+SPECS = [
+    {"length": 120, "width": 90, "height": 60, "thickness": 6},
+    {
+        "length": 150,
+        "width": 100,
+        "height": 80,
+        "thickness": 4,
+        "faces": {"top": False, "front": {"thickness": 9}},
+        "tenon_count": 2,
+        "joints": {"front-bottom": {"tenon_count": 4, "tenon_width": 12}},
+    },
+]
+
+
+class PanelSolid:
+    """
+    A panel of a box, as its outline extruded inward from its face of the box.
+    """
+
+    def __init__(self, spec: box.BoxSpec, part):
+        self.face_name = part.body_name
+        self.axis, direction = box.FACES[self.face_name]
+        self.u_axis, self.v_axis = [other for other in range(3) if other != self.axis]
+        thickness = spec.thicknesses[self.face_name]
+        size = spec.size[self.axis]
+        self.slab = (0, thickness) if direction < 0 else (size - thickness, size)
+        # Outlines are mirrored to be seen from outside the box
+        self.width = None
+        if (direction < 0) != (self.axis == 1):
+            self.width = spec.size[self.u_axis]
+        self.edges = [
+            (line.start, line.end) for loop in part.loops for line in loop.entities
+        ]
+
+    def contains(self, point: tuple[float, float, float]) -> bool:
+        if not self.slab[0] < point[self.axis] < self.slab[1]:
+            return False
+
+        u, v = point[self.u_axis], point[self.v_axis]
+        if self.width is not None:
+            u = self.width - u
+
+        # Even-odd rule, holes included
+        is_inside = False
+        for (x0, y0), (x1, y1) in self.edges:
+            if (y0 > v) != (y1 > v) and u < x0 + (v - y0) * (x1 - x0) / (y1 - y0):
+                is_inside = not is_inside
+        return is_inside
+
+
+def get_cell_centers(spec: box.BoxSpec, solids: list[PanelSolid]) -> list[tuple]:
+    # Grid on every coordinate of the outlines and of the slabs of the panels
+    bounds = [{0, length} for length in spec.size]
+    for solid in solids:
+        bounds[solid.axis].update(solid.slab)
+        for start, end in solid.edges:
+            for u, v in (start, end):
+                if solid.width is not None:
+                    u = solid.width - u
+                bounds[solid.u_axis].add(u)
+                bounds[solid.v_axis].add(v)
+
+    centers = []
+    for values in bounds:
+        # Mirrored coordinates differ by numerical noise
+        values = sorted({round(value, 9) for value in values})
+        centers.append([(a + b) / 2 for a, b in zip(values, values[1:])])
+    return list(itertools.product(*centers))
+
+
+@pytest.mark.parametrize("data", SPECS)
+def test_panels_interlock(data):
+    spec = box.BoxSpec.from_dict(data)
+    solids = [PanelSolid(spec, part) for part in box.get_box_parts(spec)]
+
+    for point in get_cell_centers(spec, solids):
+        owners = [solid.face_name for solid in solids if solid.contains(point)]
+        # Each cell in the wall of a panel belongs to exactly one panel,
+        # tenons fill the mortises of the neighbour panel
+        is_in_wall = any(
+            solid.slab[0] < point[solid.axis] < solid.slab[1] for solid in solids
+        )
+        assert len(owners) == (1 if is_in_wall else 0), (point, owners)
+
+
+@pytest.mark.parametrize("data", SPECS)
+def test_corner_cells_belong_to_the_panel_running_through(data):
+    spec = box.BoxSpec.from_dict(data)
+    solids = [PanelSolid(spec, part) for part in box.get_box_parts(spec)]
+    margin = min(spec.thicknesses.values()) / 2
+
+    for corner in itertools.product((-1, 1), repeat=3):
+        corner_solids = [
+            solid
+            for solid in solids
+            if box.FACES[solid.face_name][1] == corner[solid.axis]
+        ]
+
+        # Center of the cell shared by the panels of the corner, close to the
+        # end of the box where a panel is missing
+        point = []
+        for axis, direction in enumerate(corner):
+            solid = next((solid for solid in corner_solids if solid.axis == axis), None)
+            if solid:
+                point.append(sum(solid.slab) / 2)
+            else:
+                point.append(margin if direction < 0 else spec.size[axis] - margin)
+
+        # The panel facing Z runs through the panel facing Y, which runs
+        # through the panel facing X
+        owner = min(
+            corner_solids,
+            key=lambda solid: corners.ORIENTATION_PRIORITY.index(solid.axis),
+        )
+        assert [solid for solid in solids if solid.contains(point)] == [owner]
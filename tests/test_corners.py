@@ -0,0 +1,95 @@
+import pytest
+
+from easyBoxCore import corners
+
+# Outline of the outer face of the top panel, its first edge is shared with
+# the front panel
+TOP_POINTS = [(0, 0, 50), (100, 0, 50), (100, 80, 50), (0, 80, 50)]
+
+# Thickness of both panels
+THICKNESS = 5
+
+
+def get_rounded(points: list[tuple]) -> list[tuple]:
+    # Points in a stable order, without the numerical noise
+    return sorted(tuple(round(value, 6) + 0.0 for value in point) for point in points)
+
+
+def get_top_insets(policy: str, front_area: float) -> list[tuple[float, float]]:
+    top = corners.CornerPanel(1, (0, 0, 1), THICKNESS, 100 * 80)
+    front = corners.CornerPanel(2, (0, -1, 0), THICKNESS, front_area)
+    return [corners.get_edge_insets(policy, top, front)] + [(0.0, 0.0)] * 3
+
+
+@pytest.mark.parametrize("is_clockwise", [False, True])
+def test_inset_polygon_moves_each_edge_inwards(is_clockwise):
+    points = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    insets = [1, 2, 0, 0]
+    if is_clockwise:
+        # Same edges walked the other way
+        points = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        insets = [0, 0, 2, 1]
+
+    result = corners.inset_polygon(points, insets)
+
+    assert get_rounded(result) == get_rounded([(0, 1), (8, 1), (8, 10), (0, 10)])
+
+
+def test_overlap_leaves_the_panel_untouched():
+    insets = get_top_insets(corners.CornerPolicy.Overlap, 100 * 50)
+
+    assert (
+        corners.resolve_panel_outline(TOP_POINTS, (0, 0, 1), THICKNESS, insets) is None
+    )
+
+
+def test_butt_trims_the_smallest_panel():
+    larger_front = get_top_insets(corners.CornerPolicy.Butt, 200 * 50)
+    smaller_front = get_top_insets(corners.CornerPolicy.Butt, 100 * 50)
+
+    assert larger_front[0] == (THICKNESS, THICKNESS)
+    assert smaller_front[0] == (0, 0)
+    assert (
+        corners.resolve_panel_outline(TOP_POINTS, (0, 0, 1), THICKNESS, smaller_front)
+        is None
+    )
+
+    outline = corners.resolve_panel_outline(
+        TOP_POINTS, (0, 0, 1), THICKNESS, larger_front
+    )
+    assert outline.is_square
+    assert get_rounded(outline.outer) == get_rounded(
+        [(0, 5, 50), (100, 5, 50), (100, 80, 50), (0, 80, 50)]
+    )
+    assert get_rounded(outline.inner) == get_rounded(
+        [(0, 5, 45), (100, 5, 45), (100, 80, 45), (0, 80, 45)]
+    )
+
+
+def test_orientation_lets_the_top_run_through_any_front():
+    insets = get_top_insets(corners.CornerPolicy.Orientation, 200 * 50)
+
+    assert insets[0] == (0, 0)
+    assert (
+        corners.resolve_panel_outline(TOP_POINTS, (0, 0, 1), THICKNESS, insets) is None
+    )
+
+    # The front butts against the top whatever their areas
+    top = corners.CornerPanel(1, (0, 0, 1), THICKNESS, 100 * 80)
+    front = corners.CornerPanel(2, (0, -1, 0), THICKNESS, 200 * 50)
+    assert corners.get_edge_insets(corners.CornerPolicy.Orientation, front, top) == (
+        THICKNESS,
+        THICKNESS,
+    )
+
+
+def test_miter_only_trims_the_inner_face():
+    insets = get_top_insets(corners.CornerPolicy.Miter, 100 * 50)
+
+    outline = corners.resolve_panel_outline(TOP_POINTS, (0, 0, 1), THICKNESS, insets)
+
+    assert not outline.is_square
+    assert get_rounded(outline.outer) == get_rounded(TOP_POINTS)
+    assert get_rounded(outline.inner) == get_rounded(
+        [(0, 5, 45), (100, 5, 45), (100, 80, 45), (0, 80, 45)]
+    )
@@ -0,0 +1,58 @@
+import math
+
+from easyBoxCore import dxf, fingerprint
+
+
+def get_plate(hole_center: tuple[float, float], transform=None) -> dxf.Part:
+    # 100 x 50 plate with a round hole, its points moved by `transform`
+    transform = transform or (lambda point: point)
+    corners = [transform(point) for point in [(0, 0), (100, 0), (100, 50), (0, 50)]]
+    outer = dxf.Loop(
+        [
+            dxf.Line(start, end)
+            for start, end in zip(corners, [*corners[1:], corners[0]])
+        ]
+    )
+    hole = dxf.Loop([dxf.Circle(transform(hole_center), 5)], False)
+    return dxf.Part("plate", [outer, hole])
+
+
+def rotate(angle: float, dx: float = 0, dy: float = 0):
+    def transform(point: tuple[float, float]) -> tuple[float, float]:
+        x, y = point
+        return (
+            x * math.cos(angle) - y * math.sin(angle) + dx,
+            x * math.sin(angle) + y * math.cos(angle) + dy,
+        )
+
+    return transform
+
+
+def test_moved_and_rotated_parts_are_grouped():
+    parts = [
+        get_plate((20, 15)),
+        get_plate((20, 15), rotate(0, 300, -40)),
+        get_plate((20, 15), rotate(math.pi / 2, 12.5, 7)),
+        get_plate((20, 15), rotate(math.radians(30), -80, 250)),
+    ]
+
+    assert fingerprint.group_duplicate_parts(parts) == [parts]
+
+
+def test_mirrored_parts_are_grouped():
+    parts = [
+        get_plate((20, 15)),
+        get_plate((20, 15), lambda point: (-point[0], point[1])),
+    ]
+
+    assert fingerprint.get_part_fingerprint(parts[0]) == (
+        fingerprint.get_part_fingerprint(parts[1])
+    )
+    assert fingerprint.group_duplicate_parts(parts) == [parts]
+
+
+def test_parts_with_the_hole_elsewhere_are_not_grouped():
+    # The hole of the last part is not a symmetric of the first one
+    parts = [get_plate((20, 15)), get_plate((80, 35)), get_plate((30, 15))]
+
+    assert fingerprint.group_duplicate_parts(parts) == [parts[:2], parts[2:]]
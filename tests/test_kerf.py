@@ -0,0 +1,111 @@
+import math
+
+import pytest
+
+from easyBoxCore import dxf, geometry, kerf
+
+# Polygon with a concave corner, counter-clockwise
+POLYGON = [(0, 0), (40, 0), (40, 20), (20, 20), (20, 30), (0, 30)]
+
+
+def get_lines(points: list[tuple[float, float]]) -> list[dxf.Line]:
+    return [
+        dxf.Line(start, end) for start, end in zip(points, [*points[1:], points[0]])
+    ]
+
+
+def get_rounded_rectangle(width: float, height: float, radius: float) -> list:
+    # Counter-clockwise, starting with the bottom line
+    return [
+        dxf.Line((radius, 0), (width - radius, 0)),
+        dxf.Arc((width - radius, radius), radius, -math.pi / 2, math.pi / 2),
+        dxf.Line((width, radius), (width, height - radius)),
+        dxf.Arc((width - radius, height - radius), radius, 0, math.pi / 2),
+        dxf.Line((width - radius, height), (radius, height)),
+        dxf.Arc((radius, height - radius), radius, math.pi / 2, math.pi / 2),
+        dxf.Line((0, height - radius), (0, radius)),
+        dxf.Arc((radius, radius), radius, math.pi, math.pi / 2),
+    ]
+
+
+def assert_closed(entities: list):
+    # Each entity ends where the next one starts
+    for entity, following in zip(entities, [*entities[1:], entities[0]]):
+        assert kerf._get_end_point(entity) == pytest.approx(
+            kerf._get_start_point(following)
+        )
+
+
+@pytest.mark.parametrize("is_clockwise", [False, True])
+def test_rectangle_grows_with_miter_corners(is_clockwise):
+    points = [(0, 0), (100, 0), (100, 50), (0, 50)]
+    entities = get_lines(points[::-1] if is_clockwise else points)
+
+    offset = kerf.offset_part(dxf.Part("part", [dxf.Loop(entities)]), 1)
+
+    entities = offset.loops[0].entities
+    assert all(isinstance(entity, dxf.Line) for entity in entities)
+    assert_closed(entities)
+    assert offset.bounds == pytest.approx((-1, -1, 101, 51))
+    assert abs(dxf.get_loop_area(entities)) == pytest.approx(102 * 52)
+
+
+def test_hole_shrinks():
+    outer = dxf.Loop(get_lines([(0, 0), (100, 0), (100, 50), (0, 50)]))
+    hole = dxf.Loop(get_lines([(10, 10), (30, 10), (30, 20), (10, 20)]), False)
+
+    offset = kerf.offset_part(dxf.Part("part", [outer, hole]), 1)
+
+    assert dxf.get_bounds(offset.loops[1].entities) == pytest.approx((11, 11, 29, 19))
+    assert offset.area == pytest.approx(102 * 52 - 18 * 8)
+
+
+def test_rounded_rectangle_keeps_its_tangent_arcs():
+    entities = get_rounded_rectangle(100, 50, 5)
+
+    offset = kerf.offset_part(dxf.Part("part", [dxf.Loop(entities)]), 1)
+
+    entities = offset.loops[0].entities
+    assert len(entities) == 8
+    assert [entity.radius for entity in entities[1::2]] == pytest.approx([6] * 4)
+    assert_closed(entities)
+    assert offset.bounds == pytest.approx((-1, -1, 101, 51))
+
+
+def test_long_chains_are_offset_the_same_with_and_without_numpy(monkeypatch):
+    # Star with enough lines to be offset as arrays
+    points = [
+        (
+            (10 if index % 2 else 20) * math.cos(index * math.pi / 20),
+            (10 if index % 2 else 20) * math.sin(index * math.pi / 20),
+        )
+        for index in range(40)
+    ]
+    assert len(points) >= geometry.NUMPY_MIN_POINTS
+
+    with_numpy = kerf.offset_entities(get_lines(points), 0.5)
+    monkeypatch.setattr(geometry, "_numpy", False)
+    without_numpy = kerf.offset_entities(get_lines(points), 0.5)
+
+    assert len(with_numpy) == len(without_numpy)
+    for first, second in zip(with_numpy, without_numpy):
+        assert type(first) is type(second)
+        assert kerf._get_start_point(first) == pytest.approx(
+            kerf._get_start_point(second)
+        )
+        assert kerf._get_end_point(first) == pytest.approx(kerf._get_end_point(second))
+    assert_closed(with_numpy)
+
+
+@pytest.mark.parametrize("is_clockwise", [False, True])
+def test_closed_polyline_is_not_joined_to_itself(is_clockwise):
+    points = POLYGON[::-1] if is_clockwise else POLYGON
+    part = dxf.Part("part", [dxf.Loop([dxf.Polyline(list(points), closed=True)])])
+
+    offset = kerf.offset_part(part, 1)
+
+    [entity] = offset.loops[0].entities
+    assert isinstance(entity, dxf.Polyline) and entity.closed
+    assert offset.bounds == pytest.approx((-1, -1, 41, 31))
+    # The area grows by the perimeter and the four mitered outside corners
+    assert abs(dxf.get_loop_area([entity])) == pytest.approx(1000 + 140 + 4)
@@ -0,0 +1,74 @@
+import math
+import os
+import subprocess
+import sys
+
+from easyBoxCore import dxf, manifest
+
+# Script printing the hash of a few entities, run with different hash seeds
+HASH_SCRIPT = """
+import math
+import sys
+
+sys.path.insert(0, sys.argv[1])
+from easyBoxCore import dxf, manifest
+
+entities = [
+    dxf.Line((0, 0), (100, 0)),
+    dxf.Arc((100, 10), 10, -math.pi / 2, math.pi),
+    dxf.Circle((50, 25), 5),
+    dxf.Polyline([(0, 20), (10, 30), (0, 40)], closed=True),
+]
+print(manifest.get_entities_hash(entities, "mm", 0.2))
+"""
+
+
+def get_entities(noise: float = 0) -> list:
+    return [
+        dxf.Line((0, 0), (100 + noise, 0)),
+        dxf.Arc((100, 10), 10, -math.pi / 2, math.pi - noise),
+        dxf.Circle((50, 25 + noise), 5),
+        dxf.Polyline([(0, 20), (10 + noise, 30), (0, 40)], closed=True),
+    ]
+
+
+def test_entities_hash_is_the_same_across_runs():
+    lib_folder = os.path.dirname(os.path.dirname(manifest.__file__))
+    hashes = {
+        subprocess.run(
+            [sys.executable, "-c", HASH_SCRIPT, lib_folder],
+            capture_output=True,
+            check=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+        ).stdout.strip()
+        for seed in range(3)
+    }
+
+    assert hashes == {manifest.get_entities_hash(get_entities(), "mm", 0.2)}
+
+
+def test_entities_hash_ignores_numerical_noise():
+    assert manifest.get_entities_hash(get_entities(), "mm") == (
+        manifest.get_entities_hash(get_entities(1e-9), "mm")
+    )
+    assert manifest.get_entities_hash(get_entities(), "mm") != (
+        manifest.get_entities_hash(get_entities(1e-3), "mm")
+    )
+    assert manifest.get_entities_hash(get_entities(), "mm") != (
+        manifest.get_entities_hash(get_entities(), "in")
+    )
+
+
+def test_unchanged_files_are_not_written_again(tmp_path):
+    content_hash = manifest.get_entities_hash(get_entities())
+
+    first = manifest.Manifest(str(tmp_path))
+    assert first.update("part.dxf", content_hash)
+    (tmp_path / "part.dxf").write_text("")
+    first.save()
+
+    second = manifest.Manifest(str(tmp_path))
+    assert not second.update("part.dxf", manifest.get_entities_hash(get_entities()))
+    assert second.update("other.dxf", content_hash)
+    assert second.changed_files == ["other.dxf"]
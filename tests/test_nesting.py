@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from easyBoxCore import nesting
+
+# Size of the sheets and space kept between the rectangles
+SHEET_WIDTH, SHEET_HEIGHT, SPACING = 600, 400, 2
+
+
+def get_rectangles(count: int, seed: int) -> list[tuple]:
+    generator = random.Random(seed)
+    return [
+        (index, generator.randint(10, 250), generator.randint(10, 150))
+        for index in range(count)
+    ]
+
+
+def overlap(first: nesting.Placement, second: nesting.Placement) -> bool:
+    # Rectangles closer than the spacing overlap too
+    return (
+        first.x < second.x + second.width + SPACING
+        and second.x < first.x + first.width + SPACING
+        and first.y < second.y + second.height + SPACING
+        and second.y < first.y + first.height + SPACING
+    )
+
+
+@pytest.mark.parametrize("allow_rotation", [False, True])
+@pytest.mark.parametrize("seed", range(5))
+def test_rectangles_are_placed_once_without_overlaps(seed, allow_rotation):
+    rectangles = get_rectangles(60, seed)
+
+    sheets = nesting.pack(
+        rectangles, SHEET_WIDTH, SHEET_HEIGHT, SPACING, allow_rotation
+    )
+
+    sizes = {key: (width, height) for key, width, height in rectangles}
+    placements = [placement for sheet in sheets for placement in sheet.placements]
+    assert sorted(placement.key for placement in placements) == sorted(sizes)
+
+    for sheet in sheets:
+        for index, placement in enumerate(sheet.placements):
+            width, height = sizes[placement.key]
+            if placement.rotated:
+                assert allow_rotation
+                width, height = height, width
+            assert (placement.width, placement.height) == (width, height)
+
+            assert placement.x >= 0 and placement.y >= 0
+            assert placement.x + placement.width <= sheet.width
+            assert placement.y + placement.height <= sheet.height
+            assert not any(
+                overlap(placement, other) for other in sheet.placements[index + 1 :]
+            )
+
+
+def test_oversize_rectangle_gets_its_own_sheet():
+    sheets = nesting.pack([("small", 50, 50), ("large", 700, 300)], 600, 400)
+
+    assert [(sheet.width, sheet.height) for sheet in sheets] == [(700, 300), (600, 400)]
+    assert nesting.get_utilization(sheets) == pytest.approx(
+        (700 * 300 + 50 * 50) / (700 * 300 + 600 * 400)
+    )